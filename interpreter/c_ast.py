@@ -0,0 +1,261 @@
+"""Abstract syntax tree of a miniC program.
+
+Nodes are __slots__ classes that keep the row and column of the token they
+start at. children lists the child nodes in source order, with None for a
+missing optional child, which is the order code is generated in.
+"""
+import sys
+from typing import List, Optional, Union
+
+from c_token import TokenType
+
+Constant = Union[int, float]
+
+
+class Node:
+    __slots__ = ('row', 'col')
+
+    def __init__(self, row: int = 0, col: int = 0):
+        self.row = row
+        self.col = col
+
+    def children(self) -> tuple:
+        return ()
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}'
+                           for cls in reversed(type(self).__mro__)
+                           for name in getattr(cls, '__slots__', ())
+                           if name not in ('row', 'col'))
+        return f'{type(self).__name__}({fields})'
+
+
+class Expression(Node):
+    __slots__ = ('type_',)
+
+    def __init__(self, type_: Optional[TokenType], row=0, col=0):
+        self.row, self.col = row, col
+        self.type_ = type_
+
+
+class Name(Expression):
+    """A variable, by its name and the depth of the block declaring it."""
+    __slots__ = ('name', 'depth')
+
+    def __init__(self, name: str, depth: int, type_, row=0, col=0):
+        self.row, self.col, self.type_ = row, col, type_
+        self.name = name
+        self.depth = depth
+
+    @property
+    def ident(self) -> str:
+        """Name of the variable in the code."""
+        return sys.intern(f'__{self.depth}__{self.name}')
+
+
+class Number(Expression):
+    __slots__ = ('value',)
+
+    def __init__(self, value: Constant, type_, row=0, col=0):
+        self.row, self.col, self.type_ = row, col, type_
+        self.value = value
+
+
+class String(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value: str, row=0, col=0):
+        self.row, self.col = row, col
+        self.value = value
+
+
+class Unary(Expression):
+    """'-' or '!' operand. The unary '+' has no node."""
+    __slots__ = ('operator', 'operand')
+
+    def __init__(self, operator: str, operand: Expression, type_, row=0,
+                 col=0):
+        self.row, self.col, self.type_ = row, col, type_
+        self.operator = operator
+        self.operand = operand
+
+    def children(self):
+        return (self.operand,)
+
+
+class Binary(Expression):
+    """left operator right, where the division of integers has operator
+    '//'."""
+    __slots__ = ('operator', 'left', 'right')
+
+    def __init__(self, operator: str, left: Expression, right: Expression,
+                 type_, row=0, col=0):
+        self.row, self.col, self.type_ = row, col, type_
+        self.operator = operator
+        self.left = left
+        self.right = right
+
+    def children(self):
+        return self.left, self.right
+
+
+class Assign(Expression):
+    __slots__ = ('target', 'value')
+
+    def __init__(self, target: Name, value: Expression, type_, row=0,
+                 col=0):
+        self.row, self.col, self.type_ = row, col, type_
+        self.target = target
+        self.value = value
+
+    def children(self):
+        return self.target, self.value
+
+
+class Empty(Node):
+    """The statement ';'."""
+    __slots__ = ()
+
+
+class ExprStmt(Node):
+    __slots__ = ('expr',)
+
+    def __init__(self, expr: Expression, row=0, col=0):
+        self.row, self.col = row, col
+        self.expr = expr
+
+    def children(self):
+        return (self.expr,)
+
+
+class Declaration(Node):
+    __slots__ = ('type_', 'names')
+
+    def __init__(self, type_: TokenType, names: List[Name], row=0, col=0):
+        self.row, self.col = row, col
+        self.type_ = type_
+        self.names = names
+
+    def children(self):
+        return tuple(self.names)
+
+
+class Block(Node):
+    __slots__ = ('stmts',)
+
+    def __init__(self, stmts: List[Node], row=0, col=0):
+        self.row, self.col = row, col
+        self.stmts = stmts
+
+    def children(self):
+        return tuple(self.stmts)
+
+
+class If(Node):
+    __slots__ = ('cond', 'then', 'else_')
+
+    def __init__(self, cond: Expression, then: Node, else_: Optional[Node],
+                 row=0, col=0):
+        self.row, self.col = row, col
+        self.cond = cond
+        self.then = then
+        self.else_ = else_
+
+    def children(self):
+        return self.cond, self.then, self.else_
+
+
+class While(Node):
+    __slots__ = ('cond', 'body')
+
+    def __init__(self, cond: Expression, body: Node, row=0, col=0):
+        self.row, self.col = row, col
+        self.cond = cond
+        self.body = body
+
+    def children(self):
+        return self.cond, self.body
+
+
+class For(Node):
+    """for (init; cond; incr) body, where a missing cond is true."""
+    __slots__ = ('init', 'cond', 'incr', 'body')
+
+    def __init__(self, init: Optional[Expression],
+                 cond: Optional[Expression], incr: Optional[Expression],
+                 body: Node, row=0, col=0):
+        self.row, self.col = row, col
+        self.init = init
+        self.cond = cond
+        self.incr = incr
+        self.body = body
+
+    def children(self):
+        return self.init, self.cond, self.incr, self.body
+
+
+class Break(Node):
+    __slots__ = ()
+
+
+class Continue(Node):
+    __slots__ = ()
+
+
+class Return(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value: Expression, row=0, col=0):
+        self.row, self.col = row, col
+        self.value = value
+
+    def children(self):
+        return (self.value,)
+
+
+class Print(Node):
+    __slots__ = ('items',)
+
+    def __init__(self, items: List[Union[Name, Number, String]], row=0,
+                 col=0):
+        self.row, self.col = row, col
+        self.items = items
+
+    def children(self):
+        return tuple(self.items)
+
+
+class Scan(Node):
+    __slots__ = ('format', 'target')
+
+    def __init__(self, format_: str, target: Name, row=0, col=0):
+        self.row, self.col = row, col
+        self.format = format_
+        self.target = target
+
+    def children(self):
+        return (self.target,)
+
+
+class Function(Node):
+    __slots__ = ('type_', 'name', 'args', 'body')
+
+    def __init__(self, type_: TokenType, name: str, args: List[Name],
+                 body: Block, row=0, col=0):
+        self.row, self.col = row, col
+        self.type_ = type_
+        self.name = name
+        self.args = args
+        self.body = body
+
+    def children(self):
+        return (*self.args, self.body)
+
+
+def walk(node: Node):
+    """Yields node and its descendants in pre-order, without recursion."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(c for c in reversed(node.children()) if c is not None)
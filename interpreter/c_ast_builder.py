@@ -0,0 +1,144 @@
+from c_ast import Block, Break, Continue, Declaration, Empty, ExprStmt, \
+    For, Function, If, Name, Number, Print, Return, Scan, String, While
+from c_parser_result import Result
+from c_symbol_table import SymbolTable
+
+
+class AstBuilder:
+    """Builds the AST while parsing. A method named after a production is
+    called with its Result, whose nodes are those of its children in order,
+    and leaves there the nodes of the production."""
+
+    def __init__(self, symbol_table: SymbolTable):
+        self._symbol_table = symbol_table
+
+    @staticmethod
+    def _name(ident, type_, position) -> Name:
+        return Name(*ident, type_, *position)
+
+    def _declared(self, name: str, type_, position) -> Name:
+        return Name(name, self._symbol_table.depth, type_, *position)
+
+    def function(self, result: Result) -> Result:
+        """<function> -> <type> 'IDENT' '(' <argList> ')' <bloco>"""
+        body = result.nodes.pop()
+        result.nodes = [Function(result.type_, result.value[0][0],
+                                 result.nodes, body, *result.position)]
+        return result
+
+    def arg(self, result: Result) -> Result:
+        """<arg> -> <type> 'IDENT'"""
+        result.nodes.append(self._declared(result.value[0][0], result.type_,
+                                           result.position))
+        return result
+
+    def bloco(self, result: Result) -> Result:
+        """<bloco> -> '{' <stmtList> '}'"""
+        stmts = result.nodes.pop()
+        stmts.reverse()
+        result.nodes.append(Block(stmts, *result.position))
+        return result
+
+    def stmt_list_stmt(self, result: Result) -> Result:
+        """<stmtList> -> <stmt> <stmtList>"""
+        stmts = result.nodes.pop()
+        stmts.append(result.nodes.pop())
+        result.nodes.append(stmts)
+        return result
+
+    def stmt_list_declaration(self, result: Result) -> Result:
+        """<stmtList> -> <declaration> <stmtList>"""
+        return self.stmt_list_stmt(result)
+
+    def stmt_list_empty(self, result: Result) -> Result:
+        """<stmtList> -> &
+
+        The statements of a list are collected backwards, as the inner
+        lists end first."""
+        result.nodes.append([])
+        return result
+
+    def stmt_expr(self, result: Result) -> Result:
+        """<stmt> -> <expr> ';'"""
+        result.nodes.append(ExprStmt(result.nodes.pop(), *result.position))
+        return result
+
+    def stmt_break(self, result: Result) -> Result:
+        """<stmt> -> 'break' ';'"""
+        result.nodes.append(Break(*result.position))
+        return result
+
+    def stmt_continue(self, result: Result) -> Result:
+        """<stmt> -> 'continue' ';'"""
+        result.nodes.append(Continue(*result.position))
+        return result
+
+    def stmt_return(self, result: Result) -> Result:
+        """<stmt> -> 'return' <fator> ';'"""
+        result.nodes.append(Return(result.nodes.pop(), *result.position))
+        return result
+
+    def stmt_null(self, result: Result) -> Result:
+        """<stmt> -> ';'"""
+        result.nodes.append(Empty(*result.position))
+        return result
+
+    def declaration(self, result: Result) -> Result:
+        """<declaration> -> <type> <identList> ';'"""
+        names = [self._declared(name, result.type_, result.position)
+                 for name, _ in result.value]
+        result.nodes.append(Declaration(result.type_, names,
+                                        *result.position))
+        return result
+
+    def for_stmt(self, result: Result) -> Result:
+        """<forStmt> -> 'for' '(' <optExpr> ';' <optExpr> ';'
+                         <optExpr> ')' <stmt>
+        """
+        result.nodes = [For(*result.nodes, *result.position)]
+        return result
+
+    def opt_expr_empty(self, result: Result) -> Result:
+        """<optExpr> -> &"""
+        result.nodes.append(None)
+        return result
+
+    def io_stmt_scan(self, result: Result) -> Result:
+        """<ioStmt> -> 'scan' '(' 'STR' ',' 'IDENT' ')' ';'"""
+        format_, ident = result.value
+        position = result.position
+        result.nodes.append(Scan(format_, self._name(ident, result.type_,
+                                                     position), *position))
+        return result
+
+    def io_stmt_print(self, result: Result) -> Result:
+        """<ioStmt> -> 'print' '(' <outList> ')' ';'"""
+        result.nodes = [Print(result.nodes, *result.position)]
+        return result
+
+    def out(self, result: Result) -> Result:
+        """<out> -> 'STR' | 'IDENT' | 'NUMint' | 'NUMfloat'"""
+        value = result.value[0]
+        if isinstance(value, tuple):
+            node = self._name(value, result.type_, result.position)
+        elif isinstance(value, str):
+            node = String(value, *result.position)
+        else:
+            node = Number(value, result.type_, *result.position)
+        result.nodes.append(node)
+        return result
+
+    def while_stmt(self, result: Result) -> Result:
+        """<whileStmt> -> 'while' '(' <expr> ')' <stmt>"""
+        result.nodes = [While(*result.nodes, *result.position)]
+        return result
+
+    def if_stmt(self, result: Result) -> Result:
+        """<ifStmt> -> 'if' '(' <expr> ')' <stmt> <elsePart>"""
+        result.nodes = [If(*result.nodes, *result.position)]
+        return result
+
+    def else_part_empty(self, result: Result) -> Result:
+        """<elsePart> -> &"""
+        result.nodes.append(None)
+        return result
@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from c_interpreter import add_opt_level
+from c_lexer import Lexer
+from c_parser import Parser, ParserFeatures
+from c_pass_manager import DEFAULT_LEVEL, merge_stats, stats_report
+
+FileReport = namedtuple('FileReport', ['file', 'error', 'size',
+                                       'instructions', 'temps', 'seconds',
+                                       'passes'])
+
+Job = Tuple[str, str, ParserFeatures, int]
+
+
+def _same_file(path1: str, path2: str) -> bool:
+    try:
+        return os.path.samefile(path1, path2)
+    except OSError:
+        return os.path.abspath(path1) == os.path.abspath(path2)
+
+
+def find_sources(paths: Iterable[str],
+                 output_dir: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Expands paths into (source, output base name) pairs. Directories
+    are searched for .c files and their layout is kept under output_dir.
+    Without output_dir the outputs sit next to each source. A source found
+    twice is compiled once, and ValueError is raised when two sources would
+    write the same outputs."""
+    sources = []
+    seen = {}
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, f) for f in files
+                             if f.endswith('.c'))
+            relative = [(f, os.path.relpath(f, path)) for f in sorted(found)]
+        else:
+            relative = [(path, os.path.basename(path))]
+        for source, name in relative:
+            base = os.path.splitext(source)[0]
+            if output_dir is not None:
+                base = os.path.join(output_dir, os.path.splitext(name)[0])
+            key = os.path.normcase(os.path.abspath(base))
+            other = seen.get(key)
+            if other is None:
+                seen[key] = source
+                sources.append((source, base))
+            elif not _same_file(other, source):
+                raise ValueError(f'{other} and {source} would both be '
+                                 f'compiled to {base}.out')
+    return sources
+
+
+def compile_file(job: Job) -> FileReport:
+    """Compiles one file with its own Lexer and Parser, writing the code
+    to base.out and the tree to base.dot."""
+    source, base, features, opt_level = job
+    start = time.perf_counter()
+    error, size, instructions, temps, passes = None, 0, 0, 0, []
+    try:
+        directory = os.path.dirname(base)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with Lexer(source) as lexer:
+            size = len(lexer.text)
+            parser = Parser(lexer, features & ~ParserFeatures.EXECUTE_CODE,
+                            tree_file=f'{base}.dot', code_file=f'{base}.out',
+                            opt_level=opt_level)
+            program = parser.compile()
+        passes = list(parser.pass_manager.stats.values())
+        if program is not None:
+            instructions, temps = len(program), program.temp_count
+    except Exception as exception:  # pylint: disable=broad-except
+        error = f'{type(exception).__name__}: {exception}'
+    return FileReport(source, error, size, instructions, temps,
+                      time.perf_counter() - start, passes)
+
+
+def compile_batch(sources: List[Tuple[str, str]], workers: int = None,
+                  features=ParserFeatures.CODE_GENERATION |
+                  ParserFeatures.SAVE_CODE_TO_FILE,
+                  opt_level=DEFAULT_LEVEL) -> List[FileReport]:
+    jobs = [(source, base, features, opt_level) for source, base in sources]
+    if workers == 1:
+        return [compile_file(job) for job in jobs]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (4 * workers))
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(compile_file, jobs, chunksize=chunksize))
+
+
+def summary(reports: List[FileReport], seconds: float) -> str:
+    failed = sum(1 for r in reports if r.error is not None)
+    size = sum(r.size for r in reports)
+    instructions = sum(r.instructions for r in reports)
+    temps = sum(r.temps for r in reports)
+    rate = len(reports) / seconds if seconds else 0.0
+    return (f'{len(reports)} files ({failed} failed), {size} chars, '
+            f'{instructions} instructions, {temps} temporaries '
+            f'in {seconds:.2f}s: '
+            f'{rate:.1f} files/s, {size / (seconds or 1) / 1e6:.2f} MB/s')
+
+
+def main():
+    arg_parser = ArgumentParser(description='Compiles many miniC files')
+    arg_parser.add_argument('paths', nargs='+',
+                            help='source files or directories')
+    arg_parser.add_argument('-o', '--output', metavar='DIR',
+                            help='output directory (default: next to the '
+                                 'sources)')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help='worker processes (default: CPU count)')
+    arg_parser.add_argument('--tree', action='store_true',
+                            help='write the parse tree of each file')
+    add_opt_level(arg_parser)
+    arg_parser.add_argument('--pass-stats', action='store_true',
+                            help='print the time and instruction counts of '
+                                 'each optimization pass')
+    options = arg_parser.parse_args()
+
+    features = (ParserFeatures.CODE_GENERATION |
+                ParserFeatures.SAVE_CODE_TO_FILE)
+    if options.tree:
+        features |= ParserFeatures.TREE_DOT_GENERATION
+    try:
+        sources = find_sources(options.paths, options.output)
+    except ValueError as exception:
+        arg_parser.error(str(exception))
+
+    start = time.perf_counter()
+    reports = compile_batch(sources, options.jobs, features,
+                            options.opt_level)
+    seconds = time.perf_counter() - start
+    for report in reports:
+        if report.error is not None:
+            print(f'{report.file}: {report.error}')
+    if options.pass_stats:
+        print(stats_report(merge_stats([s for r in reports
+                                        for s in r.passes])))
+    print(summary(reports, seconds))
+    sys.exit(1 if any(r.error is not None for r in reports) else 0)
+
+
+if __name__ == "__main__":
+    main()
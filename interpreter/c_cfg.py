@@ -0,0 +1,311 @@
+"""Control-flow graph of three-address code and the data-flow analyses
+over it.
+
+The code is split into basic blocks, straight-line runs that only the
+first instruction is entered by and only the last one leaves: a block
+starts at the first instruction, at each label and after each if and
+jump.
+"""
+from typing import Callable, Dict, FrozenSet, List, Optional, Set
+
+from c_instruction import Instruction, is_variable, OpCode
+
+
+class BasicBlock:
+    """Instructions code[start:stop] of a ControlFlowGraph, with the
+    indexes of the blocks that may run after and before it."""
+    __slots__ = ('start', 'stop', 'successors', 'predecessors')
+
+    def __init__(self, start: int, stop: int):
+        self.start = start
+        self.stop = stop
+        self.successors: List[int] = []
+        self.predecessors: List[int] = []
+
+    def __repr__(self):
+        return (f'BasicBlock({self.start}, {self.stop}, '
+                f'successors={self.successors})')
+
+
+class ControlFlowGraph:
+    """Basic blocks of code, blocks[0] being the entry. block_of is the
+    index of the block of each instruction."""
+
+    def __init__(self, code: List[Instruction]):
+        self.code = code
+        self.blocks: List[BasicBlock] = []
+        self.block_of: List[int] = []
+        start = 0
+        for n, instruction in enumerate(code):
+            opcode = instruction.opcode
+            if opcode is OpCode.LABEL and n > start:
+                self._add_block(start, n)
+                start = n
+            if opcode is OpCode.IF or opcode is OpCode.JUMP:
+                self._add_block(start, n + 1)
+                start = n + 1
+        if start < len(code):
+            self._add_block(start, len(code))
+
+        labels = {code[b.start].args[0]: i for i, b in enumerate(self.blocks)
+                  if code[b.start].opcode is OpCode.LABEL}
+        for i, block in enumerate(self.blocks):
+            last = code[block.stop - 1]
+            if last.opcode is OpCode.JUMP:
+                block.successors.append(labels[last.args[0]])
+            elif last.opcode is OpCode.IF:
+                block.successors.extend(labels[a] for a in last.args[1:])
+            elif i + 1 < len(self.blocks):
+                block.successors.append(i + 1)
+            for successor in block.successors:
+                self.blocks[successor].predecessors.append(i)
+
+    def _add_block(self, start: int, stop: int):
+        self.block_of.extend([len(self.blocks)] * (stop - start))
+        self.blocks.append(BasicBlock(start, stop))
+
+    def __len__(self):
+        return len(self.blocks)
+
+
+def solve(cfg: ControlFlowGraph, transfer: Callable[[int, object], object],
+           forward: bool, entry=frozenset(), bottom=frozenset()) -> list:
+    """Union data-flow problem: the value at the boundary of each block
+    where its successors' values (its predecessors' going forward) meet,
+    after transfer maps the value at the other boundary of a block to it.
+    Going forward, entry also reaches the first block. Values are sets, or
+    ints used as bit sets, bottom being the empty one."""
+    blocks = cfg.blocks
+    result = [bottom] * len(blocks)
+    pending = set(range(len(blocks)))
+    work = sorted(pending, reverse=forward)  # popped from the end first
+    while work:
+        i = work.pop()
+        pending.discard(i)
+        sources = blocks[i].predecessors if forward else blocks[i].successors
+        meet = entry if forward and i == 0 else bottom
+        for source in sources:
+            meet = meet | transfer(source, result[source])
+        if meet != result[i]:
+            result[i] = meet
+            targets = (blocks[i].successors if forward
+                       else blocks[i].predecessors)
+            for target in targets:
+                if target not in pending:
+                    pending.add(target)
+                    work.append(target)
+    return result
+
+
+def liveness(cfg: ControlFlowGraph,
+             relevant: Callable[[object], bool] = is_variable,
+             removable: List[bool] = None) -> List[Set[str]]:
+    """Relevant variables live after each instruction: those read later by
+    some path before being written again. An instruction n with
+    removable[n] only reads its operands when its result is live, so that
+    the values only read by dead stores are dead too."""
+    code = cfg.code
+    reads = [[a for a in i.reads if relevant(a)] for i in code]
+    writes = [i.writes for i in code]
+    uses = []
+    definitions = []
+    for block in cfg.blocks:
+        used, defined = set(), set()
+        for n in range(block.stop - 1, block.start - 1, -1):
+            defined.add(writes[n])
+            used.discard(writes[n])
+            used.update(reads[n])
+        uses.append(used)
+        definitions.append(defined)
+
+    def step(n: int, live: set):
+        """Turns the variables live after code[n] into those live before."""
+        written = writes[n]
+        if removable is not None and removable[n] and written not in live:
+            return
+        live.discard(written)
+        live.update(reads[n])
+
+    def live_in(i: int, live_out: set) -> set:
+        if removable is None:
+            return uses[i] | (live_out - definitions[i])
+        live = set(live_out)
+        for n in range(cfg.blocks[i].stop - 1, cfg.blocks[i].start - 1, -1):
+            step(n, live)
+        return live
+
+    live_out = solve(cfg, live_in, forward=False)
+    result: List[Set[str]] = [set()] * len(code)
+    for i, block in enumerate(cfg.blocks):
+        live = set(live_out[i])
+        for n in range(block.stop - 1, block.start - 1, -1):
+            result[n] = set(live)
+            step(n, live)
+    return result
+
+
+# Definitions of a variable: the indexes of the instructions that write it,
+# None standing for its value at the start
+Definitions = FrozenSet[Optional[int]]
+
+
+def reaching_definitions(cfg: ControlFlowGraph
+                         ) -> List[Dict[str, Definitions]]:
+    """Definitions that may reach each instruction of the variables it
+    reads."""
+    code = cfg.code
+    variables = {a for i in code for a in (*i.reads, i.writes)
+                 if is_variable(a)}
+    # bit of each definition: the start values first, then the writes
+    bits: List[Optional[int]] = [None] * len(variables)
+    masks = {variable: 1 << bit for bit, variable in enumerate(variables)}
+    bit_of = {}
+    for n, instruction in enumerate(code):
+        if instruction.writes is not None:
+            bit_of[n] = len(bits)
+            masks[instruction.writes] |= 1 << len(bits)
+            bits.append(n)
+    generated, killed = [], []
+    for block in cfg.blocks:
+        last = {}
+        for n in range(block.start, block.stop):
+            if code[n].writes is not None:
+                last[code[n].writes] = n
+        generated.append(sum(1 << bit_of[n] for n in last.values()))
+        killed.append(sum(masks[v] for v in last))
+
+    def reach_out(i: int, reach_in: int) -> int:
+        return generated[i] | (reach_in & ~killed[i])
+
+    reach_in = solve(cfg, reach_out, forward=True,
+                      entry=(1 << len(variables)) - 1, bottom=0)
+    decoded: Dict[int, Definitions] = {}
+
+    def decode(mask: int) -> Definitions:
+        if mask not in decoded:
+            definitions = set()
+            rest = mask
+            while rest:
+                low = rest & -rest
+                definitions.add(bits[low.bit_length() - 1])
+                rest ^= low
+            decoded[mask] = frozenset(definitions)
+        return decoded[mask]
+
+    result: List[Dict[str, Definitions]] = [{}] * len(code)
+    for i, block in enumerate(cfg.blocks):
+        written: Dict[str, Definitions] = {}
+        for n in range(block.start, block.stop):
+            instruction = code[n]
+            result[n] = {a: written[a] if a in written else
+                         decode(reach_in[i] & masks[a])
+                         for a in instruction.reads if is_variable(a)}
+            if instruction.writes is not None:
+                written[instruction.writes] = frozenset((n,))
+    return result
+
+
+class DominatorTree:
+    """Immediate dominator of each block, None for the entry and for the
+    blocks it does not reach. A block dominates another when every path
+    from the entry to the other goes through it."""
+
+    def __init__(self, cfg: ControlFlowGraph):
+        blocks = cfg.blocks
+        order = _reverse_postorder(cfg)
+        position = {b: n for n, b in enumerate(order)}
+        self.idom: List[Optional[int]] = [None] * len(blocks)
+        if not order:
+            self._pre, self._post = {}, {}
+            return
+        self.idom[0] = 0
+
+        def intersect(b1: int, b2: int) -> int:
+            while b1 != b2:
+                while position[b1] > position[b2]:
+                    b1 = self.idom[b1]
+                while position[b2] > position[b1]:
+                    b2 = self.idom[b2]
+            return b1
+
+        changed = True
+        while changed:
+            changed = False
+            for b in order[1:]:
+                idom = None
+                for p in blocks[b].predecessors:
+                    if self.idom[p] is not None:
+                        idom = p if idom is None else intersect(p, idom)
+                if idom != self.idom[b]:
+                    self.idom[b] = idom
+                    changed = True
+        self.idom[0] = None
+
+        # numbers of a walk of the tree: a dominates b when b is numbered
+        # between the entry in a and the exit from a
+        children: Dict[int, List[int]] = {}
+        for b in order[1:]:
+            children.setdefault(self.idom[b], []).append(b)
+        self._pre: Dict[int, int] = {}
+        self._post: Dict[int, int] = {}
+        stack = [(0, False)]
+        while stack:
+            b, done = stack.pop()
+            if done:
+                self._post[b] = len(self._pre) + len(self._post)
+                continue
+            self._pre[b] = len(self._pre) + len(self._post)
+            stack.append((b, True))
+            stack.extend((c, False) for c in children.get(b, ()))
+
+    def dominates(self, a: int, b: int) -> bool:
+        if a == b:
+            return True
+        if a not in self._pre or b not in self._pre:
+            return False
+        return self._pre[a] < self._pre[b] and self._post[b] < self._post[a]
+
+
+def _reverse_postorder(cfg: ControlFlowGraph) -> List[int]:
+    """Blocks reached from the entry, each after all its predecessors but
+    those that it reaches."""
+    if not cfg.blocks:
+        return []
+    order = []
+    visited = {0}
+    stack = [(0, iter(cfg.blocks[0].successors))]
+    while stack:
+        b, successors = stack[-1]
+        for successor in successors:
+            if successor not in visited:
+                visited.add(successor)
+                stack.append((successor,
+                              iter(cfg.blocks[successor].successors)))
+                break
+        else:
+            stack.pop()
+            order.append(b)
+    order.reverse()
+    return order
+
+
+def natural_loops(cfg: ControlFlowGraph,
+                  dominating: DominatorTree = None) -> Dict[int, Set[int]]:
+    """Blocks of the loop of each header, a block that some block it
+    dominates jumps back to: the header and the blocks that reach such a
+    jump without going through the header."""
+    if dominating is None:
+        dominating = DominatorTree(cfg)
+    loops: Dict[int, Set[int]] = {}
+    for i, block in enumerate(cfg.blocks):
+        for header in block.successors:
+            if not dominating.dominates(header, i):
+                continue
+            body = loops.setdefault(header, {header})
+            stack = [i]
+            while stack:
+                n = stack.pop()
+                if n not in body:
+                    body.add(n)
+                    stack.extend(cfg.blocks[n].predecessors)
+    return loops
@@ -0,0 +1,115 @@
+import glob
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from typing import Optional
+
+from c_instruction import Instruction, OpCode
+from c_pass_manager import DEFAULT_LEVEL
+from c_program import Program
+
+DEFAULT_DIRECTORY = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+    'minic')
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+_COMPILER_VERSION = None
+
+
+def compiler_version() -> str:
+    """Fingerprint of the compiler: its own sources and the Python version,
+    so that changing either invalidates every cached program."""
+    global _COMPILER_VERSION  # pylint: disable=global-statement
+    if _COMPILER_VERSION is None:
+        digest = hashlib.sha256(f'{sys.version}/{marshal.version}'.encode())
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(glob.glob(os.path.join(directory, 'c_*.py'))):
+            with open(name, 'rb') as file:
+                digest.update(file.read())
+        _COMPILER_VERSION = digest.hexdigest()
+    return _COMPILER_VERSION
+
+
+class CodeCache:
+    """Directory of compiled programs keyed by a hash of their source.
+
+    Entries are the marshalled (opcode, args) tuples of the three-address
+    code of a program, which is linked again when loaded. A hit touches
+    the entry, and storing a new one evicts the least recently used
+    entries while the directory is above max_size bytes.
+    """
+    SUFFIX = '.mcc'
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY,
+                 max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(source, opt_level: int = DEFAULT_LEVEL) -> str:
+        """Key of a source given as str or bytes-like object, compiled at
+        opt_level."""
+        if isinstance(source, str):
+            source = source.encode('utf-8', 'surrogatepass')
+        digest = hashlib.sha256(f'{compiler_version()}/{opt_level}'.encode())
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CodeCache.SUFFIX)
+
+    def get(self, key: str) -> Optional[Program]:
+        """Program of key, or None when it is missing or cannot be loaded,
+        in which case the entry is removed."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = marshal.load(file)
+            program = Program([Instruction.factory(OpCode(opcode), *args)
+                               for opcode, args in data])
+        except FileNotFoundError:
+            return None
+        except Exception:  # pylint: disable=broad-except
+            self._remove(path)  # corrupted entry
+            return None
+        os.utime(path)
+        return program
+
+    def put(self, key: str, program: Program):
+        data = marshal.dumps([(i.opcode.value, i.args) for i in program])
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(CodeCache.SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(os.path.join(self.directory, name))
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,44 @@
+from typing import Iterable, Iterator, List, Union
+
+from c_instruction import Instruction
+
+
+class CodeFragment:
+    """Sequence of instructions with O(1) append and extend.
+
+    Extending by another fragment links it instead of copying it, so a
+    program is assembled in time linear to its size and flattened once by
+    iterating over it. A fragment must not change after it is linked into
+    another one.
+    """
+    __slots__ = ('_parts', '_size')
+
+    def __init__(self, instructions: Iterable[Instruction] = ()):
+        self._parts: List[Union[Instruction, 'CodeFragment']] = list(
+            instructions)
+        self._size = len(self._parts)
+
+    def append(self, instruction: Instruction):
+        self._parts.append(instruction)
+        self._size += 1
+
+    def extend(self, other: Union['CodeFragment', Iterable[Instruction]]):
+        if not isinstance(other, CodeFragment):
+            other = CodeFragment(other)
+        if other._size:
+            self._parts.append(other)
+            self._size += other._size
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self) -> Iterator[Instruction]:
+        stack = [iter(self._parts)]
+        while stack:
+            for part in stack[-1]:
+                if isinstance(part, CodeFragment):
+                    stack.append(iter(part._parts))
+                    break
+                yield part
+            else:
+                stack.pop()
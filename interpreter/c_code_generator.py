@@ -1,28 +1,46 @@
+import re
 from collections import namedtuple
 from itertools import count
+from typing import List, Tuple
 
-from c_instruction import Instruction, OpCode
-from c_parser_result import Result
-from c_token import TokenType as T
+from c_ast import Function, Name, Node, Number, String
+from c_code_fragment import CodeFragment
+from c_instruction import Instruction, TEMP_PREFIX
 
 
 LoopLabels = namedtuple('LoopLabels', ['break_', 'continue_'])
 
+# Code of a node: its instructions and the value it leaves, if any
+Code = Tuple[CodeFragment, object]
+
 
 def name_generator(prefix: str):
     for i in count(1):
         yield f'{prefix}{i}'
 
 
+def _method_name(cls: type) -> str:
+    """ExprStmt -> expr_stmt, the name of its CodeGenerator method."""
+    return re.sub(r'(?<!^)([A-Z])', r'_\1', cls.__name__).lower()
+
+
 class CodeGenerator:
+    """Generates the code of an AST.
+
+    Nodes are visited in post-order with an explicit stack, so that long
+    statement lists and expressions do not grow the Python call stack. The
+    method named after the class of a node, as if_ for If, gets the node and
+    the Code of its children, None for a missing one, and returns the Code
+    of the node. The method with _pre appended, if any, is called before
+    the children are visited.
+    """
+
     def __init__(self):
         self._label_gen = name_generator('__label__')
-        self._temp_gen = name_generator('__temp__')
-        self._count = 0
-        self._expression_result = None
+        self._temp_gen = name_generator(TEMP_PREFIX)
         self._return_label = self._generate_label()
-        self._last_operator = ''
         self._loop_stack = []
+        self._methods = {}
 
     def _generate_label(self):
         return next(self._label_gen)
@@ -30,465 +48,162 @@ class CodeGenerator:
     def _generate_temp(self):
         return next(self._temp_gen)
 
-    def function_pre(self):
-        """Called before function."""
-        self._count = -1
-
-    def function(self, result: Result) -> Result:
-        """<function> -> <type> 'IDENT' '(' <argList> ')' <bloco>"""
-        bloco_code = result.code.pop()[0]
-        if result.code:
-            code = result.code.pop()[0]
-        else:
-            code = []
-        code.extend(bloco_code)
-        result.code.append((code, None))
-        return result
-
-    def arg_list_pre(self):
-        """Called before arg_list."""
-        self._count += 1
-
-    def arg_list(self, result: Result) -> Result:
-        """<argList> -> <arg> <restoArgList>"""
-        ident = CodeGenerator._get_ident_or_value(result)
-        code = [Instruction.operation('+', 0, f'__arg__{self._count}', ident)]
-        self._count -= 1
-        if result.code:
-            code.extend(result.code.pop()[0])
-        result.code.append((code, None))
-        return result
-
-    def arg_list_empty(self, result: Result) -> Result:
-        """<argList> -> &"""
-        return result
-
-    def arg(self, result: Result) -> Result:
-        """<arg> -> <type> 'IDENT'"""
-        return result
-
-    def resto_arg_list(self, result: Result) -> Result:
-        """<restoArgList> -> ',' <argList>"""
-        return result
-
-    def resto_arg_list_empty(self, result: Result) -> Result:
-        """<restoArgList> -> &"""
-        return result
-
-    def type_(self, result: Result) -> Result:
-        """<type> -> 'int' | 'float'"""
-        return result
-
-    def bloco(self, result: Result) -> Result:
-        """<bloco> -> '{' <stmtList> '}'"""
-        return result
-
-    def stmt_list_stmt(self, result: Result) -> Result:
-        """<stmtList> -> <stmt> <stmtList>"""
-        stmt_list_code = result.code.pop()[0]
-        code = result.code.pop()[0]
-        code.extend(stmt_list_code)
-        result.code.append((code, None))
-        return result
-
-    def stmt_list_declaration(self, result: Result) -> Result:
-        """<stmtList> -> <declaration> <stmtList>"""
-        return result
-
-    def stmt_list_empty(self, result: Result) -> Result:
-        """<stmtList> -> &"""
-        result.code.append(([], None))
-        return result
-
-    def stmt_for(self, result: Result) -> Result:
-        """<stmt> -> <forStmt>"""
-        return result
-
-    def stmt_io(self, result: Result) -> Result:
-        """<stmt> -> <ioStmt>"""
-        return result
-
-    def stmt_while(self, result: Result) -> Result:
-        """<stmt> -> <whileStmt>"""
-        return result
-
-    def stmt_expr(self, result: Result) -> Result:
-        """<stmt> -> <expr> ';'"""
-        return result
-
-    def stmt_if(self, result: Result) -> Result:
-        """<stmt> -> <ifStmt>"""
-        return result
-
-    def stmt_bloco(self, result: Result) -> Result:
-        """<stmt> -> <bloco>"""
-        return result
-
-    def stmt_break(self, result: Result) -> Result:
-        """<stmt> -> 'break' ';'"""
+    def generate(self, function: Function) -> List[Instruction]:
+        """Code of function, in a list."""
+        return list(self.visit(function)[0])
+
+    def visit(self, root: Node) -> Code:
+        enter, leave = self._methods_of(type(root))
+        if enter is not None:
+            enter(root)
+        stack = [(root, iter(root.children()), [], leave)]
+        while True:
+            node, children, codes, leave = stack[-1]
+            child = next(children, stack)
+            if child is stack:
+                stack.pop()
+                code = leave(node, codes)
+                if not stack:
+                    return code
+                stack[-1][2].append(code)
+            elif child is None:
+                codes.append(None)
+            elif type(child) is Name:
+                codes.append((CodeFragment(), child.ident))
+            elif type(child) is Number:
+                codes.append((CodeFragment(), child.value))
+            else:
+                enter, leave = self._methods_of(type(child))
+                if enter is not None:
+                    enter(child)
+                stack.append((child, iter(child.children()), [], leave))
+
+    def _methods_of(self, cls: type):
+        methods = self._methods.get(cls)
+        if methods is None:
+            name = _method_name(cls)
+            methods = (getattr(self, f'{name}_pre', None),
+                       getattr(self, name, getattr(self, f'{name}_', None)))
+            self._methods[cls] = methods
+        return methods
+
+    def function(self, node: Function, codes: List[Code]) -> Code:
+        code = CodeFragment(Instruction.move(f'__arg__{i}', arg.ident)
+                            for i, arg in enumerate(node.args))
+        code.extend(codes[-1][0])
+        code.append(Instruction.label(self._return_label))
+        return code, None
+
+    def block(self, _node, codes: List[Code]) -> Code:
+        code = CodeFragment()
+        for stmt_code, _ in codes:
+            code.extend(stmt_code)
+        return code, None
+
+    def declaration(self, _node, _codes) -> Code:
+        return CodeFragment(), None
+
+    def empty(self, _node, _codes) -> Code:
+        return CodeFragment(), None
+
+    def expr_stmt(self, _node, codes: List[Code]) -> Code:
+        return codes[0]
+
+    def break_(self, _node, _codes) -> Code:
         break_label = self._loop_stack[-1].break_
-        code = [Instruction.jump(break_label)]
-        result.code.append((code, None))
-        return result
+        return CodeFragment([Instruction.jump(break_label)]), None
 
-    def stmt_continue(self, result: Result) -> Result:
-        """<stmt> -> 'continue' ';'"""
+    def continue_(self, _node, _codes) -> Code:
         continue_label = self._loop_stack[-1].continue_
-        code = [Instruction.jump(continue_label)]
-        result.code.append((code, None))
-        return result
-
-    def stmt_return(self, result: Result) -> Result:
-        """<stmt> -> 'return' <fator> ';'"""
-        code = [Instruction.jump(self._return_label)]
-        result.code.append((code, None))
-        return result
-
-    def stmt_null(self, result: Result) -> Result:
-        """<stmt> -> ';'"""
-        result.code.append(([], None))
-        return result
-
-    def declaration(self, result: Result) -> Result:
-        """<declaration> -> <type> <identList> ';'"""
-        return result
-
-    def ident_list(self, result: Result) -> Result:
-        """<identList> -> 'IDENT' <restoIdentList>"""
-        return result
-
-    def resto_ident_list(self, result: Result) -> Result:
-        """<restoIdentList> -> ',' 'IDENT' <restoIdentList>"""
-        return result
-
-    def resto_ident_list_empty(self, result: Result) -> Result:
-        """<restoIdentList> -> &"""
-        return result
-
-    def for_stmt_pre(self):
-        """Called before for_stmt."""
+        return CodeFragment([Instruction.jump(continue_label)]), None
+
+    def return_(self, _node, codes: List[Code]) -> Code:
+        code = codes[0][0]
+        code.append(Instruction.jump(self._return_label))
+        return code, None
+
+    def for_pre(self, _node):
         self._loop_stack.append(LoopLabels(self._generate_label(),
                                            self._generate_label()))
 
-    def for_stmt(self, result: Result) -> Result:
-        """<forStmt> -> 'for' '(' <optExpr> ';' <optExpr> ';'
-                         <optExpr> ')' <stmt>
-        """
-        stmt_code, _ = result.code.pop()
-        incr_code, _ = result.code.pop()
-        cond_code, cond_value = result.code.pop()
-        init_code, _ = result.code.pop()
+    def for_(self, _node, codes: List[Code]) -> Code:
+        """A missing condition is true."""
+        init, cond, incr, (stmt_code, _) = codes
+        cond_code, cond_value = (CodeFragment(), 1) if cond is None else cond
         before, inside = (self._generate_label() for _ in range(2))
-        after, incr = self._loop_stack.pop()
-        code = init_code
+        after, incr_label = self._loop_stack.pop()
+        code = CodeFragment() if init is None else init[0]
         code.append(Instruction.label(before))
         code.extend(cond_code)
         code.append(Instruction.if_(cond_value, inside, after))
         code.append(Instruction.label(inside))
         code.extend(stmt_code)
-        code.append(Instruction.label(incr))
-        code.extend(incr_code)
+        code.append(Instruction.label(incr_label))
+        if incr is not None:
+            code.extend(incr[0])
         code.append(Instruction.jump(before))
         code.append(Instruction.label(after))
-        result.code.append((code, None))
-        return result
-
-    def opt_expr(self, result: Result) -> Result:
-        """<optExpr> -> <expr>"""
-        return result
-
-    def opt_expr_empty(self, result: Result) -> Result:
-        """<optExpr> -> &"""
-        result.code.append(([], 1))
-        return result
-
-    def io_stmt_scan(self, result: Result) -> Result:
-        """<ioStmt> -> 'scan' '(' 'STR' ',' 'IDENT' ')' ';'"""
-        ident = CodeGenerator._get_ident_or_value(result)
-        command = f'scan_{result.type_.value}'
-        code = [Instruction.call(command, result.value.pop(), ident)]
-        result.code.append((code, None))
-        return result
-
-    def io_stmt_print(self, result: Result) -> Result:
-        """<ioStmt> -> 'print' '(' <outList> ')' ';'"""
-        return result
-
-    def _out_list(self, result: Result) -> Result:
-        resto_code = result.code.pop()[0]
-        value = CodeGenerator._get_ident_or_value(result)
-        code = [Instruction.call('print', value)]
-        code.extend(resto_code)
-        result.code.append((code, None))
-        return result
-
-    def out_list(self, result: Result) -> Result:
-        """<outList> -> <out> <restoOutList>"""
-        return self._out_list(result)
-
-    def out(self, result: Result) -> Result:
-        """<out> -> 'STR' | 'IDENT' | 'NUMint' | 'NUMfloat'"""
-        return result
-
-    def resto_out_list(self, result: Result) -> Result:
-        """<restoOutList> -> ',' <out> <restoOutList>"""
-        return self._out_list(result)
-
-    def resto_out_list_empty(self, result: Result) -> Result:
-        """<restoOutList> -> &"""
-        result.code.append(([], None))
-        return result
-
-    def while_stmt_pre(self):
-        """Called before while_stmt."""
+        return code, None
+
+    def scan(self, node, _codes) -> Code:
+        command = f'scan_{node.target.type_.value}'
+        return CodeFragment([Instruction.call(command, node.format,
+                                              node.target.ident)]), None
+
+    def print_(self, _node, codes: List[Code]) -> Code:
+        return CodeFragment(Instruction.call('print', value)
+                            for _, value in codes), None
+
+    def string(self, node: String, _codes) -> Code:
+        return CodeFragment(), node.value
+
+    def while_pre(self, _node):
         self._loop_stack.append(LoopLabels(self._generate_label(),
                                            self._generate_label()))
 
-    def while_stmt(self, result: Result) -> Result:
-        """<whileStmt> -> 'while' '(' <expr> ')' <stmt>"""
-        stmt_code, _ = result.code.pop()
-        expr_code, expr_value = result.code.pop()
+    def while_(self, _node, codes: List[Code]) -> Code:
+        (expr_code, expr_value), (stmt_code, _) = codes
         after, before = self._loop_stack.pop()
         inside = self._generate_label()
-        code = [Instruction.label(before)]
+        code = CodeFragment([Instruction.label(before)])
         code.extend(expr_code)
         code.append(Instruction.if_(expr_value, inside, after))
         code.append(Instruction.label(inside))
         code.extend(stmt_code)
         code.append(Instruction.jump(before))
         code.append(Instruction.label(after))
-        result.code.append((code, None))
-        return result
-
-    def if_stmt(self, result: Result) -> Result:
-        """<ifStmt> -> 'if' '(' <expr> ')' <stmt> <elsePart>"""
-        else_code, else_label = result.code.pop()
-        stmt_code, _ = result.code.pop()
-        expr_code, expr_value = result.code.pop()
-        if_label, after = (self._generate_label() for _ in range(2))
+        return code, None
+
+    def if_(self, _node, codes: List[Code]) -> Code:
+        (expr_code, expr_value), (stmt_code, _), else_ = codes
+        if_label, after = self._generate_label(), self._generate_label()
+        else_label = after if else_ is None else self._generate_label()
         code = expr_code
         code.append(Instruction.if_(expr_value, if_label, else_label))
         code.append(Instruction.label(if_label))
         code.extend(stmt_code)
-        code.append(Instruction.jump(after))
-        code.append(Instruction.label(else_label))
-        code.extend(else_code)
+        if else_ is not None:
+            code.append(Instruction.jump(after))
+            code.append(Instruction.label(else_label))
+            code.extend(else_[0])
         code.append(Instruction.label(after))
-        result.code.append((code, None))
-        return result
-
-    def else_part(self, result: Result) -> Result:
-        """<elsePart> -> 'else' <stmt>"""
-        label = self._generate_label()
-        code = [Instruction.label(label)]
-        stmt_code = result.code.pop()[0]
-        code.extend(stmt_code)
-        result.code.append((code, label))
-        return result
-
-    def else_part_empty(self, result: Result) -> Result:
-        """<elsePart> -> &"""
-        label = self._generate_label()
-        result.code.append(([Instruction.label(label)], label))
-        return result
-
-    def expr(self, result: Result) -> Result:
-        """<expr> -> <atrib>"""
-        return result
-
-    def atrib(self, result: Result) -> Result:
-        """<atrib> -> <or> <restoAtrib>"""
-        resto_code, resto_value = result.code.pop()
-        if resto_value is not None:
-            code, value = result.code.pop()
-            code.extend(resto_code)
-            code.append(Instruction.operation('+', 0, resto_value, value))
-            result.code.append((code, value))
-        return result
-
-    def resto_atrib(self, result: Result) -> Result:
-        """<restoAtrib> -> '=' <atrib>"""
-        return result
-
-    def resto_atrib_empty(self, result: Result) -> Result:
-        """<restoAtrib> -> &"""
-        result.code.append(([], None))
-        return result
-
-    def or_(self, result: Result) -> Result:
-        """<or> -> <and> <restoOr>"""
-        return self._oper(result, resto=False)
-
-    def resto_or(self, result: Result) -> Result:
-        """<restoOr> -> '||' <and> <restoOr>"""
-        return self._oper(result, '||', resto=True)
-
-    def resto_or_empty(self, result: Result) -> Result:
-        """<restoOr> -> &"""
-        return self._empty(result)
-
-    def and_(self, result: Result) -> Result:
-        """<and> -> <not> <restoAnd>"""
-        return self._oper(result, resto=False)
-
-    def resto_and(self, result: Result) -> Result:
-        """<restoAnd> -> '&&' <not> <restoAnd>"""
-        return self._oper(result, '&&', resto=True)
-
-    def resto_and_empty(self, result: Result) -> Result:
-        """<restoAnd> -> &"""
-        return self._empty(result)
-
-    def not_not(self, result: Result) -> Result:
-        """<not> -> '!' <not>"""
-        code, value = result.code.pop()
+        return code, None
+
+    def unary(self, node, codes: List[Code]) -> Code:
+        code, value = codes[0]
         temp = self._generate_temp()
-        code.append(Instruction.unary('!', value, temp))
-        result.code.append((code, temp))
-        return result
-
-    def not_rel(self, result: Result) -> Result:
-        """<not> -> <rel>"""
-        return result
-
-    def rel(self, result: Result) -> Result:
-        """<rel> -> <add> <restoRel>"""
-        return self._oper(result, resto=False)
-
-    def resto_rel_eq(self, result: Result) -> Result:
-        """<restoRel> -> '==' <add>"""
-        result = self._empty(result)
-        return self._oper(result, '==', resto=True)
-
-    def resto_rel_neq(self, result: Result) -> Result:
-        """<restoRel> -> '!=' <add>"""
-        result = self._empty(result)
-        return self._oper(result, '!=', resto=True)
-
-    def resto_rel_gt(self, result: Result) -> Result:
-        """<restoRel> -> '>' <add>"""
-        result = self._empty(result)
-        return self._oper(result, '>', resto=True)
-
-    def resto_rel_geq(self, result: Result) -> Result:
-        """<restoRel> -> '>=' <add>"""
-        result = self._empty(result)
-        return self._oper(result, '>=', resto=True)
-
-    def resto_rel_lt(self, result: Result) -> Result:
-        """<restoRel> -> '<' <add>"""
-        result = self._empty(result)
-        return self._oper(result, '<', resto=True)
-
-    def resto_rel_leq(self, result: Result) -> Result:
-        """<restoRel> -> '<=' <add>"""
-        result = self._empty(result)
-        return self._oper(result, '<=', resto=True)
-
-    def resto_rel_empty(self, result: Result) -> Result:
-        """<restoRel> -> &"""
-        return self._empty(result)
-
-    def add(self, result: Result) -> Result:
-        """<add> -> <mult> <restoAdd>"""
-        return self._oper(result, resto=False)
-
-    def resto_add_plus(self, result: Result) -> Result:
-        """<restoAdd> -> '+' <mult> <restoAdd>"""
-        return self._oper(result, '+', resto=True)
-
-    def resto_add_minus(self, result: Result) -> Result:
-        """<restoAdd> -> '-' <mult> <restoAdd>"""
-        return self._oper(result, '-', resto=True)
-
-    def resto_add_empty(self, result: Result) -> Result:
-        """<restoAdd> -> &"""
-        return self._empty(result)
-
-    def mult(self, result: Result) -> Result:
-        """<mult> -> <uno> <restoMult>"""
-        return self._oper(result, resto=False)
-
-    def resto_mult_mult(self, result: Result) -> Result:
-        """<restoMult> -> '*' <uno> <restoMult>"""
-        return self._oper(result, '*', resto=True)
-
-    def resto_mult_div(self, result: Result) -> Result:
-        """<restoMult> -> '/' <uno> <restoMult>"""
-        return self._oper(result, '/', resto=True)
-
-    def resto_mult_mod(self, result: Result) -> Result:
-        """<restoMult> -> '%' <uno> <restoMult>"""
-        return self._oper(result, '%', resto=True)
-
-    def resto_mult_empty(self, result: Result) -> Result:
-        """<restoMult> -> &"""
-        return self._empty(result)
-
-    def uno_plus(self, result: Result) -> Result:
-        """<uno> -> '+' <uno>"""
-        return result
-
-    def uno_minus(self, result: Result) -> Result:
-        """<uno> -> '-' <uno>"""
-        code, value = result.code.pop()
+        code.append(Instruction.unary(node.operator, value, temp))
+        return code, temp
+
+    def binary(self, node, codes: List[Code]) -> Code:
+        (code, left), (right_code, right) = codes
         temp = self._generate_temp()
-        code.append(Instruction.operation('-', 0, value, temp))
-        result.code.append((code, temp))
-        return result
-
-    def uno_fator(self, result: Result) -> Result:
-        """<uno> -> <fator>"""
-        return result
-
-    def fator_ident(self, result: Result) -> Result:
-        """<fator> -> 'IDENT'"""
-        ident = CodeGenerator._get_ident_or_value(result)
-        result.code.append(([], ident))
-        return result
-
-    def fator_num(self, result: Result) -> Result:
-        """<fator> -> 'NUMint' | 'NUMfloat'"""
-        result.code.append(([], result.value.pop()))
-        return result
-
-    def fator_atrib(self, result: Result) -> Result:
-        """<fator> -> '(' <atrib> ')'"""
-        return result
-
-    def _oper(self, result: Result, operator: str = '+', *,
-              resto: bool) -> Result:
-        resto_code, resto_value = result.code.pop()
-        code, value = result.code.pop()
-
-        if self._last_operator == '/' and result.type_ == T.INT:
-            resto_code[0].opcode = OpCode.IDIV
-
-        if resto:
-            left = self._generate_temp()
-            dest = left
-            code.append(Instruction.operation(operator, left, value,
-                                              resto_value))
-            self._last_operator = operator
-        elif resto_code:
-            dest = self._expression_result
-            resto_code[0].change_arg(0, value)
-        else:
-            dest = value
-
-        code.extend(resto_code)
-        result.code.append((code, dest))
-        return result
-
-    def _empty(self, result: Result) -> Result:
-        self._expression_result = self._generate_temp()
-        self._last_operator = ''
-        result.code.append(([], self._expression_result))
-        return result
-
-    @staticmethod
-    def _get_ident_or_value(result: Result) -> str:
-        value = result.value.pop()
-        if isinstance(value, tuple):
-            value = '__{1}__{0}'.format(*value)
-        return value
+        code.extend(right_code)
+        code.append(Instruction.operation(node.operator, left, right, temp))
+        return code, temp
+
+    def assign(self, _node, codes: List[Code]) -> Code:
+        (code, target), (value_code, value) = codes
+        code.extend(value_code)
+        code.append(Instruction.move(value, target))
+        return code, target
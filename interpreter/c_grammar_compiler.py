@@ -0,0 +1,330 @@
+import hashlib
+import os
+import re
+import sys
+from argparse import ArgumentParser
+from collections import namedtuple
+from typing import Dict, List, Optional, Set, Tuple
+
+from c_token import TokenType, TOKEN_TYPES
+
+
+_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+GRAMMAR_FILE = os.path.join(os.path.dirname(_DIRECTORY), 'etc', 'miniC.gmr')
+TABLES_FILE = os.path.join(_DIRECTORY, 'c_grammar_tables.py')
+
+
+class GrammarError(Exception):
+    pass
+
+
+# Alternative of a non-terminal: symbols are non-terminal names and
+# token types, and an empty tuple is the empty production (&)
+Rule = namedtuple('Rule', ['head', 'symbols'])
+
+# A conflict of the LL(1) table: token selects both rules, kept is used
+Conflict = namedtuple('Conflict', ['head', 'token', 'kept', 'dropped'])
+
+GRAMMAR_PATTERN = re.compile(r'''
+      (?P<comment>\#[^\n]*)
+    | (?P<space>\s+)
+    | <(?P<nonterminal>\w+)(?P<start>\*?)>
+    | '(?P<terminal>[^']+)'
+    | (?P<arrow>->)
+    | (?P<bar>\|)
+    | (?P<empty>&)
+    | (?P<end>;)
+''', re.VERBOSE)
+
+_TERMINALS = {'NUMint': TokenType.NUMINT, 'NUMfloat': TokenType.NUMFLOAT}
+
+
+def snake_case(name: str) -> str:
+    """argList -> arg_list, the naming of the parser rules."""
+    return re.sub(r'([A-Z])', lambda m: '_' + m.group(1).lower(), name)
+
+
+def _terminal(lexeme: str) -> TokenType:
+    if lexeme in _TERMINALS:
+        return _TERMINALS[lexeme]
+    if lexeme in TOKEN_TYPES:
+        return TOKEN_TYPES[lexeme]
+    if lexeme in TokenType.__members__:
+        return TokenType[lexeme]
+    raise GrammarError(f'Unknown terminal {lexeme!r}.')
+
+
+def first_of(symbols, first, nullable) -> Set[Optional[TokenType]]:
+    """FIRST of a sequence of symbols, with None if it is nullable. A symbol
+    may also be a set of token types, any of which matches."""
+    result: Set[Optional[TokenType]] = set()
+    for symbol in symbols:
+        if isinstance(symbol, TokenType):
+            result.add(symbol)
+            return result
+        if not isinstance(symbol, str):
+            result |= set(symbol)
+            return result
+        result |= first[symbol] - {None}
+        if symbol not in nullable:
+            return result
+    result.add(None)
+    return result
+
+
+def predict(head: str, symbols, first, follow, nullable) -> Set[TokenType]:
+    """Tokens that select the rule head -> symbols."""
+    tokens = first_of(symbols, first, nullable)
+    if None in tokens:
+        return (tokens - {None}) | follow[head]
+    return tokens
+
+
+class Grammar:
+    """Grammar in the .gmr notation of etc/miniC.gmr, with its nullable,
+    FIRST and FOLLOW sets and LL(1) table.
+
+    FIRST and FOLLOW map each non-terminal to a set of token types; FIRST
+    has None when the non-terminal derives the empty string. TABLE maps
+    each non-terminal to {token type: index of the rule in RULES}. When two
+    rules are selected by the same token the first one is kept and the pair
+    goes to CONFLICTS.
+    """
+
+    def __init__(self, text: str):
+        self.hash = grammar_hash(text)
+        self.rules: List[Rule] = []
+        self.start: Optional[str] = None
+        self._read(text)
+        self.nonterminals = list(dict.fromkeys(r.head for r in self.rules))
+        self._check_undefined()
+        self.nullable = self._nullable()
+        self.first = self._first()
+        self.follow = self._follow()
+        self.table, self.conflicts = self._table()
+
+    def _read(self, text: str):
+        head, symbols, pos = None, [], 0
+        arrow_expected = False
+        while pos < len(text):
+            match = GRAMMAR_PATTERN.match(text, pos)
+            if match is None:
+                row = text.count('\n', 0, pos) + 1
+                raise GrammarError(f'Invalid grammar at line {row}: '
+                                   f'{text[pos:pos + 20]!r}')
+            pos = match.end()
+            kind = match.lastgroup
+            if kind in ('comment', 'space', 'empty'):
+                continue
+            if kind == 'start':
+                kind = 'nonterminal'
+            if arrow_expected:
+                if kind != 'arrow':
+                    raise GrammarError(f'Expected -> after <{head}>.')
+                arrow_expected = False
+            elif kind == 'nonterminal' and head is None:
+                head = snake_case(match.group('nonterminal'))
+                if match.group('start'):
+                    self.start = head
+                arrow_expected = True
+            elif kind == 'nonterminal':
+                symbols.append(snake_case(match.group('nonterminal')))
+            elif kind == 'terminal':
+                symbols.append(_terminal(match.group('terminal')))
+            elif kind in ('bar', 'end') and head is not None:
+                self.rules.append(Rule(head, tuple(symbols)))
+                symbols = []
+                if kind == 'end':
+                    head = None
+            else:
+                raise GrammarError(f'Unexpected {match.group()!r}.')
+        if head is not None:
+            raise GrammarError(f'Missing ; after the rules of <{head}>.')
+        if not self.rules:
+            raise GrammarError('Empty grammar.')
+        if self.start is None:
+            self.start = self.rules[0].head
+
+    def _check_undefined(self):
+        defined = set(self.nonterminals)
+        for rule in self.rules:
+            for symbol in rule.symbols:
+                if isinstance(symbol, str) and symbol not in defined:
+                    raise GrammarError(f'<{symbol}> used by <{rule.head}> '
+                                       f'is not defined.')
+
+    def _nullable(self) -> Set[str]:
+        nullable: Set[str] = set()
+        changed = True
+        while changed:
+            changed = False
+            for head, symbols in self.rules:
+                if head not in nullable and all(s in nullable
+                                                for s in symbols):
+                    nullable.add(head)
+                    changed = True
+        return nullable
+
+    def first_of(self, symbols, first=None) -> Set[Optional[TokenType]]:
+        return first_of(symbols, self.first if first is None else first,
+                        self.nullable)
+
+    def _first(self) -> Dict[str, Set[Optional[TokenType]]]:
+        first = {n: ({None} if n in self.nullable else set())
+                 for n in self.nonterminals}
+        changed = True
+        while changed:
+            changed = False
+            for head, symbols in self.rules:
+                new = self.first_of(symbols, first) - first[head]
+                if new:
+                    first[head] |= new
+                    changed = True
+        return first
+
+    def _follow(self) -> Dict[str, Set[TokenType]]:
+        follow: Dict[str, Set[TokenType]] = {n: set()
+                                             for n in self.nonterminals}
+        follow[self.start].add(TokenType.EOF)
+        changed = True
+        while changed:
+            changed = False
+            for head, symbols in self.rules:
+                for i, symbol in enumerate(symbols):
+                    if not isinstance(symbol, str):
+                        continue
+                    rest = self.first_of(symbols[i + 1:])
+                    new = rest - {None}
+                    if None in rest:
+                        new |= follow[head]
+                    if not new <= follow[symbol]:
+                        follow[symbol] |= new
+                        changed = True
+        return follow
+
+    def predict(self, head: str, symbols) -> Set[TokenType]:
+        return predict(head, symbols, self.first, self.follow, self.nullable)
+
+    def _table(self) -> Tuple[Dict[str, Dict[TokenType, int]],
+                              List[Conflict]]:
+        table: Dict[str, Dict[TokenType, int]] = {n: {}
+                                                  for n in self.nonterminals}
+        conflicts = []
+        for index, (head, symbols) in enumerate(self.rules):
+            row = table[head]
+            for token in sorted(self.predict(head, symbols),
+                                key=lambda t: t.name):
+                if token in row:
+                    conflicts.append(Conflict(head, token, row[token], index))
+                else:
+                    row[token] = index
+        return table, conflicts
+
+    def describe(self, conflict: Conflict) -> str:
+        def rule(index):
+            symbols = self.rules[index].symbols
+            return ' '.join(s if isinstance(s, str) else s.name
+                            for s in symbols) or '&'
+        return (f'{conflict.head}: {conflict.token.name} selects '
+                f'"{rule(conflict.kept)}" and "{rule(conflict.dropped)}", '
+                f'using the first')
+
+
+def grammar_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _wrap(prefix: str, items: List[str], suffix: str) -> List[str]:
+    """Lines of prefix + items + suffix wrapped at 79 columns."""
+    lines, line = [], prefix
+    indent = ' ' * len(prefix)
+    for i, item in enumerate(items):
+        item += suffix if i == len(items) - 1 else ','
+        if len(line) + len(item) + 1 > 79 and line.strip():
+            lines.append(line.rstrip())
+            line = indent
+        line += item + ' '
+    if not items:
+        line += suffix
+    lines.append(line.rstrip())
+    return lines
+
+
+def _tokens(tokens) -> List[str]:
+    return sorted(('None' if t is None else f'T.{t.name}') for t in tokens)
+
+
+def _symbol(symbol) -> str:
+    return repr(symbol) if isinstance(symbol, str) else f'T.{symbol.name}'
+
+
+def generate(grammar: Grammar) -> str:
+    """Source of a module with the tables of grammar."""
+    lines = ['# Generated by c_grammar_compiler.py from etc/miniC.gmr. '
+             'Do not edit.',
+             'from c_token import TokenType as T',
+             '',
+             f'GRAMMAR_HASH = (\n    {grammar.hash!r})',
+             '',
+             f'START = {grammar.start!r}',
+             '',
+             ]
+    lines += _wrap('NULLABLE = {', [repr(n) for n in grammar.nonterminals
+                                    if n in grammar.nullable], '}')
+    lines += ['', 'RULES = [']
+    for head, symbols in grammar.rules:
+        items = [_symbol(s) for s in symbols]
+        if len(items) == 1:
+            items[0] += ','
+        lines += _wrap(f'    ({head!r}, (', items, ')),')
+    lines.append(']')
+    for name, sets in (('FIRST', grammar.first), ('FOLLOW', grammar.follow)):
+        lines += ['', f'{name} = {{']
+        for head in grammar.nonterminals:
+            tokens = _tokens(sets[head])
+            lines += (_wrap(f'    {head!r}: {{', tokens, '},') if tokens
+                      else [f'    {head!r}: set(),'])
+        lines.append('}')
+    lines += ['', 'TABLE = {']
+    for head in grammar.nonterminals:
+        lines += _wrap(f'    {head!r}: {{',
+                       [f'T.{t.name}: {i}'
+                        for t, i in grammar.table[head].items()], '},')
+    lines += ['}', '', 'CONFLICTS = [']
+    lines += [f'    {grammar.describe(c)!r},' for c in grammar.conflicts]
+    lines += [']', '']
+    return '\n'.join(lines)
+
+
+def main():
+    arg_parser = ArgumentParser(
+        description='Computes FIRST, FOLLOW and the LL(1) table of a grammar')
+    arg_parser.add_argument('grammar', nargs='?', default=GRAMMAR_FILE,
+                            help='.gmr grammar file (default: '
+                                 'etc/miniC.gmr)')
+    arg_parser.add_argument('-o', '--output', metavar='FILE',
+                            default=TABLES_FILE,
+                            help="module to write, - for stdout (default: "
+                                 "c_grammar_tables.py)")
+    options = arg_parser.parse_args()
+
+    with open(options.grammar, encoding='utf-8') as file:
+        text = file.read()
+    try:
+        grammar = Grammar(text)
+    except GrammarError as exception:
+        print(exception, file=sys.stderr)
+        sys.exit(2)
+    for conflict in grammar.conflicts:
+        print(f'LL(1) conflict in {grammar.describe(conflict)}',
+              file=sys.stderr)
+    source = generate(grammar)
+    if options.output == '-':
+        sys.stdout.write(source)
+    else:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            file.write(source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# Generated by c_grammar_compiler.py from etc/miniC.gmr. Do not edit.
+from c_token import TokenType as T
+
+GRAMMAR_HASH = (
+    '5ffdd4d2a1a5fe1b8787c0691f5f40aab92cfa5bb8d2ede0006eb62c1c4c5b7b')
+
+START = 'function'
+
+NULLABLE = {'arg_list', 'resto_arg_list', 'stmt_list', 'resto_ident_list',
+            'opt_expr', 'resto_out_list', 'else_part', 'resto_atrib',
+            'resto_or', 'resto_and', 'resto_rel', 'resto_add', 'resto_mult'}
+
+RULES = [
+    ('function', ('type', T.IDENT, T.OPAR, 'arg_list', T.CPAR, 'bloco')),
+    ('arg_list', ('arg', 'resto_arg_list')),
+    ('arg_list', ()),
+    ('arg', ('type', T.IDENT)),
+    ('resto_arg_list', (T.COMMA, 'arg_list')),
+    ('resto_arg_list', ()),
+    ('type', (T.INT,)),
+    ('type', (T.FLOAT,)),
+    ('bloco', (T.OBRKT, 'stmt_list', T.CBRKT)),
+    ('stmt_list', ('stmt', 'stmt_list')),
+    ('stmt_list', ('declaration', 'stmt_list')),
+    ('stmt_list', ()),
+    ('stmt', ('for_stmt',)),
+    ('stmt', ('io_stmt',)),
+    ('stmt', ('while_stmt',)),
+    ('stmt', ('expr', T.SEMICOLON)),
+    ('stmt', ('if_stmt',)),
+    ('stmt', ('bloco',)),
+    ('stmt', (T.BREAK, T.SEMICOLON)),
+    ('stmt', (T.CONTINUE, T.SEMICOLON)),
+    ('stmt', (T.RETURN, 'fator', T.SEMICOLON)),
+    ('stmt', (T.SEMICOLON,)),
+    ('declaration', ('type', 'ident_list', T.SEMICOLON)),
+    ('ident_list', (T.IDENT, 'resto_ident_list')),
+    ('resto_ident_list', (T.COMMA, T.IDENT, 'resto_ident_list')),
+    ('resto_ident_list', ()),
+    ('for_stmt', (T.FOR, T.OPAR, 'opt_expr', T.SEMICOLON, 'opt_expr',
+                  T.SEMICOLON, 'opt_expr', T.CPAR, 'stmt')),
+    ('opt_expr', ('expr',)),
+    ('opt_expr', ()),
+    ('io_stmt', (T.SCAN, T.OPAR, T.STR, T.COMMA, T.IDENT, T.CPAR,
+                 T.SEMICOLON)),
+    ('io_stmt', (T.PRINT, T.OPAR, 'out_list', T.CPAR, T.SEMICOLON)),
+    ('out_list', ('out', 'resto_out_list')),
+    ('out', (T.STR,)),
+    ('out', (T.IDENT,)),
+    ('out', (T.NUMINT,)),
+    ('out', (T.NUMFLOAT,)),
+    ('resto_out_list', (T.COMMA, 'out', 'resto_out_list')),
+    ('resto_out_list', ()),
+    ('while_stmt', (T.WHILE, T.OPAR, 'expr', T.CPAR, 'stmt')),
+    ('if_stmt', (T.IF, T.OPAR, 'expr', T.CPAR, 'stmt', 'else_part')),
+    ('else_part', (T.ELSE, 'stmt')),
+    ('else_part', ()),
+    ('expr', ('atrib',)),
+    ('atrib', ('or', 'resto_atrib')),
+    ('resto_atrib', (T.ASSIGN, 'atrib')),
+    ('resto_atrib', ()),
+    ('or', ('and', 'resto_or')),
+    ('resto_or', (T.OR, 'and', 'resto_or')),
+    ('resto_or', ()),
+    ('and', ('not', 'resto_and')),
+    ('resto_and', (T.AND, 'not', 'resto_and')),
+    ('resto_and', ()),
+    ('not', (T.NOT, 'not')),
+    ('not', ('rel',)),
+    ('rel', ('add', 'resto_rel')),
+    ('resto_rel', (T.EQ, 'add')),
+    ('resto_rel', (T.NEQ, 'add')),
+    ('resto_rel', (T.LT, 'add')),
+    ('resto_rel', (T.LEQ, 'add')),
+    ('resto_rel', (T.GT, 'add')),
+    ('resto_rel', (T.GEQ, 'add')),
+    ('resto_rel', ()),
+    ('add', ('mult', 'resto_add')),
+    ('resto_add', (T.PLUS, 'mult', 'resto_add')),
+    ('resto_add', (T.MINUS, 'mult', 'resto_add')),
+    ('resto_add', ()),
+    ('mult', ('uno', 'resto_mult')),
+    ('resto_mult', (T.MULT, 'uno', 'resto_mult')),
+    ('resto_mult', (T.DIV, 'uno', 'resto_mult')),
+    ('resto_mult', (T.MOD, 'uno', 'resto_mult')),
+    ('resto_mult', ()),
+    ('uno', (T.PLUS, 'uno')),
+    ('uno', (T.MINUS, 'uno')),
+    ('uno', ('fator',)),
+    ('fator', (T.NUMINT,)),
+    ('fator', (T.NUMFLOAT,)),
+    ('fator', (T.IDENT,)),
+    ('fator', (T.OPAR, 'atrib', T.CPAR)),
+]
+
+FIRST = {
+    'function': {T.FLOAT, T.INT},
+    'arg_list': {None, T.FLOAT, T.INT},
+    'arg': {T.FLOAT, T.INT},
+    'resto_arg_list': {None, T.COMMA},
+    'type': {T.FLOAT, T.INT},
+    'bloco': {T.OBRKT},
+    'stmt_list': {None, T.BREAK, T.CONTINUE, T.FLOAT, T.FOR, T.IDENT, T.IF,
+                  T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OBRKT,
+                  T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN, T.SEMICOLON,
+                  T.WHILE},
+    'stmt': {T.BREAK, T.CONTINUE, T.FOR, T.IDENT, T.IF, T.MINUS, T.NOT,
+             T.NUMFLOAT, T.NUMINT, T.OBRKT, T.OPAR, T.PLUS, T.PRINT, T.RETURN,
+             T.SCAN, T.SEMICOLON, T.WHILE},
+    'declaration': {T.FLOAT, T.INT},
+    'ident_list': {T.IDENT},
+    'resto_ident_list': {None, T.COMMA},
+    'for_stmt': {T.FOR},
+    'opt_expr': {None, T.IDENT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OPAR,
+                 T.PLUS},
+    'io_stmt': {T.PRINT, T.SCAN},
+    'out_list': {T.IDENT, T.NUMFLOAT, T.NUMINT, T.STR},
+    'out': {T.IDENT, T.NUMFLOAT, T.NUMINT, T.STR},
+    'resto_out_list': {None, T.COMMA},
+    'while_stmt': {T.WHILE},
+    'if_stmt': {T.IF},
+    'else_part': {None, T.ELSE},
+    'expr': {T.IDENT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'atrib': {T.IDENT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'resto_atrib': {None, T.ASSIGN},
+    'or': {T.IDENT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'resto_or': {None, T.OR},
+    'and': {T.IDENT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'resto_and': {None, T.AND},
+    'not': {T.IDENT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'rel': {T.IDENT, T.MINUS, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'resto_rel': {None, T.EQ, T.GEQ, T.GT, T.LEQ, T.LT, T.NEQ},
+    'add': {T.IDENT, T.MINUS, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'resto_add': {None, T.MINUS, T.PLUS},
+    'mult': {T.IDENT, T.MINUS, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'resto_mult': {None, T.DIV, T.MOD, T.MULT},
+    'uno': {T.IDENT, T.MINUS, T.NUMFLOAT, T.NUMINT, T.OPAR, T.PLUS},
+    'fator': {T.IDENT, T.NUMFLOAT, T.NUMINT, T.OPAR},
+}
+
+FOLLOW = {
+    'function': {T.EOF},
+    'arg_list': {T.CPAR},
+    'arg': {T.COMMA, T.CPAR},
+    'resto_arg_list': {T.CPAR},
+    'type': {T.IDENT},
+    'bloco': {T.BREAK, T.CBRKT, T.CONTINUE, T.ELSE, T.EOF, T.FLOAT, T.FOR,
+              T.IDENT, T.IF, T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT,
+              T.OBRKT, T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN, T.SEMICOLON,
+              T.WHILE},
+    'stmt_list': {T.CBRKT},
+    'stmt': {T.BREAK, T.CBRKT, T.CONTINUE, T.ELSE, T.FLOAT, T.FOR, T.IDENT,
+             T.IF, T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OBRKT,
+             T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN, T.SEMICOLON, T.WHILE},
+    'declaration': {T.BREAK, T.CBRKT, T.CONTINUE, T.FLOAT, T.FOR, T.IDENT,
+                    T.IF, T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT,
+                    T.OBRKT, T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN,
+                    T.SEMICOLON, T.WHILE},
+    'ident_list': {T.SEMICOLON},
+    'resto_ident_list': {T.SEMICOLON},
+    'for_stmt': {T.BREAK, T.CBRKT, T.CONTINUE, T.ELSE, T.FLOAT, T.FOR,
+                 T.IDENT, T.IF, T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT,
+                 T.OBRKT, T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN,
+                 T.SEMICOLON, T.WHILE},
+    'opt_expr': {T.CPAR, T.SEMICOLON},
+    'io_stmt': {T.BREAK, T.CBRKT, T.CONTINUE, T.ELSE, T.FLOAT, T.FOR, T.IDENT,
+                T.IF, T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OBRKT,
+                T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN, T.SEMICOLON,
+                T.WHILE},
+    'out_list': {T.CPAR},
+    'out': {T.COMMA, T.CPAR},
+    'resto_out_list': {T.CPAR},
+    'while_stmt': {T.BREAK, T.CBRKT, T.CONTINUE, T.ELSE, T.FLOAT, T.FOR,
+                   T.IDENT, T.IF, T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT,
+                   T.OBRKT, T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN,
+                   T.SEMICOLON, T.WHILE},
+    'if_stmt': {T.BREAK, T.CBRKT, T.CONTINUE, T.ELSE, T.FLOAT, T.FOR, T.IDENT,
+                T.IF, T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT, T.OBRKT,
+                T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN, T.SEMICOLON,
+                T.WHILE},
+    'else_part': {T.BREAK, T.CBRKT, T.CONTINUE, T.ELSE, T.FLOAT, T.FOR,
+                  T.IDENT, T.IF, T.INT, T.MINUS, T.NOT, T.NUMFLOAT, T.NUMINT,
+                  T.OBRKT, T.OPAR, T.PLUS, T.PRINT, T.RETURN, T.SCAN,
+                  T.SEMICOLON, T.WHILE},
+    'expr': {T.CPAR, T.SEMICOLON},
+    'atrib': {T.CPAR, T.SEMICOLON},
+    'resto_atrib': {T.CPAR, T.SEMICOLON},
+    'or': {T.ASSIGN, T.CPAR, T.SEMICOLON},
+    'resto_or': {T.ASSIGN, T.CPAR, T.SEMICOLON},
+    'and': {T.ASSIGN, T.CPAR, T.OR, T.SEMICOLON},
+    'resto_and': {T.ASSIGN, T.CPAR, T.OR, T.SEMICOLON},
+    'not': {T.AND, T.ASSIGN, T.CPAR, T.OR, T.SEMICOLON},
+    'rel': {T.AND, T.ASSIGN, T.CPAR, T.OR, T.SEMICOLON},
+    'resto_rel': {T.AND, T.ASSIGN, T.CPAR, T.OR, T.SEMICOLON},
+    'add': {T.AND, T.ASSIGN, T.CPAR, T.EQ, T.GEQ, T.GT, T.LEQ, T.LT, T.NEQ,
+            T.OR, T.SEMICOLON},
+    'resto_add': {T.AND, T.ASSIGN, T.CPAR, T.EQ, T.GEQ, T.GT, T.LEQ, T.LT,
+                  T.NEQ, T.OR, T.SEMICOLON},
+    'mult': {T.AND, T.ASSIGN, T.CPAR, T.EQ, T.GEQ, T.GT, T.LEQ, T.LT, T.MINUS,
+             T.NEQ, T.OR, T.PLUS, T.SEMICOLON},
+    'resto_mult': {T.AND, T.ASSIGN, T.CPAR, T.EQ, T.GEQ, T.GT, T.LEQ, T.LT,
+                   T.MINUS, T.NEQ, T.OR, T.PLUS, T.SEMICOLON},
+    'uno': {T.AND, T.ASSIGN, T.CPAR, T.DIV, T.EQ, T.GEQ, T.GT, T.LEQ, T.LT,
+            T.MINUS, T.MOD, T.MULT, T.NEQ, T.OR, T.PLUS, T.SEMICOLON},
+    'fator': {T.AND, T.ASSIGN, T.CPAR, T.DIV, T.EQ, T.GEQ, T.GT, T.LEQ, T.LT,
+              T.MINUS, T.MOD, T.MULT, T.NEQ, T.OR, T.PLUS, T.SEMICOLON},
+}
+
+TABLE = {
+    'function': {T.FLOAT: 0, T.INT: 0},
+    'arg_list': {T.FLOAT: 1, T.INT: 1, T.CPAR: 2},
+    'arg': {T.FLOAT: 3, T.INT: 3},
+    'resto_arg_list': {T.COMMA: 4, T.CPAR: 5},
+    'type': {T.INT: 6, T.FLOAT: 7},
+    'bloco': {T.OBRKT: 8},
+    'stmt_list': {T.BREAK: 9, T.CONTINUE: 9, T.FOR: 9, T.IDENT: 9, T.IF: 9,
+                  T.MINUS: 9, T.NOT: 9, T.NUMFLOAT: 9, T.NUMINT: 9,
+                  T.OBRKT: 9, T.OPAR: 9, T.PLUS: 9, T.PRINT: 9, T.RETURN: 9,
+                  T.SCAN: 9, T.SEMICOLON: 9, T.WHILE: 9, T.FLOAT: 10,
+                  T.INT: 10, T.CBRKT: 11},
+    'stmt': {T.FOR: 12, T.PRINT: 13, T.SCAN: 13, T.WHILE: 14, T.IDENT: 15,
+             T.MINUS: 15, T.NOT: 15, T.NUMFLOAT: 15, T.NUMINT: 15, T.OPAR: 15,
+             T.PLUS: 15, T.IF: 16, T.OBRKT: 17, T.BREAK: 18, T.CONTINUE: 19,
+             T.RETURN: 20, T.SEMICOLON: 21},
+    'declaration': {T.FLOAT: 22, T.INT: 22},
+    'ident_list': {T.IDENT: 23},
+    'resto_ident_list': {T.COMMA: 24, T.SEMICOLON: 25},
+    'for_stmt': {T.FOR: 26},
+    'opt_expr': {T.IDENT: 27, T.MINUS: 27, T.NOT: 27, T.NUMFLOAT: 27,
+                 T.NUMINT: 27, T.OPAR: 27, T.PLUS: 27, T.CPAR: 28,
+                 T.SEMICOLON: 28},
+    'io_stmt': {T.SCAN: 29, T.PRINT: 30},
+    'out_list': {T.IDENT: 31, T.NUMFLOAT: 31, T.NUMINT: 31, T.STR: 31},
+    'out': {T.STR: 32, T.IDENT: 33, T.NUMINT: 34, T.NUMFLOAT: 35},
+    'resto_out_list': {T.COMMA: 36, T.CPAR: 37},
+    'while_stmt': {T.WHILE: 38},
+    'if_stmt': {T.IF: 39},
+    'else_part': {T.ELSE: 40, T.BREAK: 41, T.CBRKT: 41, T.CONTINUE: 41,
+                  T.FLOAT: 41, T.FOR: 41, T.IDENT: 41, T.IF: 41, T.INT: 41,
+                  T.MINUS: 41, T.NOT: 41, T.NUMFLOAT: 41, T.NUMINT: 41,
+                  T.OBRKT: 41, T.OPAR: 41, T.PLUS: 41, T.PRINT: 41,
+                  T.RETURN: 41, T.SCAN: 41, T.SEMICOLON: 41, T.WHILE: 41},
+    'expr': {T.IDENT: 42, T.MINUS: 42, T.NOT: 42, T.NUMFLOAT: 42,
+             T.NUMINT: 42, T.OPAR: 42, T.PLUS: 42},
+    'atrib': {T.IDENT: 43, T.MINUS: 43, T.NOT: 43, T.NUMFLOAT: 43,
+              T.NUMINT: 43, T.OPAR: 43, T.PLUS: 43},
+    'resto_atrib': {T.ASSIGN: 44, T.CPAR: 45, T.SEMICOLON: 45},
+    'or': {T.IDENT: 46, T.MINUS: 46, T.NOT: 46, T.NUMFLOAT: 46, T.NUMINT: 46,
+           T.OPAR: 46, T.PLUS: 46},
+    'resto_or': {T.OR: 47, T.ASSIGN: 48, T.CPAR: 48, T.SEMICOLON: 48},
+    'and': {T.IDENT: 49, T.MINUS: 49, T.NOT: 49, T.NUMFLOAT: 49, T.NUMINT: 49,
+            T.OPAR: 49, T.PLUS: 49},
+    'resto_and': {T.AND: 50, T.ASSIGN: 51, T.CPAR: 51, T.OR: 51,
+                  T.SEMICOLON: 51},
+    'not': {T.NOT: 52, T.IDENT: 53, T.MINUS: 53, T.NUMFLOAT: 53, T.NUMINT: 53,
+            T.OPAR: 53, T.PLUS: 53},
+    'rel': {T.IDENT: 54, T.MINUS: 54, T.NUMFLOAT: 54, T.NUMINT: 54,
+            T.OPAR: 54, T.PLUS: 54},
+    'resto_rel': {T.EQ: 55, T.NEQ: 56, T.LT: 57, T.LEQ: 58, T.GT: 59,
+                  T.GEQ: 60, T.AND: 61, T.ASSIGN: 61, T.CPAR: 61, T.OR: 61,
+                  T.SEMICOLON: 61},
+    'add': {T.IDENT: 62, T.MINUS: 62, T.NUMFLOAT: 62, T.NUMINT: 62,
+            T.OPAR: 62, T.PLUS: 62},
+    'resto_add': {T.PLUS: 63, T.MINUS: 64, T.AND: 65, T.ASSIGN: 65,
+                  T.CPAR: 65, T.EQ: 65, T.GEQ: 65, T.GT: 65, T.LEQ: 65,
+                  T.LT: 65, T.NEQ: 65, T.OR: 65, T.SEMICOLON: 65},
+    'mult': {T.IDENT: 66, T.MINUS: 66, T.NUMFLOAT: 66, T.NUMINT: 66,
+             T.OPAR: 66, T.PLUS: 66},
+    'resto_mult': {T.MULT: 67, T.DIV: 68, T.MOD: 69, T.AND: 70, T.ASSIGN: 70,
+                   T.CPAR: 70, T.EQ: 70, T.GEQ: 70, T.GT: 70, T.LEQ: 70,
+                   T.LT: 70, T.MINUS: 70, T.NEQ: 70, T.OR: 70, T.PLUS: 70,
+                   T.SEMICOLON: 70},
+    'uno': {T.PLUS: 71, T.MINUS: 72, T.IDENT: 73, T.NUMFLOAT: 73,
+            T.NUMINT: 73, T.OPAR: 73},
+    'fator': {T.NUMINT: 74, T.NUMFLOAT: 75, T.IDENT: 76, T.OPAR: 77},
+}
+
+CONFLICTS = [
+    'else_part: ELSE selects "ELSE stmt" and "&", using the first',
+]
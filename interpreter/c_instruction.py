@@ -1,5 +1,5 @@
 from enum import Enum, unique
-from typing import Union
+from typing import Optional, Union
 
 Operand = Union[int, float, str]
 
@@ -22,11 +22,40 @@ class OpCode(Enum):
     AND = '&&'
     OR = '||'
     NOT = '!'
+    NEG = 'neg'
+    MOVE = 'move'
     LABEL = 'label'
     IF = 'if'
     JUMP = 'jump'
     CALL = 'call'
 
+    # members are unique, and Enum hashes their names in Python
+    __hash__ = object.__hash__
+
+
+# OpCode by value, faster than calling OpCode
+OPCODES = {opcode.value: opcode for opcode in OpCode}
+
+# Opcodes of the instructions that compute (op1, op2, result)
+BINARY = frozenset(OPCODES[operator] for operator in (
+    '+', '-', '*', '/', '//', '%', '==', '!=', '>', '>=', '<', '<=', '&&',
+    '||'))
+
+# Opcodes of the instructions that compute (op, result)
+UNARY = frozenset((OpCode.NOT, OpCode.NEG, OpCode.MOVE))
+
+
+TEMP_PREFIX = '__temp__'
+
+
+def is_variable(operand) -> bool:
+    """Tells a variable, argument or temporary from a constant operand."""
+    return isinstance(operand, str) and not operand.startswith('"')
+
+
+def is_temp(operand) -> bool:
+    return isinstance(operand, str) and operand.startswith(TEMP_PREFIX)
+
 
 class Instruction:
     """Virtual machine instruction."""
@@ -44,11 +73,16 @@ class Instruction:
     @staticmethod
     def operation(operator: str, op1: Operand, op2: Operand,
                   result: str) -> 'Instruction':
-        return Instruction.factory(OpCode(operator), op1, op2, result)
+        return Instruction.factory(OPCODES[operator], op1, op2, result)
 
     @staticmethod
     def unary(operator: str, operand, result: str) -> 'Instruction':
-        return Instruction.factory(OpCode(operator), operand, result)
+        opcode = OpCode.NEG if operator == '-' else OPCODES[operator]
+        return Instruction.factory(opcode, operand, result)
+
+    @staticmethod
+    def move(operand: Operand, result: str) -> 'Instruction':
+        return Instruction.factory(OpCode.MOVE, operand, result)
 
     @staticmethod
     def label(name: str) -> 'Instruction':
@@ -66,9 +100,44 @@ class Instruction:
     def call(name: str, *args) -> 'Instruction':
         return Instruction.factory(OpCode.CALL, name, *args)
 
-    def change_arg(self, index: int, value):
-        self.args = tuple(a if i != index else value
-                          for i, a in enumerate(self.args))
+    def _read_range(self):
+        opcode = self.opcode
+        if opcode in BINARY:
+            return 0, 2
+        if opcode in UNARY or opcode is OpCode.IF:
+            return 0, 1
+        if opcode is OpCode.CALL and self.args[0] == 'print':
+            return 1, 2
+        return 0, 0
+
+    @property
+    def reads(self) -> tuple:
+        """Operands read by the instruction, constants included."""
+        start, stop = self._read_range()
+        return self.args[start:stop]
+
+    def replace_reads(self, values: dict) -> 'Instruction':
+        """Copy of the instruction reading values[v] instead of each
+        operand v that is a key of values."""
+        start, stop = self._read_range()
+        args = self.args
+        return Instruction.factory(
+            self.opcode, *args[:start],
+            *(values.get(a, a) for a in args[start:stop]), *args[stop:])
+
+    def replace_write(self, result: str) -> 'Instruction':
+        """Copy of the instruction writing result instead."""
+        return Instruction.factory(self.opcode, *self.args[:-1], result)
+
+    @property
+    def writes(self) -> Optional[str]:
+        """Variable written by the instruction, if any."""
+        opcode = self.opcode
+        if opcode in BINARY or opcode in UNARY:
+            return self.args[-1]
+        if opcode is OpCode.CALL and self.args[0] != 'print':
+            return self.args[2]
+        return None
 
     def __str__(self):
         return f'({self.opcode.value}, {", ".join(str(a) for a in self.args)})'
@@ -1,20 +1,65 @@
+from argparse import ArgumentParser, REMAINDER
 from sys import argv
 
+from c_code_cache import CodeCache, DEFAULT_DIRECTORY, DEFAULT_MAX_SIZE
 from c_lexer import Lexer, LexerError
 from c_parser import Parser, ParserError
+from c_pass_manager import DEFAULT_LEVEL, MAX_LEVEL
 
 
 class Intepreter:
-    def __init__(self, fname: str):
+    def __init__(self, fname: str, cache: CodeCache = None,
+                 opt_level: int = DEFAULT_LEVEL):
         self.fname = fname
+        self.cache = cache
+        self.opt_level = opt_level
         self.lexer = Lexer(fname)
-        self.parser = Parser(self.lexer)
+        self.parser = Parser(self.lexer, opt_level=opt_level)
 
-    def run(self):
+    def run(self, args=None):
         try:
-            self.parser.parse()
+            code = key = None
+            if self.cache is not None:
+                key = CodeCache.key(self.lexer.text, self.opt_level)
+                code = self.cache.get(key)
+            if code is None:
+                code = self.parser.compile()
+                if key is not None and code is not None:
+                    self.cache.put(key, code)
+            else:
+                # a cached program is not parsed, so only the parse tree,
+                # written while parsing, is not written again
+                self.parser.save_code(code)
+            self.parser.execute(code, args)
         except (LexerError, ParserError) as exception:
             print(exception)
+        finally:
+            self.lexer.close()
+
+
+def add_opt_level(arg_parser: ArgumentParser):
+    arg_parser.add_argument('-O', dest='opt_level', type=int,
+                            choices=range(MAX_LEVEL + 1),
+                            default=DEFAULT_LEVEL, metavar='LEVEL',
+                            help='optimization level, from 0 to '
+                                 f'{MAX_LEVEL} (default {DEFAULT_LEVEL})')
+
+
+def argument_parser() -> ArgumentParser:
+    arg_parser = ArgumentParser(description='miniC interpreter')
+    add_opt_level(arg_parser)
+    arg_parser.add_argument('--cache', action='store_true',
+                            help='reuse compiled programs')
+    arg_parser.add_argument('--cache-dir', default=DEFAULT_DIRECTORY,
+                            metavar='DIR',
+                            help='directory of the compiled programs '
+                                 f'(default {DEFAULT_DIRECTORY})')
+    arg_parser.add_argument('--cache-size', type=int,
+                            default=DEFAULT_MAX_SIZE, metavar='BYTES',
+                            help='evict old programs above this size')
+    arg_parser.add_argument('file')
+    arg_parser.add_argument('args', nargs=REMAINDER)
+    return arg_parser
 
 
 def main():
@@ -22,8 +67,12 @@ def main():
         print('Falta nome do Arquivo')
         return
 
-    intepreter = Intepreter(argv[1])
-    intepreter.run()
+    options = argument_parser().parse_args()
+    cache = None
+    if options.cache:
+        cache = CodeCache(options.cache_dir, options.cache_size)
+    intepreter = Intepreter(options.file, cache, options.opt_level)
+    intepreter.run(options.args)
 
 
 if __name__ == "__main__":
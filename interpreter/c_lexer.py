@@ -1,6 +1,10 @@
+import io
+import mmap
+import sys
+from collections import deque
 from enum import auto, Enum
 
-from c_token import Token, TokenType
+from c_token import Token, TokenBuffer, TokenType, TOKEN_TYPES
 
 
 class LexerError(Exception):
@@ -8,17 +12,61 @@ class LexerError(Exception):
 
 
 class File:
-    def __init__(self, file_name):
-        self.file_name = file_name
-        self.line = ''
-        self.file = open(file_name, 'r')
-
-    def readline(self):
-        self.line = self.file.readline()
-        return self.line
-
-    def close(self):  # TODO: close automatically
-        self.file.close()
+    """Source text of the lexer: a file name, '-' for stdin or an open
+    text stream.
+
+    With mapped=True a named file is memory-mapped and text is the read-only
+    mmap, as long as the file is plain ASCII with '\n' line breaks. Any
+    other file is decoded from UTF-8 into a str, whatever the locale.
+    close, or leaving a with block, releases the mapping.
+
+    The scanner moves a cursor over the whole text and the code cache
+    hashes it, so stdin, streams and unmapped files are read whole: only
+    mapped=True avoids the copy.
+    """
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, source, *, mapped=False):
+        self.mapped = False
+        if source == '-':
+            source = sys.stdin
+        if hasattr(source, 'read'):
+            self.file_name = getattr(source, 'name', '<stream>')
+            self.text = source.read()
+            return
+
+        self.file_name = source
+        if mapped:
+            self.text = File._map(source)
+            self.mapped = self.text is not None
+        if not self.mapped:
+            with open(source, 'r', encoding='utf-8') as file:
+                self.text = file.read()
+
+    @staticmethod
+    def _map(file_name):
+        with open(file_name, 'rb') as file:
+            try:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return None
+        size = len(mapping)
+        if mapping.find(b'\r') == -1 and all(
+                mapping[i:i + File.CHUNK_SIZE].isascii()
+                for i in range(0, size, File.CHUNK_SIZE)):
+            return mapping
+        mapping.close()
+        return None
+
+    def close(self):
+        if self.mapped:
+            self.text.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
 
 
 class State(Enum):
@@ -185,9 +233,62 @@ TRANSITIONS = {
 }
 
 
+# Integer tables compiled from Symbol, State and TRANSITIONS above, so the
+# scanning loop only deals with ints. States and symbols are numbered by
+# their position in the enums.
+STATE_INDEX = {state: i for i, state in enumerate(State)}
+SYMBOL_INDEX = {symbol: i for i, symbol in enumerate(Symbol)}
+N_SYMBOLS = len(Symbol)
+
+# Symbol class of every latin-1 character
+CHAR_CLASS = [SYMBOL_INDEX[symb_type(chr(c))] for c in range(256)]
+
+# TRANSITION_TABLE[state * N_SYMBOLS + symbol] -> next state
+TRANSITION_TABLE = [STATE_INDEX[State.ERR]] * (len(State) * N_SYMBOLS)
+for _state, _row in TRANSITIONS.items():
+    for _symbol, _next_state in _row.items():
+        TRANSITION_TABLE[STATE_INDEX[_state] * N_SYMBOLS +
+                         SYMBOL_INDEX[_symbol]] = STATE_INDEX[_next_state]
+
+# Token type of a token finished from a given state, None for the states
+# holding operators and names, which are looked up by lexeme.
+FINAL_TYPE = [None] * len(State)
+FINAL_TYPE[STATE_INDEX[State.NUM]] = TokenType.NUMINT
+FINAL_TYPE[STATE_INDEX[State.PTONUM]] = TokenType.NUMFLOAT
+FINAL_TYPE[STATE_INDEX[State.STR]] = TokenType.STR
+FINAL_TYPE[STATE_INDEX[State.ENDSTR]] = TokenType.STR
+
+_INIT = STATE_INDEX[State.INIT]
+_FIN = STATE_INDEX[State.FIN]
+_ERR = STATE_INDEX[State.ERR]
+_CMTB = STATE_INDEX[State.CMTB]
+_OPER2 = STATE_INDEX[State.OPER2]
+_SLSH = STATE_INDEX[State.SLSH]
+_SYMB_SPACE = SYMBOL_INDEX[Symbol.SPACE]
+_SYMB_BKL = SYMBOL_INDEX[Symbol.BKL]
+
+
 class Lexer:
-    def __init__(self, fname: str):
-        self._file = File(fname)
+    """Tokenizer of miniC sources.
+
+    Tokens are read with get_token or by iterating over the lexer, which
+    stops after the EOF token. peek looks ahead without consuming.
+    With mapped=True a source file is scanned straight from a memory
+    mapping and only the lexemes are decoded. close, or leaving a with
+    block, releases the mapping, after which no token can be read.
+    """
+    def __init__(self, source, *, mapped: bool = False):
+        self._file = File(source, mapped=mapped)
+        self._text = self._file.text
+        if self._file.mapped:
+            self._newline, self._comment_end = b'\n', b'*/'
+        else:
+            self._newline, self._comment_end = '\n', '*/'
+        self._pos = 0  # cursor inside self._text
+        self._end = 0  # end of the current line (after its '\n')
+        self._line_start = 0
+        self._lookahead = deque()
+        self._finished = False
         self.row = 1
         self.col = 1
         self.buffer = ''
@@ -196,73 +297,134 @@ class Lexer:
         raise LexerError(f'Parser error: line {self.row}, '
                          f'column {self.col}: {msg}')
 
-    def get_token(self):
-
-        if self._file.line == '':
-            line = self._file.readline()
-        else:
-            line = self._file.line
-
-        current_state = State.INIT
-        self.buffer = ''
-
-        while True:
-            symb = symb_type(line[0])
-            previous_state = current_state
-            current_state = TRANSITIONS[previous_state].get(symb, State.ERR)
-
-            if current_state not in {State.INIT, State.FIN, State.ERR}:
-                if current_state == State.CMTB:
-                    while line.find('*/') == -1:
-                        line = self._file.readline()
-                        self.row += 1
-                    line = self._file.readline()
-                    self.row += 1
-                    self.buffer = ''
-                    self.col = 1
-                    previous_state = current_state = State.INIT
-                elif (current_state != State.OPER2 or
-                      Token.get_token_type(self.buffer + line[0]) is not None):
-                    self.buffer = self.buffer + line[0]
-                    line = line[1:]
-                    self.col += 1
-                else:
-                    current_state = State.FIN
-
-            if current_state == State.INIT:
-                if symb == Symbol.SPACE:
-                    line = line[1:]
-                    self.col += 1
-                elif symb == Symbol.BKL or previous_state == State.SLSH:
-                    self.buffer = ''
-                    line = self._file.readline()
-                    self.row += 1
-                    self.col = 1
-
-            elif current_state == State.FIN:
-                token_id = None
-                if previous_state in {State.LET, State.OPER, State.OPER2,
-                                      State.SLSH}:
-                    token_id = Token.get_token_type(self.buffer)
-                    if token_id is None:
-                        token_id = TokenType.IDENT
-                elif previous_state is State.NUM:
-                    token_id = TokenType.NUMINT
-                elif previous_state is State.PTONUM:
-                    token_id = TokenType.NUMFLOAT
-                elif previous_state in {State.STR, State.ENDSTR}:
-                    token_id = TokenType.STR
-                self._file.line = line
+    def _next_line(self, start):
+        """Returns the bounds of the line beginning at start."""
+        return start, (self._text.find(self._newline, start) + 1 or
+                       len(self._text))
+
+    def _lexeme(self, start, end):
+        lexeme = self._text[start:end]
+        return lexeme.decode('ascii') if self._file.mapped else lexeme
+
+    @property
+    def text(self):
+        """Whole source, a str or the mmap of a mapped file."""
+        return self._text
+
+    @classmethod
+    def from_string(cls, text: str, **kwargs) -> 'Lexer':
+        return cls(io.StringIO(text), **kwargs)
+
+    def get_token(self) -> Token:
+        if self._lookahead:
+            return self._lookahead.popleft()
+        return self._scan_token()
+
+    def peek(self, k: int = 1) -> Token:
+        """Returns the k-th next token without consuming it."""
+        while len(self._lookahead) < k:
+            self._lookahead.append(self._scan_token())
+        return self._lookahead[k - 1]
+
+    def token_buffer(self) -> TokenBuffer:
+        """Reads the remaining tokens into a packed TokenBuffer."""
+        return TokenBuffer(self)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Token:
+        if self._finished:
+            raise StopIteration
+        token = self.get_token()
+        self._finished = token.type_ == TokenType.EOF
+        return token
+
+    def _scan_token(self):
+        """Runs the DFA transition table over the text from the cursor."""
+        text = self._text
+        pos, end = self._pos, self._end
+        line_start, row = self._line_start, self.row
+        if pos == end:
+            pos, end = self._next_line(end)
+            line_start = pos
+
+        char_class, table = CHAR_CLASS, TRANSITION_TABLE
+        code_of = int if self._file.mapped else ord  # mmap items are ints
+        state = _INIT
+        start = pos  # beginning of the token being built
+
+        while pos != end:
+            char = code_of(text[pos])
+            if char < 256:
+                symb = char_class[char]
+            else:
+                symb = SYMBOL_INDEX[symb_type(text[pos])]
+            previous_state = state
+            state = table[state * N_SYMBOLS + symb]
+
+            if state == _OPER2:
+                operator = self._lexeme(start, pos + 1)
+                if operator not in TOKEN_TYPES:
+                    state = _FIN
+
+            if state == _INIT:
+                if symb == _SYMB_SPACE:
+                    pos += 1
+                    start = pos
+                elif symb == _SYMB_BKL or previous_state == _SLSH:
+                    pos, end = self._next_line(end)
+                    line_start = start = pos
+                    row += 1
+
+            elif state == _FIN:
+                self.buffer = self._lexeme(start, pos)
+                token_id = FINAL_TYPE[previous_state]
+                if token_id is None:
+                    token_id = TOKEN_TYPES.get(self.buffer, TokenType.IDENT)
+                self._save(pos, end, line_start, row)
                 return Token(self.row, self.col - len(self.buffer),
                              self.buffer, token_id)
 
-            elif current_state == State.ERR:
-                self.buffer += line[0]
+            elif state == _ERR:
+                self._save(pos, end, line_start, row)
+                self.buffer = self._lexeme(start, pos + 1)
                 self._error(f'Invalid token {self.buffer}')
 
-            if line == '':
-                line = self._file.readline()
-                self.col = 1
-            if line == '':
-                return Token(self.row, self.col - len(self.buffer),
-                             'EOF', TokenType.EOF)
+            elif state == _CMTB:
+                while (text.find(self._comment_end, pos, end) == -1 and
+                       end != pos):
+                    pos, end = self._next_line(end)
+                    row += 1
+                pos, end = self._next_line(end)
+                line_start = start = pos
+                row += 1
+                state = _INIT
+
+            else:
+                pos += 1
+
+            if pos == end:
+                pos, end = self._next_line(end)
+                line_start = pos
+                if state == _INIT:
+                    start = pos
+
+        self._save(pos, end, line_start, row)
+        self.buffer = self._lexeme(start, pos)
+        return Token(self.row, self.col - len(self.buffer),
+                     'EOF', TokenType.EOF)
+
+    def _save(self, pos, end, line_start, row):
+        self._pos, self._end, self._line_start = pos, end, line_start
+        self.row = row
+        self.col = pos - line_start + 1
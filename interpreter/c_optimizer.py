@@ -0,0 +1,567 @@
+"""Passes over the three-address code of a program.
+
+Code is a list of Instructions where variables, arguments and temporaries
+are operands named as the CodeGenerator names them.
+"""
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from c_cfg import ControlFlowGraph, DominatorTree, liveness, \
+    natural_loops, solve
+from c_instruction import BINARY, Instruction, is_temp, is_variable, \
+    OpCode, OPCODES, TEMP_PREFIX, UNARY
+from c_virtual_machine import OPERATIONS, UNARY_OPERATIONS
+
+
+def label_indexes(code: List[Instruction]) -> Dict[str, int]:
+    return {i.args[0]: n for n, i in enumerate(code)
+            if i.opcode is OpCode.LABEL}
+
+
+def successors(code: List[Instruction]) -> List[tuple]:
+    """Indexes of the instructions that may run after each one."""
+    labels = label_indexes(code)
+    result = []
+    for n, instruction in enumerate(code):
+        if instruction.opcode is OpCode.JUMP:
+            result.append((labels[instruction.args[0]],))
+        elif instruction.opcode is OpCode.IF:
+            result.append((labels[instruction.args[1]],
+                           labels[instruction.args[2]]))
+        elif n + 1 < len(code):
+            result.append((n + 1,))
+        else:
+            result.append(())
+    return result
+
+
+def live_temps(code: List[Instruction]) -> List[Set[str]]:
+    """Temporaries live after each instruction: those read later by some
+    path before being written again."""
+    return liveness(ControlFlowGraph(code), is_temp)
+
+
+def reuse_temps(code: List[Instruction]) -> List[Instruction]:
+    """Renames the temporaries so that those whose live ranges do not
+    overlap share a name, the lowest not live where each is written."""
+    live_out = live_temps(code)
+    interference: Dict[str, Set[str]] = {}
+    for n, instruction in enumerate(code):
+        temp = instruction.writes
+        if is_temp(temp):
+            conflicts = interference.setdefault(temp, set())
+            for other in live_out[n]:
+                if other != temp:
+                    conflicts.add(other)
+                    interference.setdefault(other, set()).add(temp)
+
+    rename = {}
+    for temp, conflicts in interference.items():  # by first write
+        taken = {rename.get(other) for other in conflicts}
+        number = 1
+        while f'{TEMP_PREFIX}{number}' in taken:
+            number += 1
+        rename[temp] = f'{TEMP_PREFIX}{number}'
+    return [Instruction.factory(i.opcode, *(rename.get(a, a) for a in i.args))
+            for i in code]
+
+
+def _label_references(code: List[Instruction]) -> Dict[str, int]:
+    """Number of jumps and ifs to each label."""
+    references = {}
+    for instruction in code:
+        if instruction.opcode is OpCode.JUMP:
+            targets = instruction.args
+        elif instruction.opcode is OpCode.IF:
+            targets = instruction.args[1:]
+        else:
+            continue
+        for label in targets:
+            references[label] = references.get(label, 0) + 1
+    return references
+
+
+def _only_reached_from(previous: Instruction, label: str,
+                       references: Dict[str, int]) -> bool:
+    """Tells if the label is reached only from the instruction before it,
+    falling through or jumping."""
+    count = references.get(label, 0)
+    if previous is None or previous.opcode is OpCode.LABEL:
+        return False
+    if previous.opcode is OpCode.JUMP or previous.opcode is OpCode.IF:
+        return count == 1 and label in previous.args
+    return count == 0
+
+
+def _evaluate(opcode: OpCode, values: tuple):
+    """Value of the operation on values, or None if it raises."""
+    try:
+        if opcode is OpCode.MOVE:
+            return values[0]
+        if opcode in UNARY_OPERATIONS:
+            return UNARY_OPERATIONS[opcode](*values)
+        return OPERATIONS[opcode](*values)
+    except (ArithmeticError, TypeError, ValueError):
+        return None
+
+
+def fold_constants(code: List[Instruction]) -> List[Instruction]:
+    """Computes the operations on constants at compile time.
+
+    The values known for variables are propagated through straight-line
+    code, and past a label only reached from the instruction before it. An
+    operation on known values becomes the move of its value to its result,
+    unless it raises, as a division by zero does, which is left to happen
+    at run time. An if on a known condition becomes a jump. Stores to
+    temporaries that are no longer read are dropped.
+    """
+    references = _label_references(code)
+    known = {}
+    folded = []
+    stores = set()  # indexes in folded of the stores of computed values
+    previous = None
+    for instruction in code:
+        opcode = instruction.opcode
+        if opcode is OpCode.LABEL:
+            if not _only_reached_from(previous, instruction.args[0],
+                                      references):
+                known.clear()
+            folded.append(instruction)
+            previous = instruction
+            continue
+        previous = instruction
+        if known:
+            instruction = instruction.replace_reads(known)
+        written = instruction.writes
+        known.pop(written, None)
+        values = instruction.reads
+        if written is not None and opcode is not OpCode.CALL and not any(
+                is_variable(v) for v in values):
+            value = _evaluate(opcode, values)
+            if value is not None:
+                known[written] = value
+                stores.add(len(folded))
+                instruction = Instruction.move(value, written)
+        elif opcode is OpCode.IF and not is_variable(values[0]):
+            instruction = Instruction.jump(
+                instruction.args[1] if values[0] else instruction.args[2])
+        folded.append(instruction)
+
+    read = {v for i in folded for v in i.reads if is_temp(v)}
+    return [i for n, i in enumerate(folded)
+            if n not in stores or not is_temp(i.writes) or i.writes in read]
+
+
+def propagate_copies(code: List[Instruction]) -> List[Instruction]:
+    """Removes the moves of temporaries and reads the sources of moves.
+
+    An instruction followed by the move of its result, a temporary read
+    nowhere else, writes the target of the move instead, so that x = y = z
+    + 1 takes two instructions. Then a variable copied by a move is read
+    instead of the copy while neither is written again, in straight-line
+    code and past a label only reached from the instruction before it.
+    """
+    reads = {}
+    for instruction in code:
+        for operand in instruction.reads:
+            reads[operand] = reads.get(operand, 0) + 1
+    coalesced = []
+    for instruction in code:
+        source = instruction.args[0]
+        if (instruction.opcode is OpCode.MOVE and is_temp(source) and
+                reads[source] == 1 and coalesced and
+                coalesced[-1].writes == source):
+            coalesced[-1] = coalesced[-1].replace_write(instruction.args[1])
+        else:
+            coalesced.append(instruction)
+
+    references = _label_references(coalesced)
+    copies = {}
+    propagated = []
+    previous = None
+    for instruction in coalesced:
+        if instruction.opcode is OpCode.LABEL:
+            if not _only_reached_from(previous, instruction.args[0],
+                                      references):
+                copies.clear()
+        elif copies:
+            instruction = instruction.replace_reads(copies)
+        previous = instruction
+        written = instruction.writes
+        if written is not None:
+            copies = {copy: source for copy, source in copies.items()
+                      if written != copy and written != source}
+            source = instruction.args[0]
+            if (instruction.opcode is OpCode.MOVE and is_variable(source)
+                    and source != written):
+                copies[written] = source
+        propagated.append(instruction)
+    return propagated
+
+
+# Types of values: INT and FLOAT are NUMBER, and any value is ANY
+INT, FLOAT, NUMBER, ANY = 'int', 'float', 'number', 'any'
+
+_INT_RESULTS = frozenset(OPCODES[operator] for operator in (
+    '//', '%', '==', '!=', '>', '>=', '<', '<=', '&&', '||', '!'))
+_COMPARISONS = frozenset(OPCODES[operator] for operator in (
+    '>', '>=', '<', '<='))
+
+
+def _join(type1: Optional[str], type2: Optional[str]) -> Optional[str]:
+    """Type of a value of type1 or type2, None standing for no value."""
+    if type1 is None or type1 == type2:
+        return type2
+    if type2 is None:
+        return type1
+    return ANY if ANY in (type1, type2) else NUMBER
+
+
+def _result_type(instruction: Instruction, types: List[str]) -> str:
+    """Type of the result of the instruction on operands of types."""
+    opcode = instruction.opcode
+    if opcode in _INT_RESULTS:  # computed by int() or raise
+        return INT
+    if opcode is OpCode.CALL:
+        return INT if instruction.args[0] == 'scan_int' else FLOAT
+    if not types or ANY in types:
+        return ANY
+    if opcode is OpCode.DIV:
+        return FLOAT
+    if opcode is OpCode.MOVE or opcode is OpCode.NEG:
+        return types[0]
+    if types[0] == types[1]:
+        return types[0]
+    return FLOAT if sorted(types) == [FLOAT, INT] else NUMBER
+
+
+def _operand_types(code: List[Instruction],
+                   cfg: ControlFlowGraph = None) -> List[List[str]]:
+    """Types of the operands read by each instruction, inferred forward
+    from the types variables may have at the start of each block. The start
+    value of a variable is None and an argument may be a string, so both
+    are ANY."""
+    if cfg is None:
+        cfg = ControlFlowGraph(code)
+    result: List[List[str]] = [[]] * len(code)
+
+    def run(i: int, types_in: FrozenSet[Tuple[str, Optional[str]]],
+            record: bool = False) -> Dict[str, Optional[str]]:
+        """Types of the variables at the end of block i, None standing for
+        no value yet, from the (variable, type) pairs at its start."""
+        state: Dict[str, Optional[str]] = {}
+        for variable, type_ in types_in:
+            state[variable] = _join(state.get(variable), type_)
+        for n in range(cfg.blocks[i].start, cfg.blocks[i].stop):
+            instruction = code[n]
+            types = [state.get(a) if is_variable(a) else
+                     INT if isinstance(a, int) else
+                     FLOAT if isinstance(a, float) else ANY
+                     for a in instruction.reads]
+            if record:
+                result[n] = [ANY if t is None else t for t in types]
+            if instruction.writes is not None:
+                state[instruction.writes] = (
+                    None if None in types and instruction.opcode not in
+                    _INT_RESULTS else _result_type(instruction, types))
+        return state
+
+    # only the variables some block reads before writing carry a type
+    # from one block to the next
+    exposed = set()
+    for block in cfg.blocks:
+        written = set()
+        for instruction in code[block.start:block.stop]:
+            exposed.update(a for a in instruction.reads
+                           if is_variable(a) and a not in written)
+            written.add(instruction.writes)
+
+    def types_out(i: int, types_in: frozenset) -> frozenset:
+        return frozenset((v, t) for v, t in run(i, types_in).items()
+                         if v in exposed)
+
+    types_in = solve(cfg, types_out, forward=True,
+                      entry=frozenset((v, ANY) for v in exposed))
+    for i in range(len(cfg)):
+        run(i, types_in[i], record=True)
+    return result
+
+
+# Opcodes of the instructions that raise on no operands
+_SAFE = frozenset((OpCode.MOVE, OpCode.NOT, OpCode.EQ, OpCode.NEQ))
+
+
+def _may_raise(instruction: Instruction, types: List[str]) -> bool:
+    """Tells if the instruction may raise on operands of types, where a
+    sum, difference or product of an int and a float may overflow."""
+    opcode = instruction.opcode
+    if opcode in _SAFE:
+        return False
+    if opcode in _COMPARISONS or opcode is OpCode.NEG:
+        return not all(t in (INT, FLOAT, NUMBER) for t in types)
+    if opcode in (OpCode.PLUS, OpCode.MINUS, OpCode.MULT):
+        return types not in ([INT, INT], [FLOAT, FLOAT])
+    return True
+
+
+def eliminate_dead_stores(code: List[Instruction]) -> List[Instruction]:
+    """Removes the instructions whose result is not read before being
+    written again, or only read by removed instructions, unless they are
+    calls or may raise."""
+    cfg = ControlFlowGraph(code)
+    removable = [i.writes is not None and i.opcode is not OpCode.CALL
+                 for i in code]
+    live_out = liveness(cfg, removable=removable)
+    dead = [n for n, i in enumerate(code)
+            if removable[n] and i.writes not in live_out[n]]
+    if any(code[n].opcode not in _SAFE for n in dead):
+        types = _operand_types(code, cfg)
+        removable = [r and not _may_raise(i, types[n])
+                     for n, (r, i) in enumerate(zip(removable, code))]
+        live_out = liveness(cfg, removable=removable)
+        dead = [n for n, i in enumerate(code)
+                if removable[n] and i.writes not in live_out[n]]
+    if not dead:
+        return code
+    dead_set = set(dead)
+    return [i for n, i in enumerate(code) if n not in dead_set]
+
+
+def _live_in(code: List[Instruction], live_out: List[Set[str]],
+             n: int) -> Set[str]:
+    instruction = code[n]
+    return (live_out[n] - {instruction.writes}) | {
+        a for a in instruction.reads if is_variable(a)}
+
+
+def _loop_invariants(code: List[Instruction], cfg: ControlFlowGraph,
+                     header: int, inside: Set[int],
+                     dominating: DominatorTree, analyses: Dict[str, list],
+                     excluded: Set[int]) -> List[int]:
+    """Indexes of the instructions of the loop, code[n] for n in inside
+    but not in excluded, that compute the same value on every iteration
+    and may run once before it instead. analyses keeps the liveness and
+    types over cfg, computed for the first loop needing them."""
+    blocks = cfg.blocks
+    body = {cfg.block_of[n] for n in inside}
+    written = {}
+    for n in inside:
+        written[code[n].writes] = written.get(code[n].writes, 0) + 1
+    exits = [b for b in body if any(s not in body
+                                    for s in blocks[b].successors)]
+    if 'live' not in analyses:
+        analyses['live'] = liveness(cfg)
+    live_out = analyses['live']
+    live_at_header = _live_in(code, live_out, blocks[header].start)
+    live_at_exits = set()
+    for b in exits:
+        for successor in blocks[b].successors:
+            if successor not in body:
+                live_at_exits |= _live_in(code, live_out,
+                                          blocks[successor].start)
+
+    candidates = []
+    for n in sorted(inside - excluded):
+        instruction = code[n]
+        result = instruction.writes
+        if (result is not None and (instruction.opcode in BINARY or
+                                    instruction.opcode in UNARY) and
+                written[result] == 1 and result not in live_at_header and
+                (result not in live_at_exits or all(
+                    dominating.dominates(cfg.block_of[n], b)
+                    for b in exits))):
+            candidates.append(n)
+    if not candidates:
+        return []
+
+    writer = {code[n].writes: n for n in inside}
+
+    def computed_before(operand, n: int) -> bool:
+        """Tells if the operand of code[n] is not written in the loop, or
+        only by an invariant that runs before n on every way to it."""
+        if not is_variable(operand) or operand not in writer:
+            return True
+        d = writer[operand]
+        if written[operand] > 1 or d not in invariant:
+            return False
+        if cfg.block_of[d] == cfg.block_of[n]:
+            return d < n
+        return dominating.dominates(cfg.block_of[d], cfg.block_of[n])
+
+    invariant: Set[int] = set()
+    changed = True
+    while changed:  # an operand may be computed by an earlier invariant
+        changed = False
+        for n in candidates:
+            if n in invariant or not all(computed_before(a, n)
+                                         for a in code[n].reads):
+                continue
+            if code[n].opcode not in _SAFE:
+                if 'types' not in analyses:
+                    analyses['types'] = _operand_types(code, cfg)
+                if _may_raise(code[n], analyses['types'][n]):
+                    continue
+            invariant.add(n)
+            changed = True
+    return sorted(invariant)
+
+
+def _fresh_label(labels: Set[str], base: str) -> str:
+    """A label of base not in labels, then added to them."""
+    label, number = base, 0
+    while label in labels:
+        number += 1
+        label = f'{base}_{number}'
+    labels.add(label)
+    return label
+
+
+def hoist_loop_invariants(code: List[Instruction]) -> List[Instruction]:
+    """Moves the computations of loops whose value does not change from
+    one iteration to the next to a preheader, run once before the loop.
+
+    Loops are found from the jumps back to a block that dominates them,
+    inner loops first. An instruction is moved when it cannot raise, its
+    operands are only written outside the loop or by instructions moved
+    before it, and it is the only write of its result in the loop, a
+    result not read before it in the loop, nor after the loop unless the
+    instruction runs on every way out of it. An instruction moved out of
+    an inner loop may then move out of the outer one too.
+    """
+    cfg = ControlFlowGraph(code)
+    dominating = DominatorTree(cfg)
+    loops = natural_loops(cfg, dominating)
+    analyses: Dict[str, list] = {}
+    moved_to: Dict[int, int] = {}  # header of the preheader of each move
+    kept: Set[int] = set()  # instructions left in a loop already done
+    for header, body in sorted(loops.items(), key=lambda l: len(l[1])):
+        inside = {n for b in body for n in range(cfg.blocks[b].start,
+                                                 cfg.blocks[b].stop)}
+        start = cfg.blocks[header].start
+        before = cfg.block_of[start - 1] if start else None
+        if (code[start].opcode is not OpCode.LABEL or
+                before in body and header in cfg.blocks[before].successors):
+            hoisted = []  # the preheader would run on each iteration
+        else:
+            hoisted = _loop_invariants(code, cfg, header, inside,
+                                       dominating, analyses, kept)
+        for n in hoisted:
+            moved_to[n] = header
+        kept |= inside.difference(hoisted)
+    if not moved_to:
+        return code
+
+    labels = set(label_indexes(code))
+    preheaders: Dict[int, List[Instruction]] = {}
+    renamed: Dict[int, Dict[str, str]] = {}  # new targets of jumps and ifs
+    for n in sorted(moved_to):
+        start = cfg.blocks[moved_to[n]].start
+        if start not in preheaders:
+            label = code[start].args[0]
+            preheaders[start] = []
+            body = loops[moved_to[n]]
+            outside_jumps = [
+                m for m, i in enumerate(code)
+                if cfg.block_of[m] not in body and
+                (i.opcode is OpCode.JUMP and i.args[0] == label or
+                 i.opcode is OpCode.IF and label in i.args[1:])]
+            if outside_jumps:
+                preheader_label = _fresh_label(labels, f'{label}_pre')
+                for m in outside_jumps:
+                    renamed.setdefault(m, {})[label] = preheader_label
+                preheaders[start].append(Instruction.label(preheader_label))
+        preheaders[start].append(code[n])
+
+    result = []
+    for n, instruction in enumerate(code):
+        result.extend(preheaders.get(n, ()))
+        if n in moved_to:
+            continue
+        if n in renamed:
+            targets = renamed[n]
+            instruction = Instruction.factory(
+                instruction.opcode,
+                *(targets.get(a, a) if isinstance(a, str) else a
+                  for a in instruction.args))
+        result.append(instruction)
+    return result
+
+
+def _final_target(code: List[Instruction], labels: Dict[str, int],
+                  label: str) -> str:
+    """Label where a jump to label ends, following the jumps it meets
+    before any other instruction."""
+    seen = {label}
+    while True:
+        n = labels[label]
+        while n < len(code) and code[n].opcode is OpCode.LABEL:
+            n += 1
+        if n == len(code) or code[n].opcode is not OpCode.JUMP:
+            return label
+        label = code[n].args[0]
+        if label in seen:  # an endless loop
+            return label
+        seen.add(label)
+
+
+def _thread_jumps(code: List[Instruction]) -> List[Instruction]:
+    labels = label_indexes(code)
+    threaded = []
+    for n, instruction in enumerate(code):
+        opcode = instruction.opcode
+        if opcode is OpCode.JUMP:
+            target = _final_target(code, labels, instruction.args[0])
+            after = n + 1
+            while after < len(code) and code[after].opcode is OpCode.LABEL:
+                if code[after].args[0] == target:
+                    break
+                after += 1
+            else:
+                instruction = Instruction.jump(target)
+                threaded.append(instruction)
+            continue
+        if opcode is OpCode.IF:
+            condition, if_label, else_label = instruction.args
+            if_label = _final_target(code, labels, if_label)
+            else_label = _final_target(code, labels, else_label)
+            if if_label == else_label:
+                instruction = Instruction.jump(if_label)
+            else:
+                instruction = Instruction.if_(condition, if_label,
+                                              else_label)
+        threaded.append(instruction)
+    return threaded
+
+
+def _reachable(code: List[Instruction]) -> List[bool]:
+    succ = successors(code)
+    reached = [False] * len(code)
+    stack = [0] if code else []
+    while stack:
+        n = stack.pop()
+        if not reached[n]:
+            reached[n] = True
+            stack.extend(succ[n])
+    return reached
+
+
+def clean_control_flow(code: List[Instruction]) -> List[Instruction]:
+    """Removes the jumps and labels that do not change what runs.
+
+    A jump or if to a label followed by a jump goes to the target of that
+    jump instead, an if with the same two targets becomes a jump and a jump
+    to the next instruction is removed. Then the instructions no path from
+    the start reaches are removed, and the labels no jump or if refers to.
+    """
+    while True:
+        threaded = _thread_jumps(code)
+        reached = _reachable(threaded)
+        targets = {label for n, i in enumerate(threaded) if reached[n]
+                   for label in (i.args if i.opcode is OpCode.JUMP else
+                                 i.args[1:] if i.opcode is OpCode.IF else ())}
+        labels = label_indexes(threaded)
+        cleaned = [i for n, i in enumerate(threaded) if reached[n] and (
+            i.opcode is not OpCode.LABEL or
+            i.args[0] in targets and labels[i.args[0]] == n)]
+        if len(cleaned) == len(code):
+            return cleaned
+        code = cleaned
@@ -1,14 +1,17 @@
 import sys
-from collections.abc import Collection
+from collections import namedtuple
 from enum import auto, Flag
-from functools import partial, wraps
-from typing import Callable
+from typing import List, Optional, Tuple
 
+from c_ast import Assign, Binary, Name, Number, Unary
+from c_ast_builder import AstBuilder
 from c_code_generator import CodeGenerator
-from c_grammar import FIRST, FOLLOW
+from c_grammar import RULES, START, TABLE
 from c_lexer import Lexer
 from c_parser_result import Result
-from c_parser_tree import ParserTree
+from c_parser_tree import NullTree, tree_writer
+from c_pass_manager import DEFAULT_LEVEL, PassManager
+from c_program import Program
 from c_symbol_table import SymbolTable
 from c_token import Token, TokenType as T
 from c_virtual_machine import VirtualMachine
@@ -19,58 +22,144 @@ class ParserError(Exception):
     pass
 
 
-def rule_head(method):
-    var_name = method.__name__.lstrip('_')
-
-    @wraps(method)
-    def new_method(self) -> Result:
-        self.tree.push(var_name)
-        result = method(self)
-        self.tree.pop()
-        return result
-
-    new_method.first = FIRST[var_name]
-    new_method.follow = FOLLOW[var_name]
-    return new_method
-
-
-def rule(function=None, *, new_scope=False, lvalue=None):
-    if function is None:
-        return partial(rule, new_scope=new_scope, lvalue=lvalue)
-
-    method_name = f'{function.__name__.rstrip("_")}'
-    pre_method_name = f'{method_name}_pre'
-
-    def new_function(parser: 'Parser') -> Result:
-        if new_scope:
-            parser.symbol_table.enter_block()
-
-        pre_method = code_method = None
-        if ParserFeatures.CODE_GENERATION in parser.features:
-            code_method = getattr(
-                parser.code_generator, method_name,
-                getattr(parser.code_generator, f'{method_name}_', None))
-            pre_method = getattr(parser.code_generator, pre_method_name, None)
-
-        if pre_method is not None:
-            pre_method()
-        result = function(parser)
-        if code_method is not None:
-            result = code_method(result)
-
-        if new_scope:
-            parser.symbol_table.leave_block()
-
-        if lvalue is not None:
-            result.lvalue = lvalue
-        return result
-
-    return new_function
+# A grammar production. symbols holds token types, sets of token types and
+# names of non-terminals. The production is chosen by the LL(1) table of
+# etc/miniC.gmr, and the last one of each head for any other token. check
+# names a Parser method called with the children results and their combined
+# Result. Without keep_values the values of the children are not passed up.
+Production = namedtuple('Production', ['name', 'head', 'symbols', 'new_scope',
+                                       'check', 'keep_values'],
+                        defaults=(False, None, True))
+
+# Terminal expected by a production: accepted types and how errors show it
+Terminal = namedtuple('Terminal', ['types', 'description'])
+
+
+def terminal(symbol) -> Terminal:
+    if isinstance(symbol, T):
+        return Terminal(frozenset({symbol}), str(symbol))
+    return Terminal(frozenset(symbol), f'one of {symbol}')
+
+
+# Production bound to a parser. steps are Terminals, names of non-terminals
+# and methods that parse a non-terminal on their own. enter runs before the
+# first step and finish turns the results of the steps into the result of
+# the production.
+BoundProduction = namedtuple('BoundProduction',
+                             ['head', 'steps', 'enter', 'finish'])
+
+PRODUCTIONS = [
+    Production('function', 'function', ('type', T.IDENT, T.OPAR, 'arg_list',
+                                        T.CPAR, 'bloco', T.EOF),
+               new_scope=True),
+    Production('arg_list', 'arg_list', ('arg', 'resto_arg_list')),
+    Production('arg_list_empty', 'arg_list', ()),
+    Production('arg', 'arg', ('type', T.IDENT), check='_declare'),
+    Production('resto_arg_list', 'resto_arg_list', (T.COMMA, 'arg_list')),
+    Production('resto_arg_list_empty', 'resto_arg_list', ()),
+    Production('type', 'type', ({T.INT, T.FLOAT},)),
+    Production('bloco', 'bloco', (T.OBRKT, 'stmt_list', T.CBRKT),
+               new_scope=True),
+    Production('stmt_list_stmt', 'stmt_list', ('stmt', 'stmt_list'),
+               keep_values=False),
+    Production('stmt_list_declaration', 'stmt_list',
+               ('declaration', 'stmt_list'), keep_values=False),
+    Production('stmt_list_empty', 'stmt_list', ()),
+    Production('stmt_for', 'stmt', ('for_stmt',)),
+    Production('stmt_io', 'stmt', ('io_stmt',)),
+    Production('stmt_while', 'stmt', ('while_stmt',)),
+    Production('stmt_if', 'stmt', ('if_stmt',)),
+    Production('stmt_bloco', 'stmt', ('bloco',)),
+    Production('stmt_expr', 'stmt', ('expr', T.SEMICOLON)),
+    Production('stmt_break', 'stmt', (T.BREAK, T.SEMICOLON)),
+    Production('stmt_continue', 'stmt', (T.CONTINUE, T.SEMICOLON)),
+    Production('stmt_return', 'stmt', (T.RETURN, 'fator', T.SEMICOLON)),
+    Production('stmt_null', 'stmt', (T.SEMICOLON,)),
+    Production('declaration', 'declaration',
+               ('type', 'ident_list', T.SEMICOLON), check='_declare'),
+    Production('ident_list', 'ident_list', (T.IDENT, 'resto_ident_list')),
+    Production('resto_ident_list', 'resto_ident_list',
+               (T.COMMA, T.IDENT, 'resto_ident_list')),
+    Production('resto_ident_list_empty', 'resto_ident_list', ()),
+    Production('for_stmt', 'for_stmt',
+               (T.FOR, T.OPAR, 'opt_expr', T.SEMICOLON, 'opt_expr',
+                T.SEMICOLON, 'opt_expr', T.CPAR, 'stmt'), new_scope=True),
+    Production('opt_expr', 'opt_expr', ('expr',)),
+    Production('opt_expr_empty', 'opt_expr', ()),
+    Production('io_stmt_scan', 'io_stmt',
+               (T.SCAN, T.OPAR, T.STR, T.COMMA, T.IDENT, T.CPAR,
+                T.SEMICOLON)),
+    Production('io_stmt_print', 'io_stmt',
+               (T.PRINT, T.OPAR, 'out_list', T.CPAR, T.SEMICOLON)),
+    Production('out_list', 'out_list', ('out', 'resto_out_list')),
+    Production('out', 'out', ({T.NUMINT, T.NUMFLOAT, T.STR, T.IDENT},)),
+    Production('resto_out_list', 'resto_out_list',
+               (T.COMMA, 'out', 'resto_out_list')),
+    Production('resto_out_list_empty', 'resto_out_list', ()),
+    Production('while_stmt', 'while_stmt',
+               (T.WHILE, T.OPAR, 'expr', T.CPAR, 'stmt')),
+    Production('if_stmt', 'if_stmt',
+               (T.IF, T.OPAR, 'expr', T.CPAR, 'stmt', 'else_part')),
+    Production('else_part', 'else_part', (T.ELSE, 'stmt')),
+    Production('else_part_empty', 'else_part', ()),
+]
+
+
+
+def covers(production: Production, rule) -> bool:
+    """Whether production parses the grammar rule. A set of token types in
+    production stands for one rule per type, and the start production
+    also reads the EOF that follows the rule."""
+    symbols = production.symbols
+    if production.head == START and symbols[-1:] == (T.EOF,):
+        symbols = symbols[:-1]
+    return (production.head == rule[0] and len(symbols) == len(rule[1]) and
+            all(s == r or isinstance(s, (set, frozenset)) and r in s
+                for s, r in zip(symbols, rule[1])))
+
+
+# Production of each rule of the LL(1) table parsed by PRODUCTIONS, the
+# expression rules being parsed by precedence climbing instead
+RULE_PRODUCTIONS = {index: production.name
+                    for index, rule in enumerate(RULES)
+                    for production in PRODUCTIONS if covers(production, rule)}
+
+# Precedence of the expression operators. Binary operators associate to the
+# left, except '=', to the right, and the relational ones, which do not
+# associate. As in the grammar, '!' binds looser than relational operators.
+_PAREN, _ASSIGN, _OR, _AND, _NOT, _REL, _ADD, _MULT, _SIGN = range(9)
+BINARY_PRECEDENCE = {
+    T.ASSIGN: _ASSIGN, T.OR: _OR, T.AND: _AND,
+    T.EQ: _REL, T.NEQ: _REL, T.GT: _REL, T.GEQ: _REL, T.LT: _REL, T.LEQ: _REL,
+    T.PLUS: _ADD, T.MINUS: _ADD, T.MULT: _MULT, T.DIV: _MULT, T.MOD: _MULT}
+
+_OPERATOR_TERMINALS = {t: terminal(t)
+                       for t in (*BINARY_PRECEDENCE, T.NOT, T.OPAR, T.CPAR)}
+_IDENT_TERMINAL = terminal(T.IDENT)
+_NUMBER_TERMINAL = terminal({T.NUMINT, T.NUMFLOAT})
+
+
+class Operand:
+    """Operand of an expression: its node, and the attributes the expression
+    rules of the grammar give to a Result of the same tokens. last_type is
+    the type of its last factor, which tells if it is divided as integer,
+    and mod_error tells that a % in it has a non-integer right operand."""
+    __slots__ = ('node', 'type_', 'last_type', 'operator', 'lvalue',
+                 'mod_error')
+
+    def __init__(self, node, type_, operator, lvalue):
+        self.node = node
+        self.type_ = type_
+        self.last_type = type_
+        self.operator = operator
+        self.lvalue = lvalue
+        self.mod_error = False
 
 
 class ParserFeatures(Flag):
     NONE = 0
     TREE_DOT_GENERATION = auto()
+    AST_GENERATION = auto()
     CODE_GENERATION = auto()
     SAVE_CODE_TO_FILE = auto()
     EXECUTE_CODE = auto()
@@ -79,562 +168,307 @@ class ParserFeatures(Flag):
 
 
 class Parser:
-    def __init__(self, lexer: Lexer, features=ParserFeatures.DEFAULT):
+    def __init__(self, lexer: Lexer, features=ParserFeatures.DEFAULT, *,
+                 tree_file='tree.dot', code_file='code.out',
+                 opt_level=DEFAULT_LEVEL):
         self.curr_token: Token
         self.code_generator = CodeGenerator()
+        self.pass_manager = PassManager(opt_level)
         self.features = features
+        self.tree_file = tree_file
+        self.code_file = code_file
         self.lexer = lexer
         self.symbol_table = SymbolTable()
-        self.tree = ParserTree()
+        self.tree = NullTree()
         self.virtual_machine = VirtualMachine()
+        self.ast = None
+        self._build_ast = bool(features & (ParserFeatures.AST_GENERATION |
+                                           ParserFeatures.CODE_GENERATION))
+        self._ast_builder = AstBuilder(self.symbol_table)
+        self._expressions = {'expr': self._expression, 'fator': self._fator}
+        self._stack = []
+        self._expression_head = None
+        self._dispatch = self._build_dispatch()
+
+    def _build_dispatch(self):
+        """Maps each non-terminal to its bound productions by lookahead token,
+        as the LL(1) table selects them, and to its default production."""
+        bound = {p.name: self._bind(p) for p in PRODUCTIONS}
+        dispatch = {}
+        for production in PRODUCTIONS:
+            row = TABLE[production.head]
+            by_token = {token_type: bound[RULE_PRODUCTIONS[index]]
+                        for token_type, index in row.items()}
+            dispatch[production.head] = (by_token, bound[production.name])
+        return dispatch
+
+    def _bind(self, production: Production) -> BoundProduction:
+        """Binds production to this parser, with its AST building hook
+        resolved."""
+        build_method = None
+        if self._build_ast:
+            build_method = getattr(self._ast_builder, production.name, None)
+
+        steps = tuple(self._expressions.get(symbol, symbol)
+                      if isinstance(symbol, str) else terminal(symbol)
+                      for symbol in production.symbols)
+        check = None if production.check is None else getattr(
+            self, production.check)
+        new_scope = production.new_scope
+        keep_values = production.keep_values
+        symbol_table = self.symbol_table
+
+        def finish(results: List[Result]) -> Result:
+            if results:
+                result = Result.combine(results)
+                if check is not None:
+                    check(results, result)
+            else:
+                result = Result()
+            if build_method is not None:
+                result = build_method(result)
+            if new_scope:
+                symbol_table.leave_block()
+            if not keep_values:
+                result.value = []
+            return result
+
+        return BoundProduction(production.head, steps, symbol_table.enter_block
+                               if new_scope else None, finish)
 
-    def parse(self):
+    def parse(self, args=None):
+        """Compiles the program and runs it with args, by default the
+        command line arguments after the file name."""
+        program = self.compile()
+        self.execute(program, args)
+
+    def compile(self) -> Optional[Program]:
+        """Parses the program and returns it compiled, or None when code
+        generation is disabled. The AST, when built, is kept in self.ast."""
         self.curr_token = self.lexer.get_token()
-        result = self._function()
         if ParserFeatures.TREE_DOT_GENERATION in self.features:
-            with open('tree.dot', 'w') as file:
-                file.write(str(self.tree))
-        if ParserFeatures.CODE_GENERATION in self.features:
-            if ParserFeatures.SAVE_CODE_TO_FILE in self.features:
-                with open('code.out', 'w') as file:
-                    file.write('\n'.join(str(c) for c in result.code[0][0]))
-            if ParserFeatures.EXECUTE_CODE in self.features:
-                self.virtual_machine.run(result.code[0][0], *sys.argv[2:])
-
-    @rule_head
-    def _function(self):
-        @rule(new_scope=True)
-        def function(_parser):
-            return self._produce(self._type, T.IDENT, T.OPAR, self._arg_list,
-                                 T.CPAR, self._bloco, T.EOF)
-        return function(self)
-
-    @rule_head
-    def _arg_list(self):
-        @rule
-        def arg_list(_parser):
-            result = self._produce(self._arg, self._resto_arg_list)
-            self._declare_variables(result)
-            return result
-
-        @rule
-        def arg_list_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ in Parser._arg_list.first:
-            return arg_list(self)
-        return arg_list_empty(self)
-
-    @rule_head
-    def _arg(self):
-        @rule
-        def arg(_parser):
-            return self._produce(self._type, T.IDENT)
-        return arg(self)
-
-    @rule_head
-    def _resto_arg_list(self):
-        @rule
-        def resto_arg_list(_parser):
-            return self._produce(T.COMMA, self._arg_list)
-
-        @rule
-        def resto_arg_list_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ in Parser._resto_arg_list.first:
-            return resto_arg_list(self)
-        return resto_arg_list_empty(self)
-
-    @rule_head
-    def _type(self):
-        @rule
-        def type_(_parser):
-            return self._produce({T.INT, T.FLOAT})
-        return type_(self)
-
-    @rule_head
-    def _bloco(self):
-        @rule(new_scope=True)
-        def bloco(_parser):
-            return self._produce(T.OBRKT, self._stmt_list, T.CBRKT)
-        return bloco(self)
-
-    @rule_head
-    def _stmt_list(self):
-        @rule
-        def stmt_list_stmt(_parser):
-            return self._produce(self._stmt, self._stmt_list)
-
-        @rule
-        def stmt_list_declaration(_parser):
-            return self._produce(self._declaration, self._stmt_list)
-
-        @rule
-        def stmt_list_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ in Parser._stmt.first:
-            return stmt_list_stmt(self)
-        if self.curr_token.type_ in Parser._declaration.first:
-            return stmt_list_declaration(self)
-        return stmt_list_empty(self)
-
-    @rule_head
-    def _stmt(self):
-        @rule
-        def stmt_for(_parser):
-            return self._produce(self._for_stmt)
-
-        @rule
-        def stmt_io(_parser):
-            return self._produce(self._io_stmt)
-
-        @rule
-        def stmt_while(_parser):
-            return self._produce(self._while_stmt)
-
-        @rule
-        def stmt_if(_parser):
-            return self._produce(self._if_stmt)
-
-        @rule
-        def stmt_bloco(_parser):
-            return self._produce(self._bloco)
-
-        @rule
-        def stmt_expr(_parser):
-            return self._produce(self._expr, T.SEMICOLON)
-
-        @rule
-        def stmt_break(_parser):
-            return self._produce(T.BREAK, T.SEMICOLON)
-
-        @rule
-        def stmt_continue(_parser):
-            return self._produce(T.CONTINUE, T.SEMICOLON)
-
-        @rule
-        def stmt_return(_parser):
-            return self._produce(T.RETURN, self._fator, T.SEMICOLON)
-
-        @rule
-        def stmt_null(_parser):
-            return self._produce(T.SEMICOLON)
-
-        if self.curr_token.type_ in Parser._for_stmt.first:
-            return stmt_for(self)
-        if self.curr_token.type_ in Parser._io_stmt.first:
-            return stmt_io(self)
-        if self.curr_token.type_ in Parser._while_stmt.first:
-            return stmt_while(self)
-        if self.curr_token.type_ in Parser._if_stmt.first:
-            return stmt_if(self)
-        if self.curr_token.type_ in Parser._bloco.first:
-            return stmt_bloco(self)
-        if self.curr_token.type_ in Parser._expr.first:
-            return stmt_expr(self)
-        if self.curr_token.type_ == T.BREAK:
-            return stmt_break(self)
-        if self.curr_token.type_ == T.CONTINUE:
-            return stmt_continue(self)
-        if self.curr_token.type_ == T.RETURN:
-            return stmt_return(self)
-        return stmt_null(self)
-
-    @rule_head
-    def _declaration(self):
-        @rule
-        def declaration(_parser):
-            result = self._produce(self._type, self._ident_list, T.SEMICOLON)
-            self._declare_variables(result)
-            return result
-        return declaration(self)
-
-    @rule_head
-    def _ident_list(self):
-        @rule
-        def ident_list(_parser):
-            return self._produce(T.IDENT, self._resto_ident_list)
-        return ident_list(self)
-
-    @rule_head
-    def _resto_ident_list(self):
-        @rule
-        def resto_ident_list(_parser):
-            return self._produce(T.COMMA, T.IDENT, self._resto_ident_list)
-
-        @rule
-        def resto_ident_list_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.COMMA:
-            return resto_ident_list(self)
-        return resto_ident_list_empty(self)
-
-    @rule_head
-    def _for_stmt(self):
-        @rule(new_scope=True)
-        def for_stmt(_parser):
-            return self._produce(
-                T.FOR, T.OPAR, self._opt_expr, T.SEMICOLON, self._opt_expr,
-                T.SEMICOLON, self._opt_expr, T.CPAR, self._stmt)
-        return for_stmt(self)
-
-    @rule_head
-    def _opt_expr(self):
-        @rule
-        def opt_expr(_parser):
-            return self._produce(self._expr)
-
-        @rule
-        def opt_expr_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ in Parser._expr.first:
-            return opt_expr(self)
-        return opt_expr_empty(self)
-
-    @rule_head
-    def _io_stmt(self):
-        @rule
-        def io_stmt_scan(_parser):
-            return self._produce(T.SCAN, T.OPAR, T.STR, T.COMMA, T.IDENT,
-                                 T.CPAR, T.SEMICOLON)
-
-        @rule
-        def io_stmt_print(_parser):
-            return self._produce(T.PRINT, T.OPAR, self._out_list, T.CPAR,
-                                 T.SEMICOLON)
-
-        if self.curr_token.type_ == T.SCAN:
-            return io_stmt_scan(self)
-        return io_stmt_print(self)
-
-    @rule_head
-    def _out_list(self):
-        @rule
-        def out_list(_parser):
-            return self._produce(self._out, self._resto_out_list)
-        return out_list(self)
-
-    @rule_head
-    def _out(self):
-        @rule
-        def out(_parser):
-            return self._produce({T.NUMINT, T.NUMFLOAT, T.STR, T.IDENT})
-        return out(self)
-
-    @rule_head
-    def _resto_out_list(self):
-        @rule
-        def resto_out_list(_parser):
-            return self._produce(T.COMMA, self._out, self._resto_out_list)
-
-        @rule
-        def resto_out_list_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.COMMA:
-            return resto_out_list(self)
-        return resto_out_list_empty(self)
-
-    @rule_head
-    def _while_stmt(self):
-        @rule
-        def while_stmt(_parser):
-            return self._produce(T.WHILE, T.OPAR, self._expr, T.CPAR,
-                                 self._stmt)
-        return while_stmt(self)
-
-    @rule_head
-    def _if_stmt(self):
-        @rule
-        def if_stmt(_parser):
-            return self._produce(T.IF, T.OPAR, self._expr, T.CPAR, self._stmt,
-                                 self._else_part)
-        return if_stmt(self)
-
-    @rule_head
-    def _else_part(self):
-        @rule
-        def else_part(_parser):
-            return self._produce(T.ELSE, self._stmt)
-
-        @rule
-        def else_part_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.ELSE:
-            return else_part(self)
-        return else_part_empty(self)
-
-    @rule_head
-    def _expr(self):
-        @rule
-        def expr(_parser):
-            return self._produce(self._atrib)
-        return expr(self)
-
-    @rule_head
-    def _atrib(self):
-        def check_lvalue(results):
-            if not results[0].lvalue and results[1].lvalue:
-                self._error('Expression before = is not a lvalue.')
-
-        @rule
-        def atrib(_parser):
-            return self._produce(self._or, self._resto_atrib,
-                                 callback=check_lvalue)
-
-        return atrib(self)
-
-    @rule_head
-    def _resto_atrib(self):
-        @rule(lvalue=True)
-        def resto_atrib(_parser):
-            return self._produce(T.ASSIGN, self._atrib)
-
-        @rule(lvalue=False)
-        def resto_atrib_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.ASSIGN:
-            return resto_atrib(self)
-        return resto_atrib_empty(self)
-
-    @rule_head
-    def _or(self):
-        @rule
-        def and_(_parser):
-            return self._produce(self._and, self._resto_or)
-        return and_(self)
-
-    @rule_head
-    def _resto_or(self):
-        @rule(lvalue=False)
-        def resto_or(_parser):
-            return self._produce(T.OR, self._and, self._resto_or)
-
-        @rule(lvalue=True)
-        def resto_or_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.OR:
-            return resto_or(self)
-        return resto_or_empty(self)
-
-    @rule_head
-    def _and(self):
-        @rule
-        def and_(_parser):
-            return self._produce(self._not, self._resto_and)
-        return and_(self)
-
-    @rule_head
-    def _resto_and(self):
-        @rule(lvalue=False)
-        def resto_and(_parser):
-            return self._produce(T.AND, self._not, self._resto_and)
-
-        @rule(lvalue=True)
-        def resto_and_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.AND:
-            return resto_and(self)
-        return resto_and_empty(self)
-
-    @rule_head
-    def _not(self):
-        @rule(lvalue=False)
-        def not_not(_parser):
-            return self._produce(T.NOT, self._not)
-
-        @rule
-        def not_rel(_parser):
-            return self._produce(self._rel)
-
-        if self.curr_token.type_ == T.NOT:
-            return not_not(self)
-        return not_rel(self)
-
-    @rule_head
-    def _rel(self):
-        @rule
-        def rel(_parser):
-            return self._produce(self._add, self._resto_rel)
-        return rel(self)
-
-    @rule_head
-    def _resto_rel(self):
-        @rule(lvalue=False)
-        def resto_rel_eq(_parser):
-            return self._produce(T.EQ, self._add)
-
-        @rule(lvalue=False)
-        def resto_rel_neq(_parser):
-            return self._produce(T.NEQ, self._add)
-
-        @rule(lvalue=False)
-        def resto_rel_gt(_parser):
-            return self._produce(T.GT, self._add)
-
-        @rule(lvalue=False)
-        def resto_rel_geq(_parser):
-            return self._produce(T.GEQ, self._add)
-
-        @rule(lvalue=False)
-        def resto_rel_lt(_parser):
-            return self._produce(T.LT, self._add)
-
-        @rule(lvalue=False)
-        def resto_rel_leq(_parser):
-            return self._produce(T.LEQ, self._add)
-
-        @rule(lvalue=True)
-        def resto_rel_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.EQ:
-            return resto_rel_eq(self)
-        if self.curr_token.type_ == T.NEQ:
-            return resto_rel_neq(self)
-        if self.curr_token.type_ == T.GT:
-            return resto_rel_gt(self)
-        if self.curr_token.type_ == T.GEQ:
-            return resto_rel_geq(self)
-        if self.curr_token.type_ == T.LT:
-            return resto_rel_lt(self)
-        if self.curr_token.type_ == T.LEQ:
-            return resto_rel_leq(self)
-        return resto_rel_empty(self)
-
-    @rule_head
-    def _add(self):
-        @rule
-        def add(_parser):
-            return self._produce(self._mult, self._resto_add)
-        return add(self)
-
-    @rule_head
-    def _resto_add(self):
-        def resto_add(_parser, token_type):
-            return self._produce(token_type, self._mult, self._resto_add)
-
-        @rule(lvalue=False)
-        def resto_add_plus(_parser):
-            return resto_add(self, T.PLUS)
-
-        @rule(lvalue=False)
-        def resto_add_minus(_parser):
-            return resto_add(self, T.MINUS)
-
-        @rule(lvalue=True)
-        def resto_add_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.PLUS:
-            return resto_add_plus(self)
-        if self.curr_token.type_ == T.MINUS:
-            return resto_add_minus(self)
-        return resto_add_empty(self)
-
-    @rule_head
-    def _mult(self):
-        @rule
-        def mult(_parser):
-            result = self._produce(self._uno, self._resto_mult)
-            if result.operator == '%' and result.type_ != T.INT:
-                self._error('% operands must be integer.')
-            return result
-        return mult(self)
-
-    @rule_head
-    def _resto_mult(self):
-        @rule(lvalue=False)
-        def resto_mult_mult(_parser):
-            return self._produce(T.MULT, self._uno, self._resto_mult)
-
-        @rule(lvalue=False)
-        def resto_mult_div(_parser):
-            return self._produce(T.DIV, self._uno, self._resto_mult)
-
-        @rule(lvalue=False)
-        def resto_mult_mod(_parser):
-            result = self._produce(T.MOD, self._uno, self._resto_mult)
-            if result.type_ != T.INT:
-                self._error('% operands must be integer.')
-            return result
+            with open(self.tree_file, 'w', encoding='utf-8') as file:
+                self.tree = tree_writer(file, self.tree_file)
+                try:
+                    result = self._parse('function')
+                finally:
+                    self.tree.close()
+                    self.tree = NullTree()
+        else:
+            result = self._parse('function')
+        if self._build_ast:
+            self.ast = result.nodes[0]
+        if ParserFeatures.CODE_GENERATION not in self.features:
+            return None
+        code = self.code_generator.generate(self.ast)
+        program = Program(self.pass_manager.run(code))
+        self.save_code(program)
+        return program
+
+    def save_code(self, program: Program):
+        """Writes program to code_file with SAVE_CODE_TO_FILE."""
+        if ParserFeatures.SAVE_CODE_TO_FILE in self.features:
+            with open(self.code_file, 'w', encoding='utf-8') as file:
+                file.write('\n'.join(str(c) for c in program))
+
+    def execute(self, program: Optional[Program], args=None):
+        if program is None or ParserFeatures.EXECUTE_CODE not in self.features:
+            return
+        if args is None:
+            args = sys.argv[2:]
+        self.virtual_machine.run(program, *args)
+
+    def _parse(self, head: str) -> Result:
+        """Parses head keeping the open productions in an explicit stack of
+        (production, results of its steps so far), so that nesting, as in
+        long statement lists, does not grow the Python call stack."""
+        stack = self._stack = [self._expand(head)]
+        while True:
+            production, results = stack[-1]
+            steps = production.steps
+            if len(results) < len(steps):
+                symbol = steps[len(results)]
+                if isinstance(symbol, Terminal):
+                    results.append(self._consume(symbol))
+                elif isinstance(symbol, str):
+                    stack.append(self._expand(symbol))
+                else:
+                    results.append(symbol())
+                continue
+
+            result = production.finish(results)
+            self.tree.pop()
+            stack.pop()
+            if not stack:
+                return result
+            stack[-1][1].append(result)
+
+    def _expand(self, head: str):
+        self.tree.push(head)
+        by_token, default = self._dispatch[head]
+        production = by_token.get(self.curr_token.type_, default)
+        if production.enter is not None:
+            production.enter()
+        return production, []
+
+    def _expression(self) -> Result:
+        return self._parse_expression('expr')
+
+    def _fator(self) -> Result:
+        return self._parse_expression('fator')
+
+    def _parse_expression(self, head: str) -> Result:
+        """Parses an expression, or a single factor when head is 'fator', by
+        precedence climbing over explicit operator and operand stacks.
+
+        Results, checks and errors are those of the expression rules of the
+        grammar, and the code computes the same operations, but every operand
+        is visited once and only temporaries that hold a value are created.
+        """
+        self.tree.push(head)
+        self._expression_head = head
+        factor_only = head == 'fator'
+        operators: List[Tuple[int, T]] = []
+        operands: List[Operand] = []
+        while True:
+            found = self.curr_token.type_
+            if found is T.OPAR:
+                self._consume(_OPERATOR_TERMINALS[T.OPAR])
+                operators.append((_PAREN, found, None))
+                continue
+            if operators:
+                sign = True
+                negation = operators[-1][0] <= _NOT
+            else:
+                sign = negation = not factor_only
+            if (found is T.PLUS or found is T.MINUS) and sign:
+                operators.append((_SIGN, found, self._consume_operator()))
+                continue
+            if found is T.NOT and negation:
+                operators.append((_NOT, found, self._consume_operator()))
+                continue
+            operands.append(self._operand())
+            if self._after_operand(operators, operands, factor_only):
+                break
+
+        operand = operands.pop()
+        result = Result(lvalue=operand.lvalue, operator=operand.operator,
+                        type_=operand.type_)
+        if self._build_ast:
+            result.nodes.append(operand.node)
+        self.tree.pop()
+        self._expression_head = None
+        return result
 
-        @rule(lvalue=True)
-        def resto_mult_empty(_parser):
-            return Result()
-
-        if self.curr_token.type_ == T.MULT:
-            return resto_mult_mult(self)
-        if self.curr_token.type_ == T.DIV:
-            return resto_mult_div(self)
-        if self.curr_token.type_ == T.MOD:
-            return resto_mult_mod(self)
-        return resto_mult_empty(self)
-
-    @rule_head
-    def _uno(self):
-        @rule(lvalue=False)
-        def uno_plus(_parser):
-            return self._produce(T.PLUS, self._uno)
-
-        @rule(lvalue=False)
-        def uno_minus(_parser):
-            return self._produce(T.MINUS, self._uno)
-
-        @rule
-        def uno_fator(_parser):
-            return self._produce(self._fator)
-
-        if self.curr_token.type_ == T.PLUS:
-            return uno_plus(self)
-        if self.curr_token.type_ == T.MINUS:
-            return uno_minus(self)
-        return uno_fator(self)
-
-    @rule_head
-    def _fator(self):
-        @rule(lvalue=True)
-        def fator_ident(_parser):
-            result = self._produce(T.IDENT)
+    def _operand(self) -> Operand:
+        if self.curr_token.type_ is T.IDENT:
+            result = self._consume(_IDENT_TERMINAL)
             if result.type_ is None:
                 self._error(f'Symbol {result.value[0][0]} not defined.')
-            return result
-
-        @rule(lvalue=False)
-        def fator_num(_parser):
-            return self._produce({T.NUMINT, T.NUMFLOAT})
-
-        @rule(lvalue=False)
-        def fator_atrib(_parser):
-            return self._produce(T.OPAR, self._atrib, T.CPAR)
-
-        if self.curr_token.type_ == T.OPAR:
-            return fator_atrib(self)
-        if self.curr_token.type_ == T.IDENT:
-            return fator_ident(self)
-        return fator_num(self)
-
-    def _consume(self, expected):
-        is_collection = isinstance(expected, Collection)
+        else:
+            result = self._consume(_NUMBER_TERMINAL)
+        node = None
+        if self._build_ast:
+            value = result.value[0]
+            if isinstance(value, tuple):
+                node = Name(*value, result.type_, *result.position)
+            else:
+                node = Number(value, result.type_, *result.position)
+        return Operand(node, result.type_, None, result.lvalue)
+
+    def _consume_operator(self):
+        """Consumes the operator token and returns its position."""
+        return self._consume(
+            _OPERATOR_TERMINALS[self.curr_token.type_]).position
+
+    def _after_operand(self, operators, operands, factor_only) -> bool:
+        """Reads the tokens after an operand up to the next binary operator,
+        which is pushed, and returns True if the expression ends instead."""
+        while not (factor_only and not operators):
+            found = self.curr_token.type_
+            precedence = BINARY_PRECEDENCE.get(found)
+            if precedence != _MULT:  # the operand ends a <mult>
+                self._reduce(operators, operands, _MULT)
+                operand = operands[-1]
+                if operand.mod_error or (operand.operator == '%' and
+                                         operand.type_ != T.INT):
+                    self._error('% operands must be integer.')
+            if precedence is not None:
+                self._reduce(operators, operands, precedence + 1
+                             if precedence in (_ASSIGN, _REL) else precedence)
+                if not (operators and precedence == _REL and
+                        operators[-1][0] == _REL):
+                    operators.append((precedence, found,
+                                      self._consume_operator()))
+                    return False
+
+            # found ends the innermost parenthesis or the whole expression
+            self._reduce(operators, operands, _ASSIGN)
+            if not operators:
+                return True
+            self._consume(_OPERATOR_TERMINALS[T.CPAR])
+            operators.pop()
+            operand = operands[-1]
+            operand.lvalue = False
+            operand.last_type = operand.type_
+            operand.mod_error = False
+        return True
+
+    def _reduce(self, operators, operands, precedence: int):
+        """Applies the operators on top of the stack with at least the given
+        precedence."""
+        while operators and operators[-1][0] >= precedence:
+            operator_precedence, token_type, position = operators.pop()
+            operator = token_type.value
+            operand = operands.pop()
+            if operator_precedence in (_SIGN, _NOT):
+                if self._build_ast and token_type is not T.PLUS:
+                    operand.node = Unary(operator, operand.node,
+                                         operand.type_, *position)
+                operand.operator = operator
+                operand.lvalue = False
+                operand.last_type = operand.type_
+                operands.append(operand)
+                continue
+
+            left, right = operands.pop(), operand
+            if left.type_ is None:
+                left.type_ = right.type_
+            if token_type is T.ASSIGN:
+                if not left.lvalue:
+                    self._error('Expression before = is not a lvalue.')
+                if self._build_ast:
+                    left.node = Assign(left.node, right.node, left.type_,
+                                       *position)
+            else:
+                if token_type is T.DIV and left.last_type == T.INT:
+                    operator = '//'
+                if self._build_ast:
+                    left.node = Binary(operator, left.node, right.node,
+                                       left.type_, *position)
+                left.lvalue = False
+                if operator_precedence == _MULT:
+                    left.mod_error = left.mod_error or (
+                        token_type is T.MOD and right.type_ != T.INT)
+                left.last_type = right.type_
+            if left.operator is None:
+                left.operator = token_type.value
+            operands.append(left)
+
+    def _consume(self, expected: Terminal):
         found = self.curr_token.type_
         result = Result(lvalue=found == T.IDENT)
-        if (is_collection and found in expected) or found == expected:
+        if found in expected.types:
             if found == T.EOF:
                 return result
 
             value = self.curr_token.typed_value
             if found == T.IDENT:
-                result.type_ = self.symbol_table[value]
-                depth = self.symbol_table.depth_of(value,
-                                                   self.symbol_table.depth)
+                binding = self.symbol_table.lookup(value)
+                if binding is None:
+                    depth = self.symbol_table.depth
+                else:
+                    depth, result.type_ = binding
                 result.value.append((value, depth))
             else:
                 result.type_ = self.curr_token.data_type
@@ -642,24 +476,17 @@ class Parser:
                     result.value.append(value)
 
             result.operator = self.curr_token.operator
+            result.position = (self.curr_token.row, self.curr_token.col)
 
             self.tree.put_token(self.curr_token.name)
             self.curr_token = self.lexer.get_token()
         else:
-            self._error(f'Expected {"one of " if is_collection else ""}'
-                        f'{expected}, found {self.curr_token.name}.')
+            self._error(f'Expected {expected.description}, '
+                        f'found {self.curr_token.name}.')
         return result
 
-    def _produce(self, *args, callback: Callable = None) -> Result:
-        results = []
-        for symbol in args:
-            if callable(symbol):
-                results.append(symbol())
-            else:
-                results.append(self._consume(symbol))
-        if callback is not None:
-            callback(results)
-        return sum(results)
+    def _declare(self, _results: List[Result], result: Result):
+        self._declare_variables(result)
 
     def _declare_variables(self, result: Result):
         for name, depth in result.value:
@@ -671,4 +498,10 @@ class Parser:
     def _error(self, msg):
         raise ParserError(f'Parser error: line {self.curr_token.row}, '
                           f'column {self.curr_token.col}: {msg}\n'
-                          f'Stack: {self.tree.print_stack()}')
+                          f'Stack: {self._print_stack()}')
+
+    def _print_stack(self):
+        heads = [production.head for production, _ in self._stack]
+        if self._expression_head is not None:
+            heads.append(self._expression_head)
+        return ' -> '.join(heads)
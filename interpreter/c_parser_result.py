@@ -1,7 +1,6 @@
 from typing import List, Optional, Tuple, Union
 
 from c_token import TokenType
-from c_instruction import Instruction
 
 Value = Union[int, float, str]
 
@@ -17,25 +16,33 @@ class Result:
         self.operator = operator
         self.type_ = type_
         self.value: List[Value] = []
-        self.code: List[Tuple[List[Instruction], Optional[Value]]] = []
+        self.nodes: list = []
+        self.position: Optional[Tuple[int, int]] = None
 
-    def __add__(self, other: 'Result'):
-        if not isinstance(other, Result):
-            raise TypeError()
-        lvalue = self.lvalue and other.lvalue
-        operator = (self.operator if self.operator is not None
-                    else other.operator)
-        type_ = self.type_ if self.type_ is not None else other.type_
-        value = self.value.copy()
-        value.extend(other.value)
-        code = self.code.copy()
-        code.extend(other.code)
+    @staticmethod
+    def combine(results: List['Result']) -> 'Result':
+        """Result of the results of the children of a production, building
+        only one new Result. lvalue is the and of the lvalues, operator,
+        type_ and position the first ones set, and value and nodes the
+        concatenation of theirs. The lists of results[0] are reused, so
+        results must not be used afterwards."""
+        result = results[0]
+        if len(results) == 1:
+            return result
+        lvalue, operator, type_ = result.lvalue, result.operator, result.type_
+        value, nodes, position = result.value, result.nodes, result.position
+        for other in results[1:]:
+            lvalue = lvalue and other.lvalue
+            if operator is None:
+                operator = other.operator
+            if type_ is None:
+                type_ = other.type_
+            if position is None:
+                position = other.position
+            value.extend(other.value)
+            nodes.extend(other.nodes)
         result = Result(lvalue=lvalue, operator=operator, type_=type_)
         result.value = value
-        result.code = code
+        result.nodes = nodes
+        result.position = position
         return result
-
-    def __radd__(self, other):
-        if not other:
-            return self
-        return self.__add__(other)
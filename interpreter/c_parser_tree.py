@@ -1,47 +1,102 @@
 # -*- coding: utf-8 -*-
 
+import json
 from itertools import count
+from typing import TextIO
+
+
+class NullTree:
+    """Parse tree of a parser that does not generate one."""
+
+    def push(self, name: str):
+        pass
+
+    def pop(self):
+        pass
+
+    def put_token(self, token: str):
+        pass
+
+    def close(self):
+        pass
 
 
 class ParserTree:
-    def __init__(self):
+    """Writes the parse tree to file in Graphviz DOT as it is built.
+
+    Edges are written when a node is pushed and its label when it is
+    popped, so only the open nodes are kept in memory. close pops the
+    nodes left open by an error and ends the graph.
+    """
+
+    def __init__(self, file: TextIO):
+        self._file = file
         self._node_count = count()
         self._call_stack = []
-        self._edges = []
-        self._labels = {}
-        self._xlabels = {}
+        self._start()
 
-    def push(self, name: str):
-        identifier = (name, str(next(self._node_count)))
+    def _start(self):
+        self._file.write('graph {\n')
+
+    def _end(self):
+        self._file.write('}\n')
+
+    def _edge(self, parent, child):
+        self._file.write(f'{parent[1]}{parent[0]} -- {child[1]}{child[0]}\n')
+
+    def _node(self, node, parent):
+        number, name, tokens = node
         label = f'〈{name}〉'
-        self._labels[''.join(identifier)] = label
-        self._call_stack.append(identifier)
-        if len(self._call_stack) >= 2:
-            self._edges.append(tuple(self._call_stack[-2:]))
+        if tokens:
+            xlabel = ' '.join(tokens).replace('<', '〈').replace('>', '〉')
+            label += f'<BR/><BR/><b>{xlabel}</b>'
+        self._file.write(f'{name}{number} [label=<{label}>];\n')
 
-    def pop(self):
-        self._call_stack.pop()
+    def push(self, name: str):
+        node = (next(self._node_count), name, [])
+        if self._call_stack:
+            self._edge(self._call_stack[-1], node)
+        self._call_stack.append(node)
 
-    def print_stack(self):
-        return ' -> '.join(s[0] for s in self._call_stack)
+    def pop(self):
+        node = self._call_stack.pop()
+        self._node(node, self._call_stack[-1] if self._call_stack else None)
 
     def put_token(self, token: str):
-        xlabels = self._xlabels.setdefault(''.join(self._call_stack[-1]), [])
-        xlabels.append(token)
-
-    def __str__(self):
-        def _xlabel(ident):
-            xlabels = self._xlabels.get(ident, None)
-            if not xlabels:
-                return ''
-            xlabel = ' '.join(xlabels).replace('<', '〈').replace('>', '〉')
-            return f'<BR/><BR/><b>{xlabel}</b>'
-
-        return '\n'.join([
-            'graph {',
-            '\n'.join(f'{i} [label=<{l}{_xlabel(i)}>];'
-                      for i, l in self._labels.items()),
-            '\n'.join(' -- '.join(e) for e in
-                      ((''.join(v[0]), ''.join(v[1])) for v in self._edges)),
-            '}'
-        ])
+        self._call_stack[-1][2].append(token)
+
+    def close(self):
+        while self._call_stack:
+            self.pop()
+        self._end()
+
+
+class JsonLinesTree(ParserTree):
+    """Writes the parse tree to file as JSON lines, one node per line with
+    its number, the number of its parent (None for the root), its rule and
+    its tokens. Nodes are numbered in pre-order and written in post-order.
+    """
+
+    def _start(self):
+        pass
+
+    def _end(self):
+        pass
+
+    def _edge(self, parent, child):
+        pass
+
+    def _node(self, node, parent):
+        number, name, tokens = node
+        self._file.write(json.dumps(
+            {'id': number, 'parent': None if parent is None else parent[0],
+             'rule': name, 'tokens': tokens},
+            ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def tree_writer(file: TextIO, path: str) -> ParserTree:
+    """Tree writing to file, as JSON lines when path ends in .jsonl and in
+    DOT otherwise."""
+    if path.endswith('.jsonl'):
+        return JsonLinesTree(file)
+    return ParserTree(file)
@@ -0,0 +1,114 @@
+"""Runs the optimization passes over the three-address code of a program.
+
+A pass is a function from code to code, registered with the lowest
+optimization level that runs it. Level 0 runs no pass, and from
+FIXPOINT_LEVEL up the repeated passes run again until they leave the code
+unchanged.
+"""
+import time
+from collections import namedtuple
+from typing import Callable, Dict, List
+
+from c_instruction import Instruction
+from c_optimizer import clean_control_flow, eliminate_dead_stores, \
+    fold_constants, hoist_loop_invariants, propagate_copies, reuse_temps
+
+Pass = namedtuple('Pass', ['name', 'function', 'level', 'repeat'])
+
+# Statistics of a pass over all its runs: the instructions, labels
+# included, before the first run and after the last one
+PassStats = namedtuple('PassStats', ['name', 'runs', 'seconds', 'before',
+                                     'after'])
+
+Code = List[Instruction]
+
+MAX_LEVEL = 3
+DEFAULT_LEVEL = 2
+FIXPOINT_LEVEL = 3
+MAX_ROUNDS = 10
+
+# Passes in the order they run
+PASSES: List[Pass] = []
+
+
+def register_pass(function: Callable[[Code], Code], level: int,
+                  repeat=True) -> Pass:
+    """Registers a pass run from level up. The passes that are not
+    repeated run after the others, as reuse_temps must."""
+    pass_ = Pass(function.__name__, function, level, repeat)
+    PASSES.append(pass_)
+    return pass_
+
+
+register_pass(fold_constants, 1)
+register_pass(propagate_copies, 2)
+register_pass(eliminate_dead_stores, 2)
+register_pass(clean_control_flow, 1)
+register_pass(hoist_loop_invariants, 2)
+register_pass(reuse_temps, 1, repeat=False)
+
+
+def _key(code: Code) -> list:
+    return [(i.opcode, i.args) for i in code]
+
+
+class PassManager:
+    """Runs the passes of an optimization level, with the statistics of
+    each kept in stats by name."""
+
+    def __init__(self, level: int = DEFAULT_LEVEL, fixpoint: bool = None):
+        if not 0 <= level <= MAX_LEVEL:
+            raise ValueError(f'Optimization level {level} is not between 0 '
+                             f'and {MAX_LEVEL}')
+        self.level = level
+        self.fixpoint = (level >= FIXPOINT_LEVEL if fixpoint is None
+                         else fixpoint)
+        self.passes = [p for p in PASSES if p.level <= level]
+        self.stats: Dict[str, PassStats] = {}
+
+    def run(self, code: Code) -> Code:
+        repeated = [p for p in self.passes if p.repeat]
+        for _ in range(MAX_ROUNDS if self.fixpoint else 1):
+            before = _key(code) if self.fixpoint else None
+            for pass_ in repeated:
+                code = self._run(pass_, code)
+            if before is None or _key(code) == before:
+                break
+        for pass_ in self.passes:
+            if not pass_.repeat:
+                code = self._run(pass_, code)
+        return code
+
+    def _run(self, pass_: Pass, code: Code) -> Code:
+        start = time.perf_counter()
+        result = pass_.function(code)
+        seconds = time.perf_counter() - start
+        stats = self.stats.get(pass_.name)
+        if stats is None:
+            stats = PassStats(pass_.name, 0, 0.0, len(code), len(code))
+        self.stats[pass_.name] = stats._replace(
+            runs=stats.runs + 1, seconds=stats.seconds + seconds,
+            after=len(result))
+        return result
+
+
+def merge_stats(stats: List[PassStats]) -> List[PassStats]:
+    """Sums the statistics of each pass, in the order passes first
+    appear."""
+    merged: Dict[str, PassStats] = {}
+    for item in stats:
+        total = merged.get(item.name)
+        merged[item.name] = item if total is None else PassStats(
+            item.name, total.runs + item.runs, total.seconds + item.seconds,
+            total.before + item.before, total.after + item.after)
+    return list(merged.values())
+
+
+def stats_report(stats: List[PassStats]) -> str:
+    lines = [f'{"pass":<22} {"runs":>6} {"ms":>9} {"before":>9} '
+             f'{"after":>9}']
+    for item in stats:
+        lines.append(f'{item.name:<22} {item.runs:>6} '
+                     f'{item.seconds * 1000:>9.2f} {item.before:>9} '
+                     f'{item.after:>9}')
+    return '\n'.join(lines)
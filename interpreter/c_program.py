@@ -0,0 +1,90 @@
+from numbers import Number
+from typing import Iterable, Iterator, List, Optional
+
+from c_instruction import Instruction, is_temp, OpCode
+
+# Positions of the arguments that are labels
+_LABELS = {OpCode.IF: {1, 2}, OpCode.JUMP: {0}}
+
+
+def _constant(operand):
+    """Value of a constant operand, a string literal as it is printed, or
+    None for a variable, argument or temporary."""
+    if isinstance(operand, Number):
+        return operand
+    if operand.startswith('"'):
+        return operand[1:-1].replace('\\n', '\n')
+    return None
+
+
+class Program:
+    """Compiled program.
+
+    instructions is its three-address code, which iterating over the
+    program yields, with variables, arguments and temporaries by name.
+    code is the same code linked for the VirtualMachine, without the labels:
+    every operand, constants included, is the index of its slot in a frame
+    of frame_size values and every label the index in code of the
+    instruction that follows it. frame is the initial frame, with the
+    constants in their slots, args are the slots of the arguments in order,
+    None for those the code does not read, and names the operand of each
+    slot.
+    """
+    __slots__ = ('instructions', 'code', 'frame', 'args', 'names')
+
+    def __init__(self, instructions: Iterable[Instruction]):
+        self.instructions: List[Instruction] = list(instructions)
+        self.frame = []
+        self.names = []
+        self.code = []
+        slots = {}
+        targets = {}
+        for instruction in self.instructions:
+            if instruction.opcode is OpCode.LABEL:
+                targets[instruction.args[0]] = len(self.code)
+            else:
+                self.code.append(instruction)
+        self.code = [self._link(i, slots, targets) for i in self.code]
+        self.args: List[Optional[int]] = []
+        for slot, name in enumerate(self.names):
+            if isinstance(name, str) and name.startswith('__arg__'):
+                index = int(name[len('__arg__'):])
+                self.args.extend([None] * (index + 1 - len(self.args)))
+                self.args[index] = slot
+
+    def _link(self, instruction: Instruction, slots, targets) -> Instruction:
+        labels = _LABELS.get(instruction.opcode, ())
+        args = []
+        for i, arg in enumerate(instruction.args):
+            if i in labels:
+                args.append(targets[arg])
+            elif instruction.opcode is OpCode.CALL and i == 0:
+                args.append(arg)  # the command
+            else:
+                args.append(self._slot(arg, slots))
+        return Instruction.factory(instruction.opcode, *args)
+
+    def _slot(self, operand, slots) -> int:
+        # 1 and 1.0 are equal keys, so operands are told apart by type
+        key = (type(operand), operand)
+        slot = slots.get(key)
+        if slot is None:
+            slot = slots[key] = len(self.frame)
+            self.frame.append(_constant(operand))
+            self.names.append(operand)
+        return slot
+
+    @property
+    def frame_size(self) -> int:
+        return len(self.frame)
+
+    @property
+    def temp_count(self) -> int:
+        """Number of distinct temporaries."""
+        return sum(1 for name in self.names if is_temp(name))
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def __iter__(self) -> Iterator[Instruction]:
+        return iter(self.instructions)
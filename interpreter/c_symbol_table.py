@@ -1,39 +1,64 @@
-from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class SymbolTable:
+    """Symbols of the open blocks, the outermost at depth 0.
+
+    Each name maps to the stack of its bindings as (depth, value), the
+    innermost last, and each block logs the names it binds to undo them
+    when it is left. Lookups and declarations take constant time, and
+    leaving a block takes time proportional to the names it declared.
+    """
+
     def __init__(self):
-        self._stack = [{}]
+        self._bindings: Dict[str, List[Tuple[int, Any]]] = {}
+        self._blocks: List[List[str]] = [[]]
 
     @property
     def depth(self):
-        return len(self._stack) - 1
+        return len(self._blocks) - 1
 
     def enter_block(self):
-        self._stack.append({})
+        self._blocks.append([])
 
     def leave_block(self):
-        self._stack.pop()
+        for symbol in self._blocks.pop():
+            bindings = self._bindings[symbol]
+            bindings.pop()
+            if not bindings:
+                del self._bindings[symbol]
+
+    def lookup(self, symbol) -> Optional[Tuple[int, Any]]:
+        """(depth, value) of the innermost binding of symbol, or None."""
+        bindings = self._bindings.get(symbol)
+        return bindings[-1] if bindings else None
 
     def depth_of(self, symbol, default=None):
-        stack = zip(count(len(self._stack) - 1, -1), reversed(self._stack))
-        for i, table in stack:
-            if symbol in table:
-                return i
+        bindings = self._bindings.get(symbol)
+        if bindings:
+            return bindings[-1][0]
         if default is None:
             raise KeyError(f'{symbol} not found.')
         return default
 
     def current_block_contains(self, symbol):
-        return self._stack and symbol in self._stack[-1]
+        bindings = self._bindings.get(symbol)
+        return bool(bindings) and bindings[-1][0] == self.depth
 
     def __contains__(self, symbol):
-        return any(symbol in table for table in reversed(self._stack))
+        return symbol in self._bindings
 
     def __getitem__(self, key):
         if isinstance(key, tuple):
             raise IndexError('SymbolTable accepts only one key.')
-        return next((d[key] for d in reversed(self._stack) if key in d), None)
+        bindings = self._bindings.get(key)
+        return bindings[-1][1] if bindings else None
 
     def __setitem__(self, key, value):
-        self._stack[-1][key] = value
+        depth = self.depth
+        bindings = self._bindings.setdefault(key, [])
+        if bindings and bindings[-1][0] == depth:
+            bindings[-1] = (depth, value)
+        else:
+            bindings.append((depth, value))
+            self._blocks[-1].append(key)
@@ -1,3 +1,5 @@
+import sys
+from array import array
 from enum import auto, Enum, unique
 
 
@@ -42,52 +44,98 @@ class TokenType(Enum):
     MOD = '%'
 
 
+# Keywords and operators by lexeme
+TOKEN_TYPES = {t.value: t for t in TokenType if isinstance(t.value, str)}
+
+_DATA_TYPES = {TokenType.NUMINT: TokenType.INT,
+               TokenType.NUMFLOAT: TokenType.FLOAT,
+               TokenType.INT: TokenType.INT,
+               TokenType.FLOAT: TokenType.FLOAT}
+
+_CONVERTERS = {TokenType.NUMINT: int,
+               TokenType.NUMFLOAT: float,
+               TokenType.STR: str,
+               TokenType.IDENT: sys.intern}
+
+
 class Token:
-    OPERATORS = {TokenType.ASSIGN, TokenType.OR, TokenType.AND, TokenType}
+    """Token read by the lexer. Its typed value, data type and operator are
+    computed once, when it is created."""
+    OPERATORS = frozenset({
+        TokenType.ASSIGN, TokenType.OR, TokenType.AND, TokenType.NOT,
+        TokenType.EQ, TokenType.NEQ, TokenType.LT, TokenType.LEQ,
+        TokenType.GT, TokenType.GEQ, TokenType.PLUS, TokenType.MINUS,
+        TokenType.MULT, TokenType.DIV, TokenType.MOD})
+
+    __slots__ = ('row', 'col', 'name', 'type_', 'data_type', 'typed_value',
+                 'operator')
 
     def __init__(self, row=1, col=1, name='', type_=None):
+        converter, self.data_type, self.operator = _TOKEN_INFO.get(
+            type_, _NO_INFO)
+        self.typed_value = converter(name) if converter is not None else None
+        if type_ is TokenType.IDENT:
+            name = self.typed_value  # interned
         self.col = col
         self.row = row
         self.name = name
         self.type_ = type_
 
-    @property
-    def data_type(self):
-        if self.type_ == TokenType.NUMINT:
-            return TokenType.INT
-        if self.type_ == TokenType.NUMFLOAT:
-            return TokenType.FLOAT
-        if self.type_ in (TokenType.INT, TokenType.FLOAT):
-            return self.type_
-        return None
-
-    @property
-    def typed_value(self):
-        if self.type_ == TokenType.NUMINT:
-            return int(self.name)
-        if self.type_ == TokenType.NUMFLOAT:
-            return float(self.name)
-        if self.type_ in (TokenType.STR, TokenType.IDENT):
-            return self.name
-        return None
-
-    @property
-    def operator(self):
-        if self.type_ in {
-                TokenType.ASSIGN, TokenType.OR, TokenType.AND, TokenType.NOT,
-                TokenType.EQ, TokenType.NEQ, TokenType.LT, TokenType.LEQ,
-                TokenType.GT, TokenType.GEQ, TokenType.PLUS, TokenType.MINUS,
-                TokenType.MULT, TokenType.DIV, TokenType.MOD}:
-            return self.type_.value
-        return None
-
     @staticmethod
     def get_token_type(key):
-        try:
-            return TokenType(key)
-        except ValueError:
-            return None
+        return TOKEN_TYPES.get(key)
 
     def __str__(self):
         return "[" + str(self.row) + "," + str(self.col) + "] " + \
                 str(self.type_) + " - " + self.name
+
+
+# (converter, data type, operator) of each token type, so that creating a
+# Token hashes its type only once
+_TOKEN_INFO = {t: (_CONVERTERS.get(t), _DATA_TYPES.get(t),
+                   t.value if t in Token.OPERATORS else None)
+               for t in TokenType}
+_NO_INFO = (None, None, None)
+
+
+class TokenBuffer:
+    """Token stream of a whole source packed in parallel arrays.
+
+    kinds holds indexes in TokenBuffer.KINDS, names holds indexes in the
+    lexemes list, where each distinct lexeme is stored once. Indexing the
+    buffer builds the Token back.
+    """
+    KINDS = list(TokenType)
+    _KIND_INDEX = {kind: i for i, kind in enumerate(KINDS)}
+
+    def __init__(self, tokens=()):
+        self.kinds = array('B')
+        self.rows = array('I')
+        self.cols = array('i')
+        self.names = array('I')
+        self.lexemes = []
+        self._lexeme_index = {}
+        for token in tokens:
+            self.append(token)
+
+    def append(self, token: Token):
+        name_index = self._lexeme_index.get(token.name)
+        if name_index is None:
+            name_index = self._lexeme_index[token.name] = len(self.lexemes)
+            self.lexemes.append(token.name)
+        self.kinds.append(TokenBuffer._KIND_INDEX[token.type_])
+        self.rows.append(token.row)
+        self.cols.append(token.col)
+        self.names.append(name_index)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index) -> Token:
+        return Token(self.rows[index], self.cols[index],
+                     self.lexemes[self.names[index]],
+                     TokenBuffer.KINDS[self.kinds[index]])
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self[i]
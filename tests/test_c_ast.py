@@ -0,0 +1,80 @@
+import sys
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_ast import walk
+from interpreter.c_code_generator import CodeGenerator
+from interpreter.c_lexer import Lexer
+from interpreter.c_parser import Parser, ParserFeatures
+from interpreter.c_pass_manager import PassManager
+
+SOURCE = '''int main(int n) {
+    int a;
+    a = n * 2 / 3;
+    if (a) { return (a); }
+    print(a);
+}
+'''
+
+
+def _ast(source, features=ParserFeatures.AST_GENERATION):
+    parser = Parser(Lexer.from_string(source), features)
+    parser.compile()
+    return parser.ast
+
+
+def _kind(node):
+    return type(node).__name__
+
+
+class TestAst(unittest.TestCase):
+
+    def test_nodes(self):
+        function = _ast(SOURCE)
+        self.assertEqual(_kind(function), 'Function')
+        self.assertEqual(function.name, 'main')
+        self.assertEqual([a.ident for a in function.args], ['__1__n'])
+        stmts = function.body.stmts
+        self.assertEqual([_kind(s) for s in stmts],
+                         ['Declaration', 'ExprStmt', 'If', 'Print'])
+        assign = stmts[1].expr
+        self.assertEqual(_kind(assign), 'Assign')
+        self.assertEqual(assign.target.ident, '__2__a')
+        self.assertEqual((assign.row, assign.col), (3, 7))
+        division = assign.value
+        self.assertEqual(_kind(division), 'Binary')
+        self.assertEqual(division.operator, '//')
+        self.assertEqual(division.left.operator, '*')
+        self.assertIsNone(stmts[2].else_)
+        self.assertEqual(_kind(stmts[2].then.stmts[0]), 'Return')
+
+    def test_walk(self):
+        nodes = list(walk(_ast(SOURCE)))
+        self.assertEqual(_kind(nodes[0]), 'Function')
+        self.assertEqual(sum(_kind(n) == 'Number' for n in nodes), 2)
+        self.assertEqual([n.name for n in nodes if _kind(n) == 'Name'],
+                         ['n', 'a', 'a', 'n', 'a', 'a', 'a'])
+
+    def test_code_generator(self):
+        parser = Parser(Lexer.from_string(SOURCE),
+                        ParserFeatures.CODE_GENERATION)
+        code = [str(i) for i in parser.compile()]
+        self.assertEqual(code, [str(i) for i in PassManager().run(
+            CodeGenerator().generate(parser.ast))])
+        # the return jumps to the end, so the if does
+        self.assertIn('(if, __2__a, __label__1, __label__3)', code)
+        self.assertEqual(code[-2:], ['(call, print, __2__a)',
+                                     '(label, __label__1)'])
+
+    def test_deep_expression(self):
+        count = 2 * sys.getrecursionlimit()
+        source = 'int main() { int a; a = 1' + ' + a' * count + '; }\n'
+        code = CodeGenerator().generate(_ast(source))
+        self.assertEqual(len(code), count + 2)
+
+    def test_not_built(self):
+        self.assertIsNone(_ast(SOURCE, ParserFeatures.NONE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_batch import compile_batch, find_sources
+
+PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_batch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            bad = os.path.join(directory, 'bad.c')
+            with open(bad, 'w') as file:
+                file.write('int main() { x = 1; }\n')
+            output = os.path.join(directory, 'out')
+            sources = find_sources([f'{PATH}/minic', bad], output)
+            self.assertEqual(len(sources), 4)
+
+            for workers in (1, 2):
+                reports = compile_batch(sources, workers)
+                errors = {os.path.basename(r.file): r.error for r in reports}
+                self.assertIsNone(errors['ex.c'])
+                self.assertIn('Symbol x not defined', errors['bad.c'])
+                for name in ('cafunfo', 'ex', 'scope'):
+                    self.assertTrue(
+                        os.path.exists(os.path.join(output, f'{name}.out')))
+
+    def test_undecodable_file(self):
+        # sources are UTF-8 whatever the locale
+        with tempfile.TemporaryDirectory() as directory:
+            sources = []
+            for name, text in (('latin1.c', b'print("\xe7");'),
+                               ('utf8.c', b'print("\xc3\xa7");')):
+                sources.append(os.path.join(directory, name))
+                with open(sources[-1], 'wb') as file:
+                    file.write(b'int main() { %s }\n' % text)
+            latin1, utf8 = compile_batch(find_sources(sources), 1)
+            self.assertIn('UnicodeDecodeError', latin1.error)
+            self.assertIsNone(utf8.error)
+
+    def test_opt_level(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sources = find_sources([f'{PATH}/minic/cafunfo.c'], directory)
+            report, = compile_batch(sources, 1, opt_level=0)
+            self.assertEqual(report.passes, [])
+            optimized, = compile_batch(sources, 1)
+            self.assertEqual(optimized.passes[-1].name, 'reuse_temps')
+            self.assertEqual(optimized.passes[-1].after,
+                             optimized.instructions)
+            self.assertLess(optimized.instructions, report.instructions)
+
+    def test_output_collision(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sources = []
+            for name in ('a', 'b'):
+                os.mkdir(os.path.join(directory, name))
+                sources.append(os.path.join(directory, name, 'main.c'))
+                with open(sources[-1], 'w') as file:
+                    file.write('int main() { }\n')
+            output = os.path.join(directory, 'out')
+            self.assertEqual(len(find_sources([sources[0], sources[0]],
+                                              output)), 1)
+            with self.assertRaises(ValueError):
+                find_sources(sources, output)
+            self.assertEqual(len(find_sources(sources)), 2)
+            self.assertEqual(len(find_sources([directory], output)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
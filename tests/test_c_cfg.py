@@ -0,0 +1,75 @@
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_cfg import ControlFlowGraph, DominatorTree, \
+    liveness, natural_loops, reaching_definitions
+from interpreter.c_optimizer import Instruction
+
+# i = 0; while (i < n) { s = s + i; i = i + 1; } print(s);
+CODE = [Instruction.move(0, 'i'),
+        Instruction.label('loop'),
+        Instruction.operation('<', 'i', 'n', 't'),
+        Instruction.if_('t', 'body', 'end'),
+        Instruction.label('body'),
+        Instruction.operation('+', 's', 'i', 's'),
+        Instruction.operation('+', 'i', 1, 'i'),
+        Instruction.jump('loop'),
+        Instruction.label('end'),
+        Instruction.call('print', 's')]
+
+
+class TestControlFlowGraph(unittest.TestCase):
+
+    def test_blocks(self):
+        cfg = ControlFlowGraph(CODE)
+        self.assertEqual([(b.start, b.stop) for b in cfg.blocks],
+                         [(0, 1), (1, 4), (4, 8), (8, 10)])
+        self.assertEqual([b.successors for b in cfg.blocks],
+                         [[1], [2, 3], [1], []])
+        self.assertEqual([b.predecessors for b in cfg.blocks],
+                         [[], [0, 2], [1], [1]])
+        self.assertEqual(cfg.block_of, [0, 1, 1, 1, 2, 2, 2, 2, 3, 3])
+        self.assertEqual(len(ControlFlowGraph([])), 0)
+
+    def test_liveness(self):
+        live = liveness(ControlFlowGraph(CODE))
+        self.assertEqual(live[0], {'i', 'n', 's'})
+        self.assertEqual(live[2], {'i', 'n', 's', 't'})
+        self.assertEqual(live[5], {'i', 'n', 's'})
+        self.assertEqual(live[9], set())
+        temps = liveness(ControlFlowGraph(CODE), lambda a: a == 't')
+        self.assertEqual([n for n, v in enumerate(temps) if v], [2])
+
+    def test_reaching_definitions(self):
+        reaching = reaching_definitions(ControlFlowGraph(CODE))
+        self.assertEqual(reaching[2], {'i': {0, 6}, 'n': {None}})
+        self.assertEqual(reaching[5], {'s': {None, 5}, 'i': {0, 6}})
+        self.assertEqual(reaching[6], {'i': {0, 6}})
+        self.assertEqual(reaching[9], {'s': {None, 5}})
+        self.assertEqual(reaching[7], {})
+
+    def test_loops(self):
+        cfg = ControlFlowGraph(CODE)
+        dominating = DominatorTree(cfg)
+        self.assertEqual(dominating.idom, [None, 0, 1, 1])
+        self.assertEqual([[a for a in range(4) if dominating.dominates(a, b)]
+                          for b in range(4)],
+                         [[0], [0, 1], [0, 1, 2], [0, 1, 3]])
+        self.assertEqual(natural_loops(cfg), {1: {1, 2}})
+        # in a loop repeated while s
+        outer = [Instruction.label('top')] + CODE + [
+            Instruction.if_('s', 'top', 'out'), Instruction.label('out')]
+        cfg = ControlFlowGraph(outer)
+        self.assertEqual(natural_loops(cfg), {0: {0, 1, 2, 3},
+                                              1: {1, 2}})
+        # a block the entry does not reach dominates no other
+        dead = CODE[:7] + [Instruction.jump('loop'),
+                           Instruction.operation('+', 's', 1, 's')] + CODE[7:]
+        dominating = DominatorTree(ControlFlowGraph(dead))
+        self.assertEqual(dominating.idom, [None, 0, 1, None, 1])
+        self.assertFalse(dominating.dominates(3, 4))
+        self.assertTrue(dominating.dominates(0, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
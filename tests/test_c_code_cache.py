@@ -0,0 +1,76 @@
+import marshal
+import os
+import tempfile
+import time
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_code_cache import CodeCache
+from interpreter.c_lexer import Lexer
+from interpreter.c_parser import Parser, ParserFeatures
+
+PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+def _compile(filename):
+    lexer = Lexer(f'{PATH}/minic/{filename}')
+    return lexer.text, Parser(lexer, ParserFeatures.CODE_GENERATION).compile()
+
+
+class TestCodeCache(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.cache = CodeCache(self._directory.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_round_trip(self):
+        source, code = _compile('cafunfo.c')
+        key = CodeCache.key(source)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, code)
+        self.assertEqual([str(i) for i in self.cache.get(key)],
+                         [str(i) for i in code])
+        self.assertNotEqual(CodeCache.key(source + ' '), key)
+
+    def test_corrupted_entry(self):
+        source, code = _compile('scope.c')
+        key = CodeCache.key(source)
+        self.cache.put(key, code)
+        path = os.path.join(self.cache.directory, key + CodeCache.SUFFIX)
+        # unreadable, not instructions, an unknown opcode, an unknown label
+        for data in (b'\x00garbage', marshal.dumps(5),
+                     marshal.dumps([('bogus', ())]),
+                     marshal.dumps([('jump', ('nowhere',))])):
+            with open(path, 'wb') as file:
+                file.write(data)
+            self.assertIsNone(self.cache.get(key))
+            self.assertFalse(os.path.exists(path))
+
+    def test_failed_put(self):
+        _, code = _compile('ex.c')
+        os.mkdir(os.path.join(self.cache.directory, 'a' + CodeCache.SUFFIX))
+        with self.assertRaises(OSError):
+            self.cache.put('a', code)
+        self.assertEqual(os.listdir(self.cache.directory),
+                         ['a' + CodeCache.SUFFIX])
+
+    def test_eviction(self):
+        _, code = _compile('ex.c')
+        self.cache.put('a', code)
+        size = os.path.getsize(os.path.join(self.cache.directory,
+                                            'a' + CodeCache.SUFFIX))
+        self.cache.max_size = 2 * size
+        self.cache.put('b', code)
+        time.sleep(0.01)
+        self.assertIsNotNone(self.cache.get('a'))  # b is now the oldest
+        self.cache.put('c', code)
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('c'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_code_fragment import CodeFragment
+from interpreter.c_instruction import Instruction
+
+
+class TestCodeFragment(unittest.TestCase):
+
+    def test_concatenation(self):
+        labels = [Instruction.label(f'l{i}') for i in range(6)]
+        code = CodeFragment(labels[:1])
+        inner = CodeFragment([labels[2]])
+        inner.extend(CodeFragment())
+        inner.extend([labels[3]])
+        middle = CodeFragment([labels[1]])
+        middle.extend(inner)
+        code.extend(middle)
+        code.append(labels[4])
+        code.extend(CodeFragment([labels[5]]))
+        self.assertEqual(len(code), 6)
+        self.assertEqual(list(code), labels)
+
+        nested = CodeFragment()
+        for _ in range(10000):
+            outer = CodeFragment()
+            outer.extend(nested if nested else [labels[0]])
+            nested = outer
+        self.assertEqual(list(nested), labels[:1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_grammar import FIRST, FOLLOW, GRAMMAR_FILE, RULES, \
+    TABLE, TABLES_FILE
+from interpreter.c_grammar_compiler import generate, Grammar, GrammarError
+from interpreter.c_lexer import TokenType as T
+from interpreter.c_parser import PRODUCTIONS, RULE_PRODUCTIONS
+
+SMALL = """
+<s*> -> <a> 'IDENT' | 'IDENT' ;   # both alternatives start with IDENT
+<a> -> 'IDENT' <restoA> | & ;
+<restoA> -> ',' 'IDENT' <restoA> | & ;
+"""
+
+
+class TestGrammar(unittest.TestCase):
+
+    def test_generated_tables(self):
+        with open(GRAMMAR_FILE, encoding='utf-8') as file:
+            grammar = Grammar(file.read())
+        with open(TABLES_FILE, encoding='utf-8') as file:
+            self.assertEqual(file.read(), generate(grammar))
+
+    def test_sets(self):
+        self.assertEqual(FIRST['resto_or'], {T.OR, None})
+        self.assertEqual(FIRST['type'], {T.INT, T.FLOAT})
+        self.assertEqual(FOLLOW['function'], {T.EOF})
+        self.assertIn(T.OR, FOLLOW['fator'])
+        self.assertEqual(RULES[TABLE['stmt'][T.SEMICOLON]],
+                         ('stmt', (T.SEMICOLON,)))
+        self.assertNotIn(T.IDENT, TABLE['type'])
+
+    def test_parser_productions(self):
+        # the rules not parsed by a production are the expression rules
+        heads = {p.head for p in PRODUCTIONS}
+        self.assertEqual(set(RULE_PRODUCTIONS),
+                         {i for i, r in enumerate(RULES) if r[0] in heads})
+        self.assertNotIn('expr', heads)
+        self.assertEqual(RULE_PRODUCTIONS[TABLE['type'][T.FLOAT]], 'type')
+        self.assertEqual(RULE_PRODUCTIONS[TABLE['else_part'][T.ELSE]],
+                         'else_part')
+
+    def test_conflicts(self):
+        grammar = Grammar(SMALL)
+        self.assertEqual(grammar.start, 's')
+        self.assertEqual(grammar.nullable, {'a', 'resto_a'})
+        self.assertEqual(grammar.follow['resto_a'], {T.IDENT})
+        self.assertEqual([(c.head, c.token, c.kept, c.dropped)
+                          for c in grammar.conflicts],
+                         [('s', T.IDENT, 0, 1), ('a', T.IDENT, 2, 3)])
+
+    def test_errors(self):
+        for text in ("<s> -> <t> ;", "<s> -> 'IDENT'", "<s> 'IDENT' ;",
+                     "<s> -> 'nothing' ;"):
+            with self.assertRaises(GrammarError):
+                Grammar(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
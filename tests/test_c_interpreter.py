@@ -0,0 +1,59 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_code_cache import CodeCache, DEFAULT_DIRECTORY
+from interpreter.c_interpreter import argument_parser, Intepreter
+
+PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestInterpreter(unittest.TestCase):
+
+    def test_arguments(self):
+        options = argument_parser().parse_args(['--cache', 'ex.c', '7', '1'])
+        self.assertTrue(options.cache)
+        self.assertEqual(options.cache_dir, DEFAULT_DIRECTORY)
+        self.assertEqual(options.file, 'ex.c')
+        self.assertEqual(options.args, ['7', '1'])
+        self.assertEqual(options.opt_level, 2)
+
+        options = argument_parser().parse_args(['--cache-dir', 'tmp',
+                                                'ex.c'])
+        self.assertFalse(options.cache)
+        self.assertEqual(options.cache_dir, 'tmp')
+        self.assertEqual(options.args, [])
+
+        options = argument_parser().parse_args(['-O', '0', 'ex.c', '-O'])
+        self.assertEqual(options.opt_level, 0)
+        self.assertEqual(options.args, ['-O'])
+
+    def test_cached_run(self):
+        # a program from the cache runs the same and is saved to code.out
+        backup = os.getcwd(), sys.stdout
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                cache = CodeCache(os.path.join(directory, 'cache'))
+                outputs, saved = [], []
+                for _ in range(2):
+                    sys.stdout = io.StringIO()
+                    Intepreter(f'{PATH}/minic/cafunfo.c', cache).run(
+                        ['40', '3'])
+                    outputs.append(sys.stdout.getvalue())
+                    with open('code.out') as file:
+                        saved.append(file.read())
+                    os.remove('code.out')
+                self.assertEqual(len(os.listdir(cache.directory)), 1)
+            finally:
+                os.chdir(backup[0])
+                sys.stdout = backup[1]
+        self.assertEqual(outputs[1], outputs[0])
+        self.assertEqual(saved[1], saved[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
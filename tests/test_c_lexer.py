@@ -0,0 +1,113 @@
+import os
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter import c_lexer
+from interpreter.c_lexer import File, Lexer, LexerError, TokenType as T
+
+PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+def _tokens(lexer):
+    return [(token.row, token.col, token.name, token.type_)
+            for token in lexer]
+
+
+def _lex_file(file_name, **kwargs):
+    try:
+        with Lexer(file_name, **kwargs) as lexer:
+            return _tokens(lexer)
+    except LexerError as exception:
+        return str(exception)
+
+
+def _lex_source(source, **kwargs):
+    return _tokens(Lexer.from_string(source, **kwargs))
+
+
+class TestLexer(unittest.TestCase):
+
+    def test_positions(self):
+        tokens = _lex_source('int main()\n{\n  x1 = 2.5 >= "a b";\n}\n')
+        self.assertEqual(tokens, [
+            (1, 1, 'int', T.INT), (1, 5, 'main', T.IDENT),
+            (1, 9, '(', T.OPAR), (1, 10, ')', T.CPAR),
+            (2, 1, '{', T.OBRKT),
+            (3, 3, 'x1', T.IDENT), (3, 6, '=', T.ASSIGN),
+            (3, 8, '2.5', T.NUMFLOAT), (3, 12, '>=', T.GEQ),
+            (3, 15, '"a b"', T.STR), (3, 20, ';', T.SEMICOLON),
+            (4, 1, '}', T.CBRKT), (5, 1, 'EOF', T.EOF)])
+
+    def test_comments(self):
+        tokens = _lex_source('/* a\n * b */\na // c\n/ b\n')
+        self.assertEqual(tokens, [
+            (3, 1, 'a', T.IDENT), (4, 1, '/', T.DIV),
+            (4, 3, 'b', T.IDENT), (5, 1, 'EOF', T.EOF)])
+
+    def test_long_line(self):
+        tokens = _lex_source('a=1;' * 20000 + '\n')
+        self.assertEqual(len(tokens), 80001)
+        self.assertEqual(tokens[-2], (1, 80000, ';', T.SEMICOLON))
+
+    def test_invalid_token(self):
+        with self.assertRaisesRegex(LexerError, 'line 2, column 3'):
+            _lex_source('int\na @\n')
+
+    def test_tables(self):
+        for char in map(chr, range(256)):
+            symbol = c_lexer.symb_type(char)
+            self.assertEqual(c_lexer.CHAR_CLASS[ord(char)],
+                             c_lexer.SYMBOL_INDEX[symbol])
+            for state in c_lexer.State:
+                expected = c_lexer.TRANSITIONS.get(state, {}).get(
+                    symbol, c_lexer.State.ERR)
+                index = (c_lexer.STATE_INDEX[state] * c_lexer.N_SYMBOLS +
+                         c_lexer.SYMBOL_INDEX[symbol])
+                self.assertEqual(c_lexer.TRANSITION_TABLE[index],
+                                 c_lexer.STATE_INDEX[expected])
+
+    def test_mapped(self):
+        for name in os.listdir(f'{PATH}/minic'):
+            file_name = f'{PATH}/minic/{name}'
+            with File(file_name, mapped=True) as file:
+                self.assertTrue(file.mapped)
+            expected = _lex_file(file_name)
+            self.assertEqual(_lex_file(file_name, mapped=True), expected)
+
+    def test_close(self):
+        file_name = f'{PATH}/minic/scope.c'
+        with File(file_name, mapped=True) as file:
+            self.assertFalse(file.text.closed)
+        self.assertTrue(file.text.closed)
+        with Lexer(file_name, mapped=True) as lexer:
+            lexer.get_token()
+        self.assertTrue(lexer.text.closed)
+        Lexer.from_string('int a;\n').close()
+
+    def test_peek(self):
+        lexer = Lexer.from_string('int a, b;\n')
+        self.assertEqual(lexer.peek(3).name, ',')
+        self.assertEqual(lexer.peek().name, 'int')
+        self.assertEqual(lexer.get_token().name, 'int')
+        self.assertEqual(lexer.peek(2).name, ',')
+        self.assertEqual([t.name for t in lexer],
+                         ['a', ',', 'b', ';', 'EOF'])
+        self.assertEqual(list(lexer), [])
+
+    def test_token_buffer(self):
+        source = 'int a; a = a + 2.5;\n'
+        buffer = Lexer.from_string(source).token_buffer()
+        self.assertEqual(len(buffer), 10)
+        self.assertEqual(len(buffer.lexemes), 7)
+        self.assertEqual(_tokens(buffer), _lex_source(source))
+        self.assertEqual(buffer[7].typed_value, 2.5)
+        self.assertEqual(buffer[7].data_type, T.FLOAT)
+
+    def test_minic(self):
+        tokens = _tokens(Lexer(f'{PATH}/minic/scope.c'))
+        self.assertEqual(len(tokens), 45)
+        self.assertEqual(tokens[-1], (13, 1, 'EOF', T.EOF))
+
+
+if __name__ == "__main__":
+    unittest.main()
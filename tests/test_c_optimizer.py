@@ -0,0 +1,286 @@
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_code_generator import CodeGenerator
+from interpreter.c_lexer import Lexer
+from interpreter.c_optimizer import clean_control_flow, \
+    eliminate_dead_stores, fold_constants, hoist_loop_invariants, \
+    Instruction, live_temps, propagate_copies, reuse_temps
+from interpreter.c_parser import Parser, ParserFeatures
+from interpreter.c_program import Program
+
+
+def _code(*instructions):
+    """Instructions from (opcode value, *args) tuples."""
+    code = []
+    for opcode, *args in instructions:
+        if opcode == 'label':
+            code.append(Instruction.label(*args))
+        elif opcode == 'jump':
+            code.append(Instruction.jump(*args))
+        elif opcode == 'if':
+            code.append(Instruction.if_(*args))
+        elif opcode == 'call':
+            code.append(Instruction.call(*args))
+        elif opcode == 'move':
+            code.append(Instruction.move(*args))
+        elif len(args) == 2:
+            code.append(Instruction.unary(opcode, *args))
+        else:
+            code.append(Instruction.operation(opcode, *args))
+    return code
+
+
+def _text(code):
+    return [str(i) for i in code]
+
+
+class TestReuseTemps(unittest.TestCase):
+
+    def test_straight_line(self):
+        code = _code(('*', 'a', 2, '__temp__1'), ('+', '__temp__1', 1,
+                                                  '__temp__2'),
+                     ('*', 'a', 3, '__temp__3'),
+                     ('-', '__temp__2', '__temp__3', '__temp__4'),
+                     ('call', 'print', '__temp__4'))
+        self.assertEqual(_text(reuse_temps(code)), [
+            '(*, a, 2, __temp__1)', '(+, __temp__1, 1, __temp__1)',
+            '(*, a, 3, __temp__2)', '(-, __temp__1, __temp__2, __temp__1)',
+            '(call, print, __temp__1)'])
+
+    def test_loop(self):
+        # __temp__1 is read on every iteration, so __temp__2, written in
+        # the loop after the last read, must not take its name
+        code = _code(('-', 'max', 1, '__temp__1'),
+                     ('label', 'loop'),
+                     ('<', 'i', '__temp__1', '__temp__3'),
+                     ('if', '__temp__3', 'body', 'end'),
+                     ('label', 'body'),
+                     ('+', 'i', 1, '__temp__2'),
+                     ('move', '__temp__2', 'i'),
+                     ('jump', 'loop'),
+                     ('label', 'end'))
+        self.assertEqual(live_temps(code)[5], {'__temp__1', '__temp__2'})
+        renamed = _text(reuse_temps(code))
+        self.assertEqual(renamed[2], '(<, i, __temp__1, __temp__2)')
+        self.assertEqual(renamed[5], '(+, i, 1, __temp__2)')
+
+    def test_temp_count(self):
+        source = ('int main() {\nint i, s;\ns = 0;\n'
+                  'for (i = 0; i < 10; i = i + 1) {\n'
+                  's = s + (i * 2 + 1) * (i - 1);\n'
+                  'if (s > 100 && i != 3) s = s - 2 * i;\n}\n'
+                  'print(s);\n}\n')
+        parser = Parser(Lexer.from_string(source),
+                        ParserFeatures.CODE_GENERATION)
+        self.assertEqual(parser.compile().temp_count, 2)
+        generated = Program(CodeGenerator().generate(parser.ast))
+        self.assertEqual(generated.temp_count, 12)
+
+
+class TestFoldConstants(unittest.TestCase):
+
+    def test_fold(self):
+        code = _code(('*', 2, 3, '__temp__1'),
+                     ('+', '__temp__1', 'x', '__temp__2'),
+                     ('move', '__temp__2', 'a'),
+                     ('//', 7, 2, 'b'), ('/', 7, 2.0, 'c'),
+                     ('%', 'b', 2, 'd'), ('!', 'd', 'e'),
+                     ('<', 'c', 'b', 'f'), ('&&', 'f', 1.5, 'g'),
+                     ('/', 'd', 0, 'h'), ('*', -1.0, 0.0, 'i'),
+                     ('-', 'i', 'j'),
+                     ('call', 'print', 'c'), ('call', 'scan_int', '""', 'b'),
+                     ('+', 'b', 1, 'b'))
+        self.assertEqual(_text(fold_constants(code)), [
+            '(+, 6, x, __temp__2)', '(move, __temp__2, a)',
+            '(move, 3, b)', '(move, 3.5, c)', '(move, 1, d)', '(move, 0, e)',
+            '(move, 0, f)', '(&&, 0, 1.5, g)', '(/, 1, 0, h)',
+            '(move, -0.0, i)', '(move, 0.0, j)', '(call, print, 3.5)',
+            '(call, scan_int, "", b)', '(+, b, 1, b)'])
+
+    def test_control_flow(self):
+        code = _code(('move', 1, 'a'), ('<', 'a', 2, '__temp__1'),
+                     ('if', '__temp__1', 'then', 'else'),
+                     ('label', 'then'), ('+', 'a', 1, 'b'),
+                     ('label', 'else'), ('+', 'a', 1, 'c'))
+        self.assertEqual(_text(fold_constants(code)), [
+            '(move, 1, a)', '(jump, then)', '(label, then)', '(move, 2, b)',
+            '(label, else)', '(+, a, 1, c)'])
+
+
+class TestPropagateCopies(unittest.TestCase):
+
+    def test_chained_assignment(self):
+        parser = Parser(Lexer.from_string(
+            'int main(int z) {\nint x, y;\nx = y = -z + 1;\n'
+            'print(x);\n}\n'), ParserFeatures.AST_GENERATION)
+        parser.compile()
+        code = propagate_copies(CodeGenerator().generate(parser.ast))
+        self.assertEqual(_text(code), [
+            '(move, __arg__0, __1__z)', '(neg, __arg__0, __temp__1)',
+            '(+, __temp__1, 1, __2__y)', '(move, __2__y, __2__x)',
+            '(call, print, __2__y)', '(label, __label__1)'])
+
+    def test_copies(self):
+        code = _code(('move', 'a', 'b'), ('+', 'b', 1, 'c'),
+                     ('move', 'c', 'd'), ('label', 'loop'),
+                     ('*', 'b', 'd', '__temp__1'), ('move', '__temp__1', 'a'),
+                     ('-', 'b', 'd', 'e'), ('call', 'scan_int', '""', 'c'),
+                     ('+', 'c', 'd', 'f'), ('if', 'f', 'loop', 'end'),
+                     ('label', 'end'), ('call', 'print', 'd'))
+        self.assertEqual(_text(propagate_copies(code)), [
+            '(move, a, b)', '(+, a, 1, c)', '(move, c, d)',
+            '(label, loop)', '(*, b, d, a)', '(-, b, d, e)',
+            '(call, scan_int, "", c)', '(+, c, d, f)',
+            '(if, f, loop, end)', '(label, end)', '(call, print, d)'])
+
+
+class TestEliminateDeadStores(unittest.TestCase):
+
+    def test_dead_stores(self):
+        code = _code(('move', 1, 'a'), ('move', 2, 'a'),
+                     ('call', 'scan_int', '""', 'b'),
+                     ('*', 'b', 3, 'c'), ('+', 'c', 'a', 'u'),
+                     ('+', 'b', 0.5, 'd'), ('/', 'b', 2, 'e'),
+                     ('<', 'n', 1, 'f'), ('==', 'n', 1, 'g'),
+                     ('-', 'x', 'a', 'h'), ('call', 'print', 'a'))
+        # the sum of an int and a float may overflow, and n and x may not
+        # be numbers
+        self.assertEqual(_text(eliminate_dead_stores(code)), [
+            '(move, 2, a)', '(call, scan_int, "", b)', '(+, b, 0.5, d)',
+            '(/, b, 2, e)', '(<, n, 1, f)', '(-, x, a, h)',
+            '(call, print, a)'])
+
+    def test_loop(self):
+        code = _code(('call', 'scan_float', '""', 'x'), ('move', 0, 'i'),
+                     ('label', 'loop'), ('<', 'i', 10, 't'),
+                     ('if', 't', 'body', 'end'), ('label', 'body'),
+                     ('*', 'x', 2.0, 'x'), ('-', 'x', 'i', 'y'),
+                     ('+', 'i', 1, 'i'), ('jump', 'loop'),
+                     ('label', 'end'), ('-', 'x', 1.0, 'x'),
+                     ('call', 'print', 'i'))
+        self.assertEqual(_text(eliminate_dead_stores(code)), [
+            '(call, scan_float, "", x)', '(move, 0, i)', '(label, loop)',
+            '(<, i, 10, t)', '(if, t, body, end)', '(label, body)',
+            '(*, x, 2.0, x)', '(-, x, i, y)', '(+, i, 1, i)',
+            '(jump, loop)', '(label, end)', '(call, print, i)'])
+
+
+class TestCleanControlFlow(unittest.TestCase):
+
+    def test_threading(self):
+        code = _code(('if', 'a', 'then', 'else'),
+                     ('label', 'then'), ('jump', 'end'),
+                     ('label', 'else'), ('label', 'else'), ('jump', 'end'),
+                     ('label', 'end'), ('if', 'b', 'loop', 'out'),
+                     ('label', 'loop'), ('jump', 'top'), ('label', 'top'),
+                     ('+', 'c', 1, 'c'), ('jump', 'end'), ('label', 'out'))
+        self.assertEqual(_text(clean_control_flow(code)), [
+            '(label, end)', '(if, b, top, out)', '(label, top)',
+            '(+, c, 1, c)', '(jump, end)', '(label, out)'])
+
+    def test_unreachable(self):
+        code = _code(('label', 'loop'), ('if', 'a', 'body', 'out'),
+                     ('label', 'body'), ('jump', 'out'),
+                     ('+', 'b', 1, 'b'), ('jump', 'loop'),
+                     ('label', 'out'), ('call', 'print', 'b'),
+                     ('jump', 'loop'), ('label', 'unused'))
+        self.assertEqual(_text(clean_control_flow(code)), [
+            '(label, out)', '(call, print, b)', '(jump, out)'])
+
+    def test_program(self):
+        source = ('int main(int n) {\nint i; i = 0;\n'
+                  'while (1) { if (i >= n) break; else i = i + 1; }\n'
+                  'if (i) print(i); else { return (0); print(n); }\n}\n')
+        parser = Parser(Lexer.from_string(source),
+                        ParserFeatures.CODE_GENERATION)
+        program = parser.compile()
+        self.assertEqual(_text(program), [
+            '(move, __arg__0, __1__n)', '(move, 0, __2__i)',
+            '(label, __label__7)', '(>=, __2__i, __1__n, __temp__1)',
+            '(if, __temp__1, __label__2, __label__6)', '(label, __label__6)',
+            '(+, __2__i, 1, __2__i)', '(jump, __label__7)',
+            '(label, __label__2)',
+            '(if, __2__i, __label__8, __label__1)', '(label, __label__8)',
+            '(call, print, __2__i)', '(label, __label__1)'])
+        # the loop runs 4 instructions, down from 10 counting its 3 labels
+        self.assertEqual(len(program.code), 8)
+        self.assertEqual(program.code[5].args, (2,))  # the jump back
+
+    def test_only_read_by_dead_stores(self):
+        # c is only read by d, dead, and i by itself and by c
+        code = _code(('call', 'scan_int', '""', 'n'), ('move', 0, 'i'),
+                     ('label', 'loop'), ('move', 'i', 'c'),
+                     ('*', 'c', 2, 'd'), ('+', 'i', 1, 'i'),
+                     ('if', 'n', 'loop', 'end'), ('label', 'end'),
+                     ('call', 'print', 'n'))
+        self.assertEqual(_text(eliminate_dead_stores(code)), [
+            '(call, scan_int, "", n)', '(label, loop)',
+            '(if, n, loop, end)', '(label, end)', '(call, print, n)'])
+
+
+class TestHoistLoopInvariants(unittest.TestCase):
+
+    def test_hoist(self):
+        code = _code(('call', 'scan_int', '""', 'k'), ('move', 0, 'i'),
+                     ('if', 'k', 'loop', 'end'), ('label', 'loop'),
+                     ('*', 'k', 10, 't1'), ('<', 'i', 't1', 't2'),
+                     ('if', 't2', 'body', 'end'), ('label', 'body'),
+                     ('+', 's', 'b', 's'), ('-', 'k', 1, 't3'),
+                     ('*', 't3', 2, 't4'), ('+', 's', 't4', 's'),
+                     ('/', 'k', 2, 't5'), ('call', 'print', 't5'),
+                     ('+', 'n', 1, 't6'), ('+', 's', 't6', 's'),
+                     ('move', 5, 'a'), ('move', 7, 'b'), ('+', 'i', 1, 'i'),
+                     ('jump', 'loop'), ('label', 'end'),
+                     ('call', 'print', 'a'), ('call', 'print', 's'))
+        text = _text(code)
+        hoisted = _text(hoist_loop_invariants(code))
+        self.assertEqual(_text(code), text)
+        # a division may raise, n may not be a number, a is read after the
+        # loop and b before being written in it
+        self.assertEqual(hoisted[:10], [
+            '(call, scan_int, "", k)', '(move, 0, i)',
+            '(if, k, loop_pre, end)', '(label, loop_pre)',
+            '(*, k, 10, t1)', '(-, k, 1, t3)', '(*, t3, 2, t4)',
+            '(label, loop)', '(<, i, t1, t2)', '(if, t2, body, end)'])
+        self.assertEqual(len(hoisted), len(code) + 1)
+
+    def test_hoist_twice(self):
+        # k * 10 moves out of both loops, t2 + 1 only out of the inner one
+        code = _code(('call', 'scan_int', '""', 'k'), ('move', 0, 'i'),
+                     ('label', 'outer'), ('<', 'i', 'k', 't1'),
+                     ('if', 't1', 'next', 'end'), ('label', 'next'),
+                     ('*', 'i', 2, 't2'), ('move', 0, 'j'),
+                     ('label', 'inner'), ('<', 'j', 3, 't3'),
+                     ('if', 't3', 'body', 'done'), ('label', 'body'),
+                     ('*', 'k', 10, 't4'), ('+', 't2', 1, 't5'),
+                     ('+', 's', 't4', 's'), ('+', 's', 't5', 's'),
+                     ('+', 'j', 1, 'j'), ('jump', 'inner'),
+                     ('label', 'done'), ('+', 'i', 1, 'i'),
+                     ('jump', 'outer'), ('label', 'end'),
+                     ('call', 'print', 's'))
+        hoisted = _text(hoist_loop_invariants(code))
+        self.assertEqual(hoisted[:4], [
+            '(call, scan_int, "", k)', '(move, 0, i)', '(*, k, 10, t4)',
+            '(label, outer)'])
+        self.assertEqual(hoisted[8:11], [
+            '(move, 0, j)', '(+, t2, 1, t5)', '(label, inner)'])
+        self.assertEqual(len(hoisted), len(code))
+
+    def test_nested_loops(self):
+        source = ('int main() {\nint i, j, s, max;\n'
+                  'scan("", max); s = 0;\n'
+                  'for (i = 0; i < max; i = i + 1)\n'
+                  '  for (j = 0; j < 10; j = j + 1)\n'
+                  '    s = (s + i * j - (max - 1) * 2) % 1000;\n'
+                  'print(s);\n}\n')
+        parser = Parser(Lexer.from_string(source),
+                        ParserFeatures.CODE_GENERATION)
+        code = _text(parser.compile())
+        first_label = next(n for n, i in enumerate(code)
+                           if i.startswith('(label'))
+        self.assertIn('(-, __2__max, 1, __temp__1)', code[:first_label])
+
+
+if __name__ == "__main__":
+    unittest.main()
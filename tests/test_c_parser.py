@@ -5,7 +5,7 @@ import unittest
 
 import env  # noqa pylint: disable=unused-import
 from interpreter.c_lexer import Lexer
-from interpreter.c_parser import Parser
+from interpreter.c_parser import Parser, ParserFeatures
 
 PATH = os.path.dirname(os.path.abspath(__file__))
 
@@ -27,6 +27,18 @@ def _run_code(filename, args=None, input_=None):
     return result
 
 
+def _run_source(source, args=()):
+    parser = Parser(Lexer.from_string(source),
+                    ParserFeatures.CODE_GENERATION |
+                    ParserFeatures.EXECUTE_CODE)
+    backup, sys.stdout = sys.stdout, io.StringIO()
+    try:
+        parser.execute(parser.compile(), list(args))
+        return sys.stdout.getvalue().strip('\n')
+    finally:
+        sys.stdout = backup
+
+
 class TestParser(unittest.TestCase):
 
     def test_ex(self):
@@ -44,6 +56,30 @@ class TestParser(unittest.TestCase):
         result = _run_code('scope.c')
         self.assertEqual('a=5\na=3', result.strip('\n'))
 
+    def test_long_statement_list(self):
+        count = 3 * sys.getrecursionlimit()
+        source = ('int main() {\nint a; a = 0;\n' + 'a = a + 1;\n' * count +
+                  'print(a);\n}\n')
+        self.assertEqual(str(count), _run_source(source))
+
+    def test_expression(self):
+        source = ('int main() {\nint a, b; float c, d;\n'
+                  'b = a = 7; c = b + a * 2 - -(b - 1) % 4 / 3;\n'
+                  'd = 7 / 2 * 2.0 + 5 % 3 * 2.5; a = !(a < b) && b - 6;\n'
+                  'print(c, " ", d, " ", a);\n}\n')
+        self.assertEqual('21 11.0 1', _run_source(source))
+
+    def test_argument_types(self):
+        source = ('int main(int a, float f) {\n'
+                  'a = a / 2; f = f / 2; print(a, " ", f);\n}\n')
+        self.assertEqual('3 3.5', _run_source(source, ('7', '7')))
+
+    def test_return(self):
+        source = ('int main(int a) {\nprint("before");\n'
+                  'if (a) { return 0; }\nprint("after");\n}\n')
+        self.assertEqual('before', _run_source(source, ('1',)))
+        self.assertEqual('beforeafter', _run_source(source, ('0',)))
+
 
 if __name__ == "__main__":
     unittest.main()
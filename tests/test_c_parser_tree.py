@@ -0,0 +1,66 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_lexer import Lexer
+from interpreter.c_parser import Parser, ParserError, ParserFeatures
+from interpreter.c_parser_tree import JsonLinesTree, ParserTree
+
+SOURCE = 'int main() { int a; a = 1; }\n'
+
+
+def _build(tree):
+    tree.push('stmt')
+    tree.push('expr')
+    tree.put_token('a')
+    tree.put_token('<')
+    tree.pop()
+    tree.put_token(';')
+    tree.pop()
+    tree.close()
+
+
+class TestParserTree(unittest.TestCase):
+
+    def test_dot(self):
+        file = io.StringIO()
+        _build(ParserTree(file))
+        self.assertEqual(file.getvalue(),
+                         'graph {\nstmt0 -- expr1\n'
+                         'expr1 [label=<〈expr〉<BR/><BR/><b>a 〈</b>>];\n'
+                         'stmt0 [label=<〈stmt〉<BR/><BR/><b>;</b>>];\n}\n')
+
+    def test_json_lines(self):
+        file = io.StringIO()
+        _build(JsonLinesTree(file))
+        nodes = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertEqual(nodes, [
+            {'id': 1, 'parent': 0, 'rule': 'expr', 'tokens': ['a', '<']},
+            {'id': 0, 'parent': None, 'rule': 'stmt', 'tokens': [';']}])
+
+    def test_parser(self):
+        with tempfile.TemporaryDirectory() as directory:
+            tree_file = os.path.join(directory, 'tree.jsonl')
+            Parser(Lexer.from_string(SOURCE),
+                   ParserFeatures.TREE_DOT_GENERATION,
+                   tree_file=tree_file).compile()
+            with open(tree_file, encoding='utf-8') as file:
+                nodes = [json.loads(line) for line in file]
+            self.assertEqual(nodes[-1]['rule'], 'function')
+            self.assertIn({'id': 11, 'parent': 10, 'rule': 'expr',
+                           'tokens': ['a', '=', '1']}, nodes)
+
+    def test_error_stack(self):
+        with self.assertRaises(ParserError) as context:
+            Parser(Lexer.from_string('int main() { int a; a = (1; }'),
+                   ParserFeatures.NONE).compile()
+        self.assertTrue(str(context.exception).endswith(
+            'Stack: function -> bloco -> stmt_list -> stmt_list -> stmt -> '
+            'expr'))
+
+
+if __name__ == "__main__":
+    unittest.main()
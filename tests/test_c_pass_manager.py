@@ -0,0 +1,115 @@
+import io
+import os
+import sys
+import time
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_code_generator import CodeGenerator
+from interpreter.c_lexer import Lexer
+from interpreter.c_parser import Parser, ParserFeatures
+from interpreter.c_pass_manager import merge_stats, PassManager, \
+    PassStats, stats_report
+
+PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+def _run_file(file_name, opt_level, args):
+    with Lexer(file_name) as lexer:
+        parser = Parser(lexer, ParserFeatures.CODE_GENERATION |
+                        ParserFeatures.EXECUTE_CODE, opt_level=opt_level)
+        program = parser.compile()
+    backup, sys.stdout = sys.stdout, io.StringIO()
+    try:
+        parser.execute(program, args)
+        return len(program.code), sys.stdout.getvalue()
+    finally:
+        sys.stdout = backup
+
+
+def _loops_source(count):
+    """A program of count loops one after the other, each with an inner
+    loop, an if and an invariant to hoist."""
+    lines = ['int main() {', 'int i, j, n, s, t, u;', 'scan("", n);',
+             's = 0;']
+    for k in range(count):
+        lines += ['for (i = 0; i < n; i = i + 1) {',
+                  f't = (s + i) * 2 - (n - {k}) * 3;', f'u = t * {k + 2};',
+                  'j = 0;', f'while (j < {k % 5 + 1}) {{',
+                  f's = s + j * {k};', 'j = j + 1;', '}',
+                  'if (t % 3 == 0) s = s + t; else s = s - i;', '}']
+    return '\n'.join(lines + ['print(s);', '}', ''])
+
+
+def _compile_seconds(source, opt_level):
+    """Least time of 3 compilations of source."""
+    seconds = []
+    for _ in range(3):
+        start = time.perf_counter()
+        Parser(Lexer.from_string(source), ParserFeatures.CODE_GENERATION,
+               opt_level=opt_level).compile()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+class TestPassManager(unittest.TestCase):
+
+    def test_levels(self):
+        parser = Parser(Lexer.from_string(
+            'int main() {\nint a;\na = 2 * 3;\nprint(a);\n}\n'),
+                        ParserFeatures.AST_GENERATION)
+        parser.compile()
+        generated = CodeGenerator().generate(parser.ast)
+        self.assertEqual([str(i) for i in PassManager(0).run(generated)],
+                         [str(i) for i in generated])
+        manager = PassManager(2)
+        code = manager.run(CodeGenerator().generate(parser.ast))
+        self.assertEqual([str(i) for i in code], ['(call, print, 6)'])
+        self.assertEqual(list(manager.stats), [
+            'fold_constants', 'propagate_copies', 'eliminate_dead_stores',
+            'clean_control_flow', 'hoist_loop_invariants', 'reuse_temps'])
+        self.assertEqual(manager.stats['fold_constants'].before, 4)
+        self.assertEqual(manager.stats['eliminate_dead_stores'].after, 2)
+        self.assertEqual(manager.stats['clean_control_flow'].after, 1)
+        manager = PassManager(1)
+        manager.run(generated)
+        self.assertNotIn('propagate_copies', manager.stats)
+        with self.assertRaises(ValueError):
+            PassManager(4)
+
+    def test_fixpoint(self):
+        counts = {}
+        for level in range(4):
+            counts[level], output = _run_file(f'{PATH}/minic/cafunfo.c',
+                                              level, ['40', '3'])
+            self.assertTrue(output.startswith('1 4 cafunfo 10 13 16 19 '))
+        self.assertEqual(counts, {0: 34, 1: 34, 2: 31, 3: 31})
+
+        manager = PassManager(3)
+        with Lexer(f'{PATH}/minic/cafunfo.c') as lexer:
+            parser = Parser(lexer, ParserFeatures.AST_GENERATION)
+            parser.compile()
+        manager.run(CodeGenerator().generate(parser.ast))
+        runs = manager.stats['fold_constants'].runs
+        self.assertGreater(runs, 1)
+        self.assertEqual(manager.stats['reuse_temps'].runs, 1)
+
+    def test_compile_time(self):
+        # the passes take time linear in the size of the code, so a large
+        # program compiles at -O2 a few times slower than at -O0, not 10
+        source = _loops_source(60)
+        self.assertLess(_compile_seconds(source, 2),
+                        10 * _compile_seconds(source, 0))
+
+    def test_report(self):
+        stats = merge_stats([PassStats('a', 1, 0.5, 10, 8),
+                             PassStats('b', 1, 0.25, 8, 8),
+                             PassStats('a', 2, 0.5, 6, 4)])
+        self.assertEqual(stats, [PassStats('a', 3, 1.0, 16, 12),
+                                 PassStats('b', 1, 0.25, 8, 8)])
+        lines = stats_report(stats).splitlines()
+        self.assertEqual(lines[1].split(), ['a', '3', '1000.00', '16', '12'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_lexer import Lexer
+from interpreter.c_parser import Parser, ParserFeatures
+from interpreter.c_program import Instruction, Program
+
+
+class TestProgram(unittest.TestCase):
+
+    def test_slots(self):
+        code = [Instruction.move('__arg__0', '__1__n'),
+                Instruction.operation('*', '__1__n', 2.0, '__temp__1'),
+                Instruction.move(2, '__1__n'),
+                Instruction.call('print', '"n\\n"'),
+                Instruction.if_('__temp__1', '__label__2', '__label__3'),
+                Instruction.label('__label__2'),
+                Instruction.call('scan_int', '""', '__1__n'),
+                Instruction.label('__label__3')]
+        program = Program(code)
+        self.assertEqual(list(program), code)
+        self.assertEqual(program.names, ['__arg__0', '__1__n', 2.0,
+                                         '__temp__1', 2, '"n\\n"', '""'])
+        self.assertEqual(program.frame, [None, None, 2.0, None, 2, 'n\n',
+                                         ''])
+        self.assertEqual(program.frame_size, 7)
+        self.assertEqual(program.args, [0])
+        self.assertEqual([i.args for i in program.code],
+                         [(0, 1), (1, 2, 3), (4, 1), ('print', 5),
+                          (3, 5, 6), ('scan_int', 6, 1)])
+
+    def test_unread_argument(self):
+        program = Program([Instruction.call('print', '__arg__1')])
+        self.assertEqual(program.args, [None, 0])
+
+    def test_frame_size(self):
+        source = ('int main(int n) {\nint a; float b;\n'
+                  'a = n * 2 + 1; b = a / 2.0; print(a, " ", b);\n}\n')
+        program = Parser(Lexer.from_string(source),
+                         ParserFeatures.CODE_GENERATION).compile()
+        # a and b, one temp, the argument read for n, 2, 1, 2.0 and " "
+        self.assertEqual(program.frame_size, 8)
+        self.assertEqual(program.temp_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import env  # noqa pylint: disable=unused-import
+from interpreter.c_symbol_table import SymbolTable
+
+
+class TestSymbolTable(unittest.TestCase):
+
+    def test_scopes(self):
+        table = SymbolTable()
+        table['a'] = 'int'
+        table.enter_block()
+        table.enter_block()
+        self.assertEqual(table.depth, 2)
+        self.assertEqual(table['a'], 'int')
+        self.assertEqual(table.depth_of('a'), 0)
+        self.assertFalse(table.current_block_contains('a'))
+        table['a'] = 'float'
+        table['b'] = 'int'
+        self.assertEqual(table.lookup('a'), (2, 'float'))
+        self.assertTrue(table.current_block_contains('a'))
+        table.leave_block()
+        self.assertEqual(table.lookup('a'), (0, 'int'))
+        self.assertNotIn('b', table)
+        self.assertIsNone(table['b'])
+        self.assertEqual(table.depth_of('b', 1), 1)
+        with self.assertRaises(KeyError):
+            table.depth_of('b')
+
+    def test_redeclaration(self):
+        table = SymbolTable()
+        table.enter_block()
+        table['a'] = 'int'
+        table['a'] = 'float'
+        self.assertEqual(table['a'], 'float')
+        table.leave_block()
+        self.assertNotIn('a', table)
+
+    def test_tuple_key(self):
+        with self.assertRaises(IndexError):
+            SymbolTable()['a', 'b']  # pylint: disable=pointless-statement
+
+
+if __name__ == "__main__":
+    unittest.main()